@@ -0,0 +1,143 @@
+"""Content-hash validation cache for the phase 2 Golden Pack gate."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+CACHE_FORMAT = 1
+
+
+def sha256_bytes(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ruleset_version(sources: Iterable[Path]) -> str:
+    """Fingerprint the validator sources so any rule change invalidates the cache."""
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT}".encode())
+    for source in sources:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class FileFindings:
+    """Findings produced by one rule over one file, plus the fingerprint they belong to."""
+
+    key: str
+    rule: str
+    sha256: str
+    mtime_ns: int
+    size: int
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    # Wall time spent producing these findings on this run: the check itself,
+    # or only the cache lookup for a hit.
+    duration_ms: float = 0.0
+    cached: bool = False
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "rule": self.rule,
+            "sha256": self.sha256,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "duration_ms": self.duration_ms,
+        }
+
+
+class ValidationCache:
+    """Persistent map of file path -> findings, keyed by content hash and rule set.
+
+    A stat match (mtime + size) short-circuits hashing; otherwise the file is
+    hashed and the stored findings are reused only when the digest matches.
+    Entries neither looked up nor stored during a run (renamed or removed
+    files) are dropped when it saves.
+    """
+
+    def __init__(self, path: Path, version: str, entries: dict[str, Any] | None = None) -> None:
+        self.path = path
+        self.version = version
+        self.entries: dict[str, Any] = entries or {}
+        self.seen: set[str] = set()
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, version: str) -> "ValidationCache":
+        try:
+            payload = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return cls(path, version)
+        if not isinstance(payload, dict) or payload.get("validator") != version:
+            cache = cls(path, version)
+            cache.dirty = True
+            return cache
+        entries = payload.get("entries")
+        return cls(path, version, entries if isinstance(entries, dict) else {})
+
+    def lookup(self, key: str, path: Path, rule: str) -> FileFindings | None:
+        start = time.perf_counter()
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if not isinstance(entry, dict) or entry.get("rule") != rule:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        if entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+            if sha256_file(path) != entry.get("sha256"):
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self.dirty = True
+
+        return FileFindings(
+            key=key,
+            rule=rule,
+            sha256=entry["sha256"],
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            errors=list(entry.get("errors", [])),
+            warnings=list(entry.get("warnings", [])),
+            duration_ms=round((time.perf_counter() - start) * 1000, 3),
+            cached=True,
+        )
+
+    def store(self, findings: FileFindings) -> None:
+        self.entries[findings.key] = findings.to_json()
+        self.seen.add(findings.key)
+        self.dirty = True
+
+    def save(self) -> None:
+        unused = self.entries.keys() - self.seen
+        if unused:
+            for key in unused:
+                del self.entries[key]
+            self.dirty = True
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"validator": self.version, "entries": self.entries}
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Resolve a registry vertical (core + vertical packs) into one effective pack.
+
+`registry/packs.registry.json` lists, per vertical, the pack chain to apply in
+order. Each layer's `pack.json` is merged onto the previous ones:
+
+- `tool_policy.allow` / `tool_policy.deny` accumulate; deny always wins, so a
+  later layer can never re-allow a tool an earlier layer denied.
+- `compliance.forbid_sensitive_chat_collection` can only be tightened;
+  `forbidden_chat_fields` and `rule_summary` accumulate.
+- `entrypoints` are overridden key by key by later layers.
+- `workspace_overlays` accumulate as paths relative to the repo root.
+- `id`, `name` and `version` come from the last layer that sets them.
+
+A layer without `pack.json` (e.g. `templates/core` today) contributes nothing.
+Resolutions are memoized on the content hashes of the registry entry and every
+layer file, so resolving the same vertical for many tenant workspaces merges
+once per distinct input, and any edit to an input yields a fresh merge.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from golden_pack_cache import sha256_bytes
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATES_DIR = ROOT / "templates"
+PACKS_DIR = TEMPLATES_DIR / "packs"
+REGISTRY_FILE = ROOT / "registry" / "packs.registry.json"
+
+
+class CompositionError(ValueError):
+    """Raised when a vertical's pack chain cannot be resolved."""
+
+
+@dataclass(frozen=True)
+class Layer:
+    pack_id: str
+    pack_dir: Path
+    sha256: str | None
+    pack: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class EffectivePack:
+    """The merged pack for one vertical. Immutable, so memoized results can be shared."""
+
+    vertical: str
+    chain: tuple[str, ...]
+    id: str | None
+    name: str | None
+    version: str | None
+    tool_allow: tuple[str, ...]
+    tool_deny: tuple[str, ...]
+    entrypoints: Mapping[str, str]
+    forbid_sensitive_chat_collection: bool
+    forbidden_chat_fields: tuple[str, ...]
+    rule_summary: tuple[str, ...]
+    workspace_overlays: tuple[str, ...]
+    conflicts: tuple[str, ...]
+    fingerprint: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """pack.json-shaped view of the effective pack."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version,
+            "composed_of": list(self.chain),
+            "workspace_overlays": list(self.workspace_overlays),
+            "tool_policy": {"allow": list(self.tool_allow), "deny": list(self.tool_deny)},
+            "entrypoints": dict(self.entrypoints),
+            "compliance": {
+                "forbid_sensitive_chat_collection": self.forbid_sensitive_chat_collection,
+                "forbidden_chat_fields": list(self.forbidden_chat_fields),
+                "rule_summary": list(self.rule_summary),
+            },
+            "fingerprint": self.fingerprint,
+        }
+
+
+def _extend_unique(target: list[str], values: list[str]) -> None:
+    for value in values:
+        if value not in target:
+            target.append(value)
+
+
+def _section(layer: Layer, key: str) -> Mapping[str, Any]:
+    """An optional object-valued pack.json key, or CompositionError if mistyped."""
+    value = layer.pack.get(key)
+    if value is None:
+        return {}
+    if not isinstance(value, Mapping):
+        raise CompositionError(f"{layer.pack_id}/pack.json {key} must be an object")
+    return value
+
+
+def _strings(layer: Layer, name: str, value: Any) -> list[str]:
+    """An optional list-of-strings pack.json value, or CompositionError if mistyped."""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise CompositionError(f"{layer.pack_id}/pack.json {name} must be an array of strings")
+    return value
+
+
+def pack_dir_for(pack_id: str) -> Path:
+    """Vertical packs live in templates/packs/<id>; shared bases like core in templates/<id>."""
+    for candidate in (PACKS_DIR / pack_id, TEMPLATES_DIR / pack_id):
+        if candidate.is_dir() and not pack_id.startswith("_"):
+            return candidate
+    raise CompositionError(f"unknown pack: {pack_id}")
+
+
+def merge_layers(vertical: str, layers: list[Layer], fingerprint: str) -> EffectivePack:
+    allow: list[str] = []
+    deny: list[str] = []
+    entrypoints: dict[str, str] = {}
+    forbidden: list[str] = []
+    rules: list[str] = []
+    overlays: list[str] = []
+    conflicts: list[str] = []
+    forbid_sensitive = False
+    identity: dict[str, Any] = {"id": None, "name": None, "version": None}
+
+    for layer in layers:
+        pack = layer.pack
+        for key in identity:
+            if pack.get(key) is not None:
+                identity[key] = pack[key]
+
+        policy = _section(layer, "tool_policy")
+        for tool in _strings(layer, "tool_policy.allow", policy.get("allow")):
+            if tool in deny:
+                conflicts.append(f"{layer.pack_id} allows '{tool}', denied by an earlier layer")
+            elif tool not in allow:
+                allow.append(tool)
+        for tool in _strings(layer, "tool_policy.deny", policy.get("deny")):
+            if tool in allow:
+                allow.remove(tool)
+            if tool not in deny:
+                deny.append(tool)
+
+        layer_entrypoints = _section(layer, "entrypoints")
+        if not all(isinstance(skill, str) for skill in layer_entrypoints.values()):
+            raise CompositionError(f"{layer.pack_id}/pack.json entrypoints values must be strings")
+        entrypoints.update(layer_entrypoints)
+
+        compliance = _section(layer, "compliance")
+        forbid_sensitive = forbid_sensitive or bool(compliance.get("forbid_sensitive_chat_collection"))
+        _extend_unique(forbidden, _strings(layer, "compliance.forbidden_chat_fields", compliance.get("forbidden_chat_fields")))
+        _extend_unique(rules, _strings(layer, "compliance.rule_summary", compliance.get("rule_summary")))
+
+        base = layer.pack_dir.relative_to(ROOT)
+        layer_overlays = _strings(layer, "workspace_overlays", pack.get("workspace_overlays"))
+        _extend_unique(overlays, [(base / overlay).as_posix() for overlay in layer_overlays])
+
+    return EffectivePack(
+        vertical=vertical,
+        chain=tuple(layer.pack_id for layer in layers),
+        id=identity["id"],
+        name=identity["name"],
+        version=identity["version"],
+        tool_allow=tuple(allow),
+        tool_deny=tuple(deny),
+        entrypoints=MappingProxyType(entrypoints),
+        forbid_sensitive_chat_collection=forbid_sensitive,
+        forbidden_chat_fields=tuple(forbidden),
+        rule_summary=tuple(rules),
+        workspace_overlays=tuple(overlays),
+        conflicts=tuple(conflicts),
+        fingerprint=fingerprint,
+    )
+
+
+class PackComposer:
+    """Resolves verticals from the registry, memoized by input content hash."""
+
+    def __init__(self, registry_file: Path = REGISTRY_FILE) -> None:
+        self.registry_file = registry_file
+        self.merges = 0
+        self._memo: dict[str, EffectivePack] = {}
+        self._registry: tuple[tuple[int, int], dict[str, Any]] | None = None
+
+    def registry(self) -> dict[str, Any]:
+        stat = self.registry_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._registry is None or self._registry[0] != stamp:
+            try:
+                registry = json.loads(self.registry_file.read_bytes())
+            except json.JSONDecodeError as exc:
+                raise CompositionError(f"{self.registry_file.name} invalid JSON: {exc}") from None
+            if not isinstance(registry, dict):
+                raise CompositionError(f"{self.registry_file.name} root must be an object")
+            self._registry = (stamp, registry)
+        return self._registry[1]
+
+    def chain(self, vertical: str) -> list[str]:
+        entry = self.registry().get(vertical)
+        if entry is None:
+            raise CompositionError(f"vertical not in registry: {vertical}")
+        packs = entry.get("packs") if isinstance(entry, dict) else None
+        if not isinstance(packs, list) or not packs:
+            raise CompositionError(f"vertical '{vertical}' must declare a non-empty packs array")
+        return packs
+
+    def resolve(self, vertical: str) -> EffectivePack:
+        layers: list[tuple[str, Path, bytes | None]] = []
+        for pack_id in self.chain(vertical):
+            pack_dir = pack_dir_for(pack_id)
+            pack_file = pack_dir / "pack.json"
+            layers.append((pack_id, pack_dir, pack_file.read_bytes() if pack_file.exists() else None))
+
+        digests = [sha256_bytes(raw) if raw is not None else None for _, _, raw in layers]
+        key = sha256_bytes(json.dumps([vertical, [pack_id for pack_id, _, _ in layers], digests]).encode())
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+
+        parsed: list[Layer] = []
+        for (pack_id, pack_dir, raw), digest in zip(layers, digests):
+            try:
+                pack = json.loads(raw) if raw is not None else {}
+            except json.JSONDecodeError as exc:
+                raise CompositionError(f"{pack_id}/pack.json invalid JSON: {exc}") from None
+            if not isinstance(pack, dict):
+                raise CompositionError(f"{pack_id}/pack.json root must be an object")
+            parsed.append(Layer(pack_id, pack_dir, digest, pack))
+
+        self.merges += 1
+        effective = merge_layers(vertical, parsed, key[:16])
+        self._memo[key] = effective
+        return effective
+
+
+def run_benchmark(composer: PackComposer, vertical: str, tenants: int) -> int:
+    start = time.perf_counter()
+    for _ in range(tenants):
+        composer.resolve(vertical)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{tenants} resolution(s) of '{vertical}': {elapsed_ms:.2f} ms, {composer.merges} merge(s)")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("vertical", help="Vertical id from registry/packs.registry.json")
+    parser.add_argument("--tenants", type=int, metavar="N", help="Resolve N times and report merges performed")
+    args = parser.parse_args(argv)
+
+    composer = PackComposer()
+    try:
+        if args.tenants:
+            return run_benchmark(composer, args.vertical, args.tenants)
+        effective = composer.resolve(args.vertical)
+    except CompositionError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(effective.to_dict(), indent=2, ensure_ascii=False))
+    for conflict in effective.conflicts:
+        print(f"WARN: {conflict}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""Local reference implementations of the Golden Pack entrypoint skills.
+
+A pack's `pack.json` maps each of the five entrypoints (intake, search,
+schedule, proposal, followup) to a skill name; HANDLERS maps the skill names
+that have a local implementation to it. Only the real-estate skills do so
+far; a pack whose skills are not in HANDLERS has no handler to replay.
+
+Each handler takes a scenario `input` block and a PackContext and returns
+an output dict that scenario `expected_output` blocks are asserted against.
+They are mock-first: no external action is ever executed.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable
+
+from property_search import PropertyIndex, PropertyQuery
+from sensitive_scan import fold
+
+FOLLOWUP_RISK_AFTER = timedelta(hours=24)
+NEXT_ACTION_DELAY = timedelta(hours=1)
+PROPOSAL_SECTIONS = ["Resumo do imovel", "Valor e condicoes", "Proximo passo"]
+
+# Lead-card values for what a message leaves unsaid: the lead stays within the
+# schema and gets a followup call to ask (ASK_ABOUT names what to ask).
+DEFAULT_INTENT = "buy"
+DEFAULT_CHANNEL = "other"
+ASK_ABOUT = {"intent": "intencao", "max_brl": "orcamento maximo", "preferred_areas": "regioes"}
+
+INTENT_WORDS = {
+    "comprar": "buy",
+    "compra": "buy",
+    "alugar": "rent",
+    "aluguel": "rent",
+    "locar": "rent",
+    "vender": "sell",
+    "venda": "sell",
+    "investir": "invest",
+    "investimento": "invest",
+}
+PROPERTY_TYPE_WORDS = {
+    "apartamento": "apartment",
+    "apto": "apartment",
+    "casa": "house",
+    "studio": "studio",
+    "kitnet": "studio",
+    "cobertura": "penthouse",
+}
+WEEKDAYS = {
+    "segunda": "monday",
+    "terca": "tuesday",
+    "quarta": "wednesday",
+    "quinta": "thursday",
+    "sexta": "friday",
+    "sabado": "saturday",
+    "domingo": "sunday",
+}
+PERIODS = {"manha": "morning", "tarde": "afternoon", "noite": "evening"}
+AMOUNT_UNITS = {"mil": 1_000, "k": 1_000, "milhao": 1_000_000, "milhoes": 1_000_000}
+
+CLIENT_NAME = re.compile(r"\bcliente\s+([^\W\d_][\w'-]*)", re.IGNORECASE)
+AMOUNT_PATTERN = r"\d+(?:[.,]\d+)?\s*(?:mil|k|milhao|milhoes)\b"
+AMOUNT = re.compile(r"(\d+(?:[.,]\d+)?)\s*(mil|k|milhao|milhoes)\b")
+RANGE = re.compile(rf"\bentre\s+({AMOUNT_PATTERN})\s+e\s+({AMOUNT_PATTERN})")
+UP_TO = re.compile(rf"\bate\s+({AMOUNT_PATTERN})")
+FROM = re.compile(rf"\b(?:a partir de|acima de)\s+({AMOUNT_PATTERN})")
+
+
+Handler = Callable[[dict[str, Any], "PackContext"], dict[str, Any]]
+
+
+@dataclass
+class PackContext:
+    """Per-pack state shared by entrypoints; heavy members load lazily, once."""
+
+    pack_dir: Path
+    pack: dict[str, Any] = field(default_factory=dict)
+    policy: dict[str, Any] = field(default_factory=dict)
+    # The mock dataset as scenarios name it (must_use_data_source), relative
+    # to the pack's scenarios/ directory.
+    data_source: str | None = None
+
+    @classmethod
+    def load(cls, pack_dir: Path, data_source: str | None = None) -> "PackContext":
+        return cls(
+            pack_dir=pack_dir,
+            pack=json.loads((pack_dir / "pack.json").read_bytes()),
+            policy=json.loads((pack_dir / "operational-policy.json").read_bytes()),
+            data_source=data_source,
+        )
+
+    @cached_property
+    def index(self) -> PropertyIndex:
+        if not self.data_source:
+            raise LookupError(f"no scenario of pack {self.pack_dir.name} names a must_use_data_source dataset")
+        return PropertyIndex.from_file(self.pack_dir / "scenarios" / self.data_source)
+
+    @cached_property
+    def lead_card_properties(self) -> dict[str, Any]:
+        schema = json.loads((self.pack_dir / "schemas" / "lead-card.schema.json").read_bytes())
+        return schema.get("properties", {})
+
+    @cached_property
+    def max_price(self) -> float:
+        return max((price for price in self.index.columns["price_brl"] if isinstance(price, (int, float))), default=0)
+
+    @cached_property
+    def known_areas(self) -> list[tuple[str, str]]:
+        """(folded, display) area names, longest first so "Vila Aurora Sul" wins."""
+        areas = {fold(area): area for area in self.index.columns["area"] if isinstance(area, str)}
+        return sorted(areas.items(), key=lambda item: len(item[0]), reverse=True)
+
+    @cached_property
+    def listings_by_id(self) -> dict[str, int]:
+        return {listing_id: row for row, listing_id in enumerate(self.index.columns["id"])}
+
+    def requires_confirmation(self, action: str) -> bool:
+        return action in self.policy.get("requires_confirmation_actions", [])
+
+    def assisted(self, action: str) -> bool:
+        return action in self.policy.get("assisted_auto_actions", [])
+
+    def handler(self, entrypoint: str) -> Handler | None:
+        """The local handler for the skill this pack maps entrypoint to, if any."""
+        entrypoints = self.pack.get("entrypoints")
+        skill = entrypoints.get(entrypoint) if isinstance(entrypoints, dict) else None
+        return HANDLERS.get(skill) if isinstance(skill, str) else None
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", fold(text)).strip("_")
+
+
+def parse_amount(text: str) -> float | None:
+    match = AMOUNT.search(text)
+    if not match:
+        return None
+    amount = float(match.group(1).replace(",", ".")) * AMOUNT_UNITS[match.group(2)]
+    return int(amount) if amount.is_integer() else amount
+
+
+def parse_budget(text: str) -> dict[str, float]:
+    budget = {"min_brl": 0}
+    between = RANGE.search(text)
+    if between:
+        low, high = parse_amount(between.group(1)), parse_amount(between.group(2))
+        if low is not None and high is not None:
+            return {"min_brl": low, "max_brl": high}
+    up_to = UP_TO.search(text)
+    if up_to:
+        budget["max_brl"] = parse_amount(up_to.group(1))
+    from_ = FROM.search(text)
+    if from_:
+        budget["min_brl"] = parse_amount(from_.group(1))
+    return budget
+
+
+def intake(payload: dict[str, Any], ctx: PackContext) -> dict[str, Any]:
+    """Turn a free-text chat message into a lead card with operational fields only."""
+    message = payload.get("message", "")
+    text = fold(message)
+    words = re.findall(r"\w+", text)
+
+    name_match = CLIENT_NAME.search(message)
+    client_name = name_match.group(1) if name_match else "Cliente"
+    areas = [display for folded, display in ctx.known_areas if re.search(rf"\b{re.escape(folded)}\b", text)]
+    timestamp = parse_timestamp(payload["timestamp"])
+
+    channel = payload.get("channel")
+    channels = ctx.lead_card_properties.get("contact_channel", {}).get("enum", [])
+    card: dict[str, Any] = {
+        "lead_id": "lead_" + slug(" ".join([client_name, *areas[:1]])),
+        "timestamp": format_timestamp(timestamp),
+        "client_name": client_name,
+        "contact_channel": channel if channel in channels else DEFAULT_CHANNEL,
+    }
+    unstated: list[str] = []
+    intent = next((INTENT_WORDS[word] for word in words if word in INTENT_WORDS), None)
+    if intent is None:
+        intent = DEFAULT_INTENT
+        unstated.append("intent")
+    card["intent"] = intent
+    property_types = list(dict.fromkeys(PROPERTY_TYPE_WORDS[word] for word in words if word in PROPERTY_TYPE_WORDS))
+    if property_types:
+        card["property_type_interest"] = property_types
+    budget = parse_budget(text)
+    if budget.get("max_brl") is None:
+        # No ceiling stated: anything in the inventory is affordable.
+        budget["max_brl"] = max(budget["min_brl"], ctx.max_price)
+        unstated.append("max_brl")
+    card["budget_range"] = budget
+    if not areas:
+        areas = sorted(display for _, display in ctx.known_areas)
+        unstated.append("preferred_areas")
+    card["preferred_areas"] = areas[: ctx.lead_card_properties.get("preferred_areas", {}).get("maxItems", len(areas))]
+
+    schedule = [
+        f"{WEEKDAYS[day]}_{PERIODS[period]}" if period else WEEKDAYS[day]
+        for day, period in re.findall(
+            rf"\b({'|'.join(WEEKDAYS)})\b(?:\s+(?:a|de|pela|na)?\s*({'|'.join(PERIODS)})\b)?", text
+        )
+    ]
+    if schedule:
+        card["preferred_schedule"] = schedule[: ctx.lead_card_properties.get("preferred_schedule", {}).get("maxItems", len(schedule))]
+    card["status"] = "new"
+    card["next_action"] = {
+        "type": "followup_call" if unstated else "search_options",
+        "due_at": format_timestamp(timestamp + NEXT_ACTION_DELAY),
+    }
+    if unstated:
+        card["notes"] = "Confirmar com o cliente: " + ", ".join(ASK_ABOUT[name] for name in unstated)
+    return {"lead_card": card}
+
+
+def search(payload: dict[str, Any], ctx: PackContext) -> dict[str, Any]:
+    results = ctx.index.search(PropertyQuery.from_input(payload))
+    return {
+        "results": results,
+        "result_count": len(results),
+        "data_source": ctx.data_source,
+    }
+
+
+def schedule(payload: dict[str, Any], ctx: PackContext) -> dict[str, Any]:
+    """Draft a visit; execution always waits for explicit confirmation."""
+    return {
+        "action_type": "schedule_visit",
+        "requires_confirmation": ctx.requires_confirmation("schedule_visit"),
+        "external_action_executed": False,
+        "draft_event_generated": True,
+        "draft_event": {
+            "lead_id": payload.get("lead_id"),
+            "property_id": payload.get("property_id"),
+            "slot": payload.get("requested_slot"),
+            "channel": payload.get("channel"),
+        },
+    }
+
+
+def proposal(payload: dict[str, Any], ctx: PackContext) -> dict[str, Any]:
+    row = ctx.listings_by_id.get(payload.get("property_id"))
+    listing = ctx.index.row(row) if row is not None else {}
+    price = listing.get("price_brl")
+    body = {
+        "Resumo do imovel": f"{listing.get('title', payload.get('property_id'))} - {listing.get('area', '')}",
+        "Valor e condicoes": f"R$ {price:,.0f}".replace(",", ".") if price is not None else "Sob consulta",
+        "Proximo passo": "Confirmar interesse para agendarmos a visita.",
+    }
+    draft = "\n\n".join(f"{section}\n{body[section]}" for section in PROPOSAL_SECTIONS)
+    return {
+        "template_id": f"{ctx.pack.get('id')}_proposal_v1",
+        "channel": payload.get("channel"),
+        "draft": draft,
+        "send_requires_confirmation": ctx.requires_confirmation("send_proposal"),
+        "external_action_executed": False,
+    }
+
+
+def followup(payload: dict[str, Any], ctx: PackContext) -> dict[str, Any]:
+    """Raise an internal alert for stale leads; never send anything outbound."""
+    stale = False
+    if payload.get("last_contact_at") and payload.get("now"):
+        elapsed = parse_timestamp(payload["now"]) - parse_timestamp(payload["last_contact_at"])
+        stale = elapsed >= FOLLOWUP_RISK_AFTER
+    alert = stale and ctx.assisted("internal_followup_risk")
+    output: dict[str, Any] = {
+        "internal_alert": alert,
+        "outbound_auto_send": bool(ctx.policy.get("external_auto_send")),
+    }
+    if alert:
+        output["alert_type"] = "internal_followup_risk"
+    return output
+
+
+# In replay and report order.
+ENTRYPOINTS = ("intake", "search", "schedule", "proposal", "followup")
+
+# Skill name (a pack.json entrypoints value) -> local implementation.
+HANDLERS: dict[str, Handler] = {
+    "re-lead-intake": intake,
+    "re-property-search": search,
+    "re-schedule-visit": schedule,
+    "re-proposal": proposal,
+    "re-followup": followup,
+}
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Indexed property search behind the realestate `re-property-search` entrypoint."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from stream_json import JsonArrayStream
+
+# Categorical columns indexed as bitsets. "intent" is only indexed when the
+# dataset carries it; queries on a missing column do not filter.
+CATEGORICAL_COLUMNS = ("area", "property_type", "availability", "intent")
+RESULT_FIELDS = (
+    "id",
+    "title",
+    "area",
+    "city",
+    "state",
+    "price_brl",
+    "bedrooms",
+    "bathrooms",
+    "parking",
+    "property_type",
+    "availability",
+)
+DEFAULT_LIMIT = 5
+
+
+def normalize(value: Any) -> str:
+    return str(value).strip().casefold()
+
+
+def bitset(positions: Iterable[int], size: int) -> int:
+    """Build an int bitset with the given bit positions set."""
+    buf = bytearray((size + 7) // 8)
+    for position in positions:
+        buf[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buf, "little")
+
+
+@dataclass
+class PropertyQuery:
+    intent: str | None = None
+    property_types: list[str] = field(default_factory=list)
+    areas: list[str] = field(default_factory=list)
+    availability: list[str] = field(default_factory=list)
+    min_price: float | None = None
+    max_price: float | None = None
+    limit: int = DEFAULT_LIMIT
+
+    @classmethod
+    def from_input(cls, payload: dict[str, Any]) -> "PropertyQuery":
+        """Build a query from a search scenario `input` block."""
+        budget = payload.get("budget_range") or {}
+        availability = payload.get("availability") or []
+        return cls(
+            intent=payload.get("intent"),
+            property_types=list(payload.get("property_type_interest") or []),
+            areas=list(payload.get("preferred_areas") or []),
+            availability=[availability] if isinstance(availability, str) else list(availability),
+            min_price=budget.get("min_brl"),
+            max_price=budget.get("max_brl"),
+            limit=int(payload.get("limit", DEFAULT_LIMIT)),
+        )
+
+
+class PropertyIndex:
+    """Columnar, price-ordered listing store with bitset inverted indexes.
+
+    Rows are stored in ascending price order, so every bitset is in price-rank
+    space: a budget range is a contiguous run of bits, a query is a handful of
+    big-int ANDs/ORs, and results come out cheapest-first by reading the lowest
+    set bits.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]]) -> None:
+        rows = [record for record in records if isinstance(record, dict) and _is_price(record.get("price_brl"))]
+        rows.sort(key=lambda record: record["price_brl"])
+
+        self.size = len(rows)
+        self.prices = array("d", (float(record["price_brl"]) for record in rows))
+        self.columns: dict[str, list[Any]] = {name: [record.get(name) for record in rows] for name in RESULT_FIELDS}
+        self.all_rows = (1 << self.size) - 1
+
+        self.indexes: dict[str, dict[str, int]] = {}
+        for column in CATEGORICAL_COLUMNS:
+            positions: dict[str, list[int]] = {}
+            for row, record in enumerate(rows):
+                value = record.get(column)
+                if value is not None:
+                    positions.setdefault(normalize(value), []).append(row)
+            if positions:
+                self.indexes[column] = {value: bitset(rows_, self.size) for value, rows_ in positions.items()}
+
+    @classmethod
+    def from_file(cls, path: Path, key: str = "properties") -> "PropertyIndex":
+        """Load a mock dataset by streaming its listing array."""
+        with path.open("rb") as handle:
+            return cls(item for _, item in JsonArrayStream(handle).iter_member(key))
+
+    def _any_of(self, column: str, values: list[str]) -> int:
+        """Bitset of rows whose column matches any of values (all rows if unindexed)."""
+        index = self.indexes.get(column)
+        if not values or index is None:
+            return self.all_rows
+        mask = 0
+        for value in values:
+            mask |= index.get(normalize(value), 0)
+        return mask
+
+    def _price_range(self, low: float | None, high: float | None) -> int:
+        start = 0 if low is None else bisect_left(self.prices, low)
+        stop = self.size if high is None else bisect_right(self.prices, high)
+        if start >= stop:
+            return 0
+        return ((1 << stop) - 1) ^ ((1 << start) - 1)
+
+    def match(self, query: PropertyQuery) -> int:
+        """Bitset (in price-rank space) of every row matching the query."""
+        mask = self._price_range(query.min_price, query.max_price)
+        for column, values in (
+            ("area", query.areas),
+            ("property_type", query.property_types),
+            ("availability", query.availability),
+            ("intent", [query.intent] if query.intent else []),
+        ):
+            if not mask:
+                break
+            mask &= self._any_of(column, values)
+        return mask
+
+    def search(self, query: PropertyQuery) -> list[dict[str, Any]]:
+        """Cheapest `limit` listings matching the query."""
+        mask = self.match(query)
+        rows: list[int] = []
+        while mask and len(rows) < query.limit:
+            lowest = mask & -mask
+            rows.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return [self.row(row) for row in rows]
+
+    def count(self, query: PropertyQuery) -> int:
+        return self.match(query).bit_count()
+
+    def row(self, row: int) -> dict[str, Any]:
+        return {name: values[row] for name, values in self.columns.items() if values[row] is not None}
+
+
+def _is_price(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_scenario(scenario_path: Path, index: PropertyIndex | None = None) -> list[str]:
+    """Run a search scenario as an acceptance test; returns failure messages."""
+    scenario = json.loads(scenario_path.read_bytes())
+    expected = scenario.get("expected_output", {})
+    if index is None:
+        source = expected.get("must_use_data_source", "../data/properties.mock.json")
+        index = PropertyIndex.from_file((scenario_path.parent / source).resolve())
+
+    results = index.search(PropertyQuery.from_input(scenario.get("input", {})))
+    failures: list[str] = []
+
+    low = expected.get("result_count_min", 0)
+    high = expected.get("result_count_max", len(results))
+    if not low <= len(results) <= high:
+        failures.append(f"expected {low}-{high} results, got {len(results)}")
+
+    for result in results:
+        missing = [name for name in expected.get("must_include_fields", []) if name not in result]
+        if missing:
+            failures.append(f"{result.get('id')} missing fields: {', '.join(missing)}")
+    return failures
+
+
+def synthetic_listings(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    areas = ["Vila Aurora", "Parque Sol", "Centro Norte", *(f"Bairro {n:03d}" for n in range(200))]
+    types = ["apartment", "house", "studio", "penthouse"]
+    availability = ["ready", "ready", "ready", "under_construction"]
+    return [
+        {
+            "id": f"prop_{n:07d}",
+            "title": "Synthetic listing",
+            "area": rng.choice(areas),
+            "city": "Sao Paulo",
+            "state": "SP",
+            "price_brl": rng.randrange(150_000, 3_000_000, 1_000),
+            "bedrooms": rng.randint(1, 4),
+            "bathrooms": rng.randint(1, 3),
+            "parking": rng.randint(0, 3),
+            "property_type": rng.choice(types),
+            "availability": rng.choice(availability),
+            "source": "synthetic",
+        }
+        for n in range(count)
+    ]
+
+
+def run_benchmark(count: int, scenario_path: Path, repeat: int) -> int:
+    listings = synthetic_listings(count)
+    start = time.perf_counter()
+    index = PropertyIndex(listings)
+    build_s = time.perf_counter() - start
+
+    query = PropertyQuery.from_input(json.loads(scenario_path.read_bytes()).get("input", {}))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        index.search(query)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print(f"listings: {count:,} (index build {build_s:.2f} s)")
+    print(f"matches: {index.count(query):,}")
+    print(f"search p50: {timings[len(timings) // 2] * 1e3:.3f} ms, p95: {timings[int(len(timings) * 0.95)] * 1e3:.3f} ms")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("scenario", type=Path, help="search scenario JSON (input + expected_output)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Time the scenario query over N synthetic listings")
+    parser.add_argument("--repeat", type=int, default=200, help="Query repetitions for --bench")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_benchmark(args.bench, args.scenario, args.repeat)
+
+    failures = check_scenario(args.scenario)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print(f"PASS: {args.scenario}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
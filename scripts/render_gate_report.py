@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Render the phase 2 gate report from the validator's NDJSON result stream."""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+SLOWEST_CHECKS = 5
+
+
+def read_results(path: Path) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Split the stream into check records and the summary record in one pass."""
+    checks: list[dict[str, Any]] = []
+    summary: dict[str, Any] | None = None
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "check":
+                checks.append(record)
+            elif record.get("type") == "summary":
+                summary = record
+    return checks, summary
+
+
+def read_scenarios(path: Path) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, Any] | None]:
+    """Split scenario_runner.py output into scenario, latency and summary records."""
+    scenarios: list[dict[str, Any]] = []
+    latency: list[dict[str, Any]] = []
+    summary: dict[str, Any] | None = None
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") == "scenario":
+                scenarios.append(record)
+            elif record.get("type") == "latency":
+                latency.append(record)
+            elif record.get("type") == "summary":
+                summary = record
+    return scenarios, latency, summary
+
+
+def render_scenarios(
+    scenarios: list[dict[str, Any]],
+    latency: list[dict[str, Any]],
+    summary: dict[str, Any] | None,
+) -> list[str]:
+    status = summary["status"] if summary else "FAIL (runner did not finish)"
+    lines = [
+        "",
+        "## Scenario Replay",
+        "",
+        f"- Status: {status}",
+        "- Runner script: `scripts/scenario_runner.py`",
+        "",
+        "| Pack | Scenario | Entrypoint | Status | p50 (ms) | p95 (ms) |",
+        "| --- | --- | --- | --- | ---: | ---: |",
+    ]
+    for scenario in scenarios:
+        lines.append(
+            f"| {scenario['pack']} | {scenario['scenario']} | {scenario['entrypoint']} | {scenario['status'].upper()} "
+            f"| {scenario['p50_ms']:.3f} | {scenario['p95_ms']:.3f} |"
+        )
+    failures = [f"- {s['pack']}/{s['scenario']}: {failure}" for s in scenarios for failure in s["failures"]]
+    if failures:
+        lines += ["", "### Scenario Failures", "", *failures]
+    skipped = [f"- {s['pack']}/{s['scenario']}: {s.get('note', '')}" for s in scenarios if s["status"] == "skip"]
+    if skipped:
+        lines += ["", "### Skipped Scenarios", "", *skipped]
+
+    lines += [
+        "",
+        "### Entrypoint Latency",
+        "",
+        "| Entrypoint | Samples | p50 (ms) | p95 (ms) | Budget (ms) | Status |",
+        "| --- | ---: | ---: | ---: | ---: | --- |",
+    ]
+    for row in latency:
+        lines.append(
+            f"| {row['entrypoint']} | {row['samples']} | {row['p50_ms']:.3f} | {row['p95_ms']:.3f} "
+            f"| {row['budget_ms']:g} | {row['status'].upper()} |"
+        )
+    return lines
+
+
+def render(
+    checks: list[dict[str, Any]],
+    summary: dict[str, Any] | None,
+    timestamp: str,
+    log_text: str,
+    scenario_lines: list[str] | None = None,
+) -> str:
+    if summary is None:
+        summary = {"status": "FAIL", "errors": "?", "warnings": "?", "duration_ms": 0.0, "packs": []}
+        log_text += "\n(result stream has no summary record; validator did not finish)"
+
+    packs = ", ".join(f"`{pack}`" for pack in summary.get("packs", [])) or "none"
+    lines = [
+        "# Phase 2 Golden Pack Gate Report",
+        "",
+        f"- Timestamp (UTC): {timestamp}",
+        f"- Status: {summary['status']}",
+        f"- Error count: {summary['errors']}",
+        f"- Warning count: {summary['warnings']}",
+        f"- Gate duration: {summary['duration_ms']:.1f} ms",
+        "- Validator script: `scripts/validate_golden_pack.py`",
+        f"- Scope: {packs}",
+        "",
+        "## Checks",
+        "",
+        "| Pack | Check | File | Status | Duration (ms) | Cached |",
+        "| --- | --- | --- | --- | ---: | --- |",
+    ]
+    for check in checks:
+        lines.append(
+            f"| {check['pack']} | {check['check']} | `{check['file']}` | {check['status'].upper()} "
+            f"| {check['duration_ms']:.3f} | {'yes' if check.get('cached') else 'no'} |"
+        )
+
+    slowest = heapq.nlargest(SLOWEST_CHECKS, checks, key=lambda check: check["duration_ms"])
+    if slowest:
+        lines += ["", "## Slowest Checks", ""]
+        for check in slowest:
+            lines.append(f"- {check['duration_ms']:.3f} ms - {check['pack']}/{check['check']} (`{check['file']}`)")
+
+    lines += scenario_lines or []
+
+    lines += ["", "## Validator Output", "", "```text", log_text.rstrip("\n"), "```", ""]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=Path, required=True, help="NDJSON written by validate_golden_pack.py")
+    parser.add_argument("--scenarios", type=Path, help="NDJSON written by scenario_runner.py")
+    parser.add_argument("--log", type=Path, help="Human-readable validator log to embed")
+    parser.add_argument("--timestamp", required=True, help="Gate timestamp (UTC)")
+    parser.add_argument("--output", type=Path, required=True, help="Markdown report to write")
+    args = parser.parse_args(argv)
+
+    checks, summary = read_results(args.results) if args.results.exists() else ([], None)
+    log_text = args.log.read_text(encoding="utf-8") if args.log and args.log.exists() else ""
+
+    passed = bool(summary and summary["status"] == "PASS")
+    scenario_lines = None
+    if args.scenarios:
+        scenarios, latency, scenario_summary = (
+            read_scenarios(args.scenarios) if args.scenarios.exists() else ([], [], None)
+        )
+        scenario_lines = render_scenarios(scenarios, latency, scenario_summary)
+        passed = passed and bool(scenario_summary and scenario_summary["status"] == "PASS")
+
+    args.output.write_text(render(checks, summary, args.timestamp, log_text, scenario_lines), encoding="utf-8")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,38 +4,27 @@ set -euo pipefail
 ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 EVIDENCE_DIR="$ROOT/evidence/phase2-golden-pack"
 LOG_FILE="$EVIDENCE_DIR/validator.log"
+RESULTS_FILE="$EVIDENCE_DIR/results.ndjson"
+SCENARIO_RESULTS_FILE="$EVIDENCE_DIR/scenario-results.ndjson"
 REPORT_FILE="$EVIDENCE_DIR/report.md"
 TIMESTAMP="$(date -u +"%Y-%m-%dT%H:%M:%SZ")"
 
 mkdir -p "$EVIDENCE_DIR"
+rm -f "$RESULTS_FILE" "$SCENARIO_RESULTS_FILE"
+
+python3 "$ROOT/scripts/validate_golden_pack.py" --results "$RESULTS_FILE" | tee "$LOG_FILE" || true
+python3 "$ROOT/scripts/scenario_runner.py" --results "$SCENARIO_RESULTS_FILE" | tee -a "$LOG_FILE" || true
 
 STATUS="PASS"
-if python3 "$ROOT/scripts/validate_golden_pack.py" | tee "$LOG_FILE"; then
-  STATUS="PASS"
-else
+if ! python3 "$ROOT/scripts/render_gate_report.py" \
+  --results "$RESULTS_FILE" \
+  --scenarios "$SCENARIO_RESULTS_FILE" \
+  --log "$LOG_FILE" \
+  --timestamp "$TIMESTAMP" \
+  --output "$REPORT_FILE"; then
   STATUS="FAIL"
 fi
 
-ERROR_COUNT="$(grep -c '^ERROR:' "$LOG_FILE" || true)"
-WARN_COUNT="$(grep -c '^WARN:' "$LOG_FILE" || true)"
-
-cat > "$REPORT_FILE" <<REPORT
-# Phase 2 Golden Pack Gate Report
-
-- Timestamp (UTC): $TIMESTAMP
-- Status: $STATUS
-- Error count: $ERROR_COUNT
-- Warning count: $WARN_COUNT
-- Validator script: \`scripts/validate_golden_pack.py\`
-- Scope: \`templates/packs/realestate\` + \`templates/packs/_golden-template\`
-
-## Validator Output
-
-\`\`\`text
-$(cat "$LOG_FILE")
-\`\`\`
-REPORT
-
 if [[ "$STATUS" != "PASS" ]]; then
   echo "Gate failed. See $REPORT_FILE"
   exit 1
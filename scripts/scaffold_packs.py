@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Generate vertical packs from the Golden Template and validate them in one pass.
+
+The manifest lists the verticals to create:
+
+    {
+      "verticals": [
+        {"id": "travel", "name": "Travel", "prefix": "tr", "currency": "usd"},
+        {"id": "legal", "name": "Legal", "substitutions": {"Vertical Name": "Juridico"}}
+      ]
+    }
+
+Template placeholders map to manifest fields: `{{vertical_id}}` <- `id`,
+`{{Vertical Name}}` <- `name`, `{{vertical}}` <- `prefix` (default: `id`) and
+`{{currency}}` <- `currency`, the lowercase ISO 4217 code naming the lead
+card's `budget_range` fields (`min_<currency>`/`max_<currency>`, default: `brl`).
+Extra `substitutions` fill or override any other `{{placeholder}}`. A
+placeholder left without a value is an error and nothing is written.
+
+`--force` replaces an existing pack directory wholesale. `--register` first
+replays every generated pack's scenarios (`scenario_runner.run_pack`) and only
+registers when none fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from scenario_runner import run_pack
+from validate_golden_pack import (
+    PACKS_DIR,
+    REGISTRY_FILE,
+    TEMPLATE_DIR,
+    PackReport,
+    check_file,
+    ensure_pack_structure,
+    pack_file_rules,
+    rel,
+)
+
+PLACEHOLDER = re.compile(r"\{\{([^{}]+)\}\}")
+PACK_ID = re.compile(r"^[a-z][a-z0-9-]*$")
+CURRENCY = re.compile(r"^[a-z]{3}$")
+DEFAULT_CHAIN = ["core"]
+DEFAULT_CURRENCY = "brl"
+
+
+class ScaffoldError(ValueError):
+    """Raised for an unusable manifest or template; nothing has been written."""
+
+
+@dataclass
+class TemplateFile:
+    """A template file pre-split into literal text and placeholder names."""
+
+    path: Path
+    parts: list[str]
+    is_json: bool
+
+    @classmethod
+    def load(cls, template_dir: Path, path: Path) -> "TemplateFile":
+        return cls(
+            path=path.relative_to(template_dir),
+            parts=PLACEHOLDER.split(path.read_text(encoding="utf-8")),
+            is_json=path.suffix == ".json",
+        )
+
+    @property
+    def placeholders(self) -> set[str]:
+        return set(self.parts[1::2])
+
+    def render(self, values: dict[str, str]) -> str:
+        # Odd indexes are placeholder names. Values going into JSON files are
+        # escaped as string contents so names with quotes stay valid JSON.
+        rendered = list(self.parts)
+        for i in range(1, len(rendered), 2):
+            value = values[rendered[i]]
+            rendered[i] = json.dumps(value, ensure_ascii=False)[1:-1] if self.is_json else value
+        return "".join(rendered)
+
+
+def load_template(template_dir: Path = TEMPLATE_DIR) -> list[TemplateFile]:
+    return [TemplateFile.load(template_dir, path) for path in sorted(template_dir.rglob("*")) if path.is_file()]
+
+
+@dataclass
+class Vertical:
+    id: str
+    values: dict[str, str]
+    packs: list[str]
+
+    @classmethod
+    def from_manifest(cls, entry: Any) -> "Vertical":
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+            raise ScaffoldError(f"manifest vertical must be an object with a string id: {entry!r}")
+        pack_id = entry["id"]
+        if not PACK_ID.match(pack_id):
+            raise ScaffoldError(f"invalid vertical id '{pack_id}' (lowercase letters, digits and dashes)")
+        currency = entry.get("currency", DEFAULT_CURRENCY)
+        if not isinstance(currency, str) or not CURRENCY.match(currency):
+            raise ScaffoldError(f"{pack_id}: invalid currency {currency!r} (lowercase ISO 4217 code, e.g. 'usd')")
+        values = {
+            "vertical_id": pack_id,
+            "Vertical Name": entry.get("name", pack_id.replace("-", " ").title()),
+            "vertical": entry.get("prefix", pack_id),
+            "currency": currency,
+            **entry.get("substitutions", {}),
+        }
+        packs = entry.get("packs", [*DEFAULT_CHAIN, pack_id])
+        return cls(pack_id, {key: str(value) for key, value in values.items()}, packs)
+
+
+def load_manifest(path: Path) -> list[Vertical]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ScaffoldError(f"cannot read manifest {path}: {exc}") from None
+    entries = manifest.get("verticals") if isinstance(manifest, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ScaffoldError(f"{path} must declare a non-empty verticals array")
+
+    verticals = [Vertical.from_manifest(entry) for entry in entries]
+    seen: set[str] = set()
+    for vertical in verticals:
+        if vertical.id in seen:
+            raise ScaffoldError(f"duplicate vertical id in manifest: {vertical.id}")
+        seen.add(vertical.id)
+    return verticals
+
+
+@dataclass
+class BufferedPackWriter:
+    """Collects every output file in memory, then writes them in a single pass.
+
+    Nothing touches the disk until all verticals have rendered, so a bad
+    manifest entry never leaves half-generated packs behind.
+    """
+
+    files: list[tuple[Path, str]] = field(default_factory=list)
+    bytes_buffered: int = 0
+    # Existing directories to remove before writing (--force), so files the
+    # template no longer has do not linger in a regenerated pack.
+    replaced: list[Path] = field(default_factory=list)
+
+    def add(self, path: Path, text: str) -> None:
+        self.files.append((path, text))
+        self.bytes_buffered += len(text)
+
+    def replace(self, directory: Path) -> None:
+        self.replaced.append(directory)
+
+    def flush(self) -> int:
+        for directory in self.replaced:
+            shutil.rmtree(directory)
+        self.replaced.clear()
+        made: set[Path] = set()
+        for path, text in self.files:
+            if path.parent not in made:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                made.add(path.parent)
+            path.write_text(text, encoding="utf-8")
+        written = len(self.files)
+        self.files.clear()
+        self.bytes_buffered = 0
+        return written
+
+
+def render_packs(
+    template: list[TemplateFile],
+    verticals: list[Vertical],
+    out_dir: Path,
+    writer: BufferedPackWriter,
+    force: bool = False,
+) -> list[Path]:
+    """Render every vertical into writer; returns the pack directories to be created."""
+    needed = set().union(*(file.placeholders for file in template))
+    pack_dirs: list[Path] = []
+    for vertical in verticals:
+        missing = sorted(needed - vertical.values.keys())
+        if missing:
+            raise ScaffoldError(f"{vertical.id}: no value for placeholder(s): {', '.join(missing)}")
+        pack_dir = out_dir / vertical.id
+        if pack_dir.exists():
+            if not force:
+                raise ScaffoldError(f"{rel(pack_dir)} already exists (use --force to overwrite)")
+            writer.replace(pack_dir)
+        for file in template:
+            writer.add(pack_dir / file.path, file.render(vertical.values))
+        pack_dirs.append(pack_dir)
+    return pack_dirs
+
+
+def validate_pack(pack_dir: Path) -> PackReport:
+    """Run the gate's pack checks in-process (no cache: the files are brand new)."""
+    report = PackReport(pack=pack_dir.name)
+    report.run_check("pack_structure", pack_dir, ensure_pack_structure, pack_dir)
+    for path, rule, params in pack_file_rules(pack_dir):
+        key = f"{rel(path)}:{rule}"
+        result = check_file(key, path, rule, params)
+        report.record(rule, str(rel(path)), result.errors, result.warnings, result.duration_ms)
+    return report
+
+
+def register(verticals: list[Vertical], registry_file: Path = REGISTRY_FILE) -> list[str]:
+    """Add verticals missing from the registry; returns the ids added."""
+    registry = json.loads(registry_file.read_text(encoding="utf-8")) if registry_file.exists() else {}
+    added = [vertical.id for vertical in verticals if vertical.id not in registry]
+    for vertical in verticals:
+        registry.setdefault(vertical.id, {"packs": vertical.packs})
+    if added:
+        # Temp file + rename: a crash mid-write never leaves a truncated registry.
+        tmp_path = registry_file.with_suffix(registry_file.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(registry, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp_path, registry_file)
+    return added
+
+
+def replay_scenarios(verticals: list[Vertical], out_dir: Path = PACKS_DIR) -> int:
+    """Replay each generated pack's scenarios; non-zero if any scenario fails."""
+    failures = [
+        f"[{result.pack}] {result.scenario}: {failure}"
+        for vertical in verticals
+        for result in run_pack(out_dir / vertical.id, repeat=1)
+        for failure in result.failures
+    ]
+    for failure in failures:
+        print(f"ERROR: {failure}")
+    if failures:
+        print(f"FAIL: {len(failures)} scenario failure(s); nothing registered")
+        return 1
+    return 0
+
+
+def scaffold(
+    verticals: list[Vertical],
+    out_dir: Path = PACKS_DIR,
+    template_dir: Path = TEMPLATE_DIR,
+    force: bool = False,
+) -> list[PackReport]:
+    writer = BufferedPackWriter()
+    pack_dirs = render_packs(load_template(template_dir), verticals, out_dir, writer, force)
+    writer.flush()
+    return [validate_pack(pack_dir) for pack_dir in pack_dirs]
+
+
+def print_reports(reports: list[PackReport]) -> int:
+    errors = [f"[{r.pack}] {message}" for r in reports for message in r.errors]
+    warnings = [f"[{r.pack}] {message}" for r in reports for message in r.warnings]
+    for warning in warnings:
+        print(f"WARN: {warning}")
+    for error in errors:
+        print(f"ERROR: {error}")
+    if errors:
+        print(f"FAIL: {len(errors)} error(s), {len(warnings)} warning(s) across {len(reports)} pack(s)")
+        return 1
+    print(f"PASS: {len(reports)} pack(s) generated and validated with {len(warnings)} warning(s)")
+    return 0
+
+
+def run_benchmark(count: int) -> int:
+    verticals = [Vertical.from_manifest({"id": f"bench-{n:03d}", "name": f"Bench {n}"}) for n in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        reports = scaffold(verticals, Path(tmp))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    status = print_reports(reports)
+    print(f"scaffold + validate {count} vertical(s): {elapsed_ms:.1f} ms")
+    return status
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", type=Path, nargs="?", help="JSON manifest listing the verticals to generate")
+    parser.add_argument("--out", type=Path, default=PACKS_DIR, help="Directory receiving the packs")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing pack directories")
+    parser.add_argument("--register", action="store_true", help=f"Add new verticals to {rel(REGISTRY_FILE)} (default --out only)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Scaffold and validate N verticals into a temp dir")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_benchmark(args.bench)
+    if args.manifest is None:
+        parser.error("a manifest is required unless --bench is given")
+    if args.register and args.out.resolve() != PACKS_DIR.resolve():
+        # The registry (and pack_composer) resolve vertical packs in PACKS_DIR only.
+        parser.error(f"--register requires the default --out ({rel(PACKS_DIR)})")
+
+    try:
+        verticals = load_manifest(args.manifest)
+        reports = scaffold(verticals, args.out, force=args.force)
+    except ScaffoldError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+
+    status = print_reports(reports)
+    if args.register and status == 0:
+        status = replay_scenarios(verticals, args.out)
+    if args.register and status == 0:
+        added = register(verticals)
+        if added:
+            print(f"Registered: {', '.join(added)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Replay Golden Pack scenarios against the local entrypoints and time them.
+
+Every registered pack's required scenarios are fed to the local handler of
+the skill the pack's `pack.json` maps the scenario's entrypoint to (see
+`pack_entrypoints.HANDLERS`), the output is asserted against
+`expected_output`, and per-entrypoint p50/p95 latencies are compared to a
+budget. Scenarios whose skill has no local handler are skipped and reported,
+not failed. Packs run in parallel, one worker per pack.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pack_entrypoints import ENTRYPOINTS, PackContext
+from schema_compiler import load_schema
+from validate_golden_pack import PackReport, rel, select_packs
+
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_REPEAT = 20
+
+SCENARIO_ENTRYPOINTS = {
+    "intake_valid": "intake",
+    "search_results_3_to_5": "search",
+    "schedule_requires_confirmation": "schedule",
+    "proposal_template_output": "proposal",
+    "followup_internal_only": "followup",
+}
+
+# expected_output keys with dedicated assertions; every other key must equal
+# the same key in the entrypoint output.
+LEAD_CARD_KEYS = {"lead_card", "lead_card_schema", "must_pass_schema", "required_fields_present", "forbidden_fields_absent"}
+SEARCH_KEYS = {"result_count_min", "result_count_max", "must_use_data_source", "must_include_fields"}
+DRAFT_KEYS = {"draft_contains_sections"}
+
+
+@dataclass
+class ScenarioResult:
+    pack: str
+    scenario: str
+    entrypoint: str
+    file: str
+    status: str
+    failures: list[str] = field(default_factory=list)
+    note: str = ""
+    timings_ms: list[float] = field(default_factory=list)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of samples (0.0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    return ordered[int(rank) - 1]
+
+
+def entrypoint_for(scenario_path: Path, scenario: dict[str, Any]) -> str | None:
+    return scenario.get("entrypoint") or SCENARIO_ENTRYPOINTS.get(scenario.get("scenario_id", scenario_path.stem))
+
+
+def check_lead_card(expected: dict[str, Any], output: dict[str, Any], scenario_path: Path) -> list[str]:
+    card = output.get("lead_card")
+    if not isinstance(card, dict):
+        return ["output has no lead_card object"]
+
+    failures = [f"lead_card missing field: {name}" for name in expected.get("required_fields_present", []) if name not in card]
+    failures += [f"lead_card has forbidden field: {name}" for name in expected.get("forbidden_fields_absent", []) if name in card]
+    if expected.get("must_pass_schema"):
+        schema_path = scenario_path.parent / expected.get("lead_card_schema", "../schemas/lead-card.schema.json")
+        failures += [f"lead_card schema: {error}" for error in load_schema(schema_path).errors(card)]
+    if "lead_card" in expected and card != expected["lead_card"]:
+        fields = sorted(name for name in card.keys() | expected["lead_card"].keys() if card.get(name) != expected["lead_card"].get(name))
+        failures.append(f"lead_card differs from expected in: {', '.join(fields)}")
+    return failures
+
+
+def check_search(expected: dict[str, Any], output: dict[str, Any]) -> list[str]:
+    results = output.get("results", [])
+    low = expected.get("result_count_min", 0)
+    high = expected.get("result_count_max", len(results))
+    failures = [] if low <= len(results) <= high else [f"expected {low}-{high} results, got {len(results)}"]
+
+    source = expected.get("must_use_data_source")
+    if source and output.get("data_source") != source:
+        failures.append(f"data_source is {output.get('data_source')!r}, expected {source!r}")
+    for result in results:
+        missing = [name for name in expected.get("must_include_fields", []) if name not in result]
+        if missing:
+            failures.append(f"{result.get('id')} missing fields: {', '.join(missing)}")
+    return failures
+
+
+def check_output(expected: dict[str, Any], output: dict[str, Any], scenario_path: Path) -> list[str]:
+    """Assert an entrypoint output against a scenario's expected_output block."""
+    failures: list[str] = []
+    if LEAD_CARD_KEYS & expected.keys():
+        failures += check_lead_card(expected, output, scenario_path)
+    if SEARCH_KEYS & expected.keys():
+        failures += check_search(expected, output)
+    draft = output.get("draft", "")
+    failures += [f"draft missing section: {section}" for section in expected.get("draft_contains_sections", []) if section not in draft]
+
+    for key, value in expected.items():
+        if key in LEAD_CARD_KEYS or key in SEARCH_KEYS or key in DRAFT_KEYS:
+            continue
+        if output.get(key) != value:
+            failures.append(f"{key} is {output.get(key)!r}, expected {value!r}")
+    return failures
+
+
+def data_source_of(scenarios: list[dict[str, Any]]) -> str | None:
+    """The dataset the pack's scenarios require (first must_use_data_source)."""
+    for scenario in scenarios:
+        expected = scenario.get("expected_output")
+        source = expected.get("must_use_data_source") if isinstance(expected, dict) else None
+        if isinstance(source, str) and source:
+            return source
+    return None
+
+
+def run_pack(pack_dir: Path, repeat: int = DEFAULT_REPEAT) -> list[ScenarioResult]:
+    """Replay every scenario of one pack; the PackContext is shared across them."""
+    paths = sorted((pack_dir / "scenarios").glob("*.json"))
+    scenarios = [json.loads(path.read_bytes()) for path in paths]
+    ctx = PackContext.load(pack_dir, data_source_of(scenarios))
+    results: list[ScenarioResult] = []
+    for scenario_path, scenario in zip(paths, scenarios):
+        name = scenario.get("scenario_id", scenario_path.stem)
+        kind = entrypoint_for(scenario_path, scenario)
+        result = ScenarioResult(pack_dir.name, name, kind or "?", str(rel(scenario_path)), "pass")
+        results.append(result)
+        if kind not in ENTRYPOINTS:
+            result.status = "fail"
+            result.failures.append(f"no entrypoint mapped for scenario {name}")
+            continue
+        entrypoint = ctx.handler(kind)
+        if entrypoint is None:
+            skills = ctx.pack.get("entrypoints")
+            skill = skills.get(kind) if isinstance(skills, dict) else None
+            result.status = "skip"
+            result.note = f"no handler for this vertical ({kind} -> {skill or 'unmapped'})"
+            continue
+
+        payload = scenario.get("input", {})
+        try:
+            output = entrypoint(payload, ctx)
+            for _ in range(repeat):
+                start = time.perf_counter()
+                entrypoint(payload, ctx)
+                result.timings_ms.append((time.perf_counter() - start) * 1000)
+            result.failures = check_output(scenario.get("expected_output", {}), output, scenario_path)
+        except Exception as exc:  # a crashing entrypoint is a scenario failure, not a runner crash
+            result.failures.append(f"{type(exc).__name__}: {exc}")
+        if result.failures:
+            result.status = "fail"
+    return results
+
+
+def run_scenarios(pack_dirs: list[Path], jobs: int | None = None, repeat: int = DEFAULT_REPEAT) -> list[ScenarioResult]:
+    workers = min(len(pack_dirs), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        batches = [run_pack(pack_dir, repeat) for pack_dir in pack_dirs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(run_pack, pack_dirs, [repeat] * len(pack_dirs)))
+    return [result for batch in batches for result in batch]
+
+
+def latency_summary(results: list[ScenarioResult], budgets: dict[str, float], default_budget: float) -> list[dict[str, Any]]:
+    """p50/p95 per entrypoint across all packs, with the budget verdict."""
+    samples: dict[str, list[float]] = {}
+    for result in results:
+        samples.setdefault(result.entrypoint, []).extend(result.timings_ms)
+
+    rows = []
+    for entrypoint in [*ENTRYPOINTS, *sorted(samples.keys() - set(ENTRYPOINTS))]:
+        if not samples.get(entrypoint):  # unmapped or skipped everywhere
+            continue
+        budget = budgets.get(entrypoint, default_budget)
+        p50, p95 = percentile(samples[entrypoint], 0.50), percentile(samples[entrypoint], 0.95)
+        rows.append(
+            {
+                "type": "latency",
+                "entrypoint": entrypoint,
+                "samples": len(samples[entrypoint]),
+                "p50_ms": round(p50, 3),
+                "p95_ms": round(p95, 3),
+                "budget_ms": budget,
+                "status": "pass" if p95 <= budget else "fail",
+            }
+        )
+    return rows
+
+
+def parse_budget_override(value: str) -> tuple[str, float]:
+    entrypoint, sep, millis = value.partition("=")
+    if not sep or entrypoint not in ENTRYPOINTS:
+        raise argparse.ArgumentTypeError(f"expected ENTRYPOINT=MS with ENTRYPOINT in {', '.join(ENTRYPOINTS)}")
+    try:
+        return entrypoint, float(millis)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid budget: {millis}") from None
+
+
+def write_results(
+    path: Path,
+    results: list[ScenarioResult],
+    latency: list[dict[str, Any]],
+    errors: list[str],
+    duration_ms: float,
+) -> None:
+    """NDJSON: scenario records, latency records, then one summary record."""
+    summary = {
+        "type": "summary",
+        "status": "FAIL" if errors else "PASS",
+        "errors": len(errors),
+        "scenarios": len(results),
+        "skipped": sum(1 for result in results if result.status == "skip"),
+        "packs": sorted({result.pack for result in results}),
+        "duration_ms": round(duration_ms, 3),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for result in results:
+            record = asdict(result)
+            timings = record.pop("timings_ms")
+            record.update(p50_ms=round(percentile(timings, 0.50), 3), p95_ms=round(percentile(timings, 0.95), 3))
+            handle.write(json.dumps({"type": "scenario", **record}) + "\n")
+        for row in latency:
+            handle.write(json.dumps(row) + "\n")
+        handle.write(json.dumps(summary) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-j", "--jobs", type=int, help="Worker processes (default: one per pack, capped at CPU count)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed replays per scenario")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="p95 latency budget per entrypoint call, in milliseconds",
+    )
+    parser.add_argument(
+        "--budget",
+        type=parse_budget_override,
+        action="append",
+        default=[],
+        metavar="ENTRYPOINT=MS",
+        help="Per-entrypoint p95 budget override (repeatable)",
+    )
+    parser.add_argument("--results", type=Path, help="Write scenario, latency and summary NDJSON records to this file")
+    args = parser.parse_args(argv)
+
+    print("Running Golden Pack scenarios...")
+    start = time.perf_counter()
+    registry = PackReport(pack="registry")
+    pack_dirs = select_packs(registry)
+    results = run_scenarios(pack_dirs, args.jobs, max(1, args.repeat))
+    latency = latency_summary(results, dict(args.budget), args.budget_ms)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    errors = [f"[registry] {message}" for message in registry.errors]
+    for result in results:
+        errors += [f"[{result.pack}] {result.scenario}: {failure}" for failure in result.failures]
+    for row in latency:
+        print(f"{row['entrypoint']}: p50 {row['p50_ms']:.3f} ms, p95 {row['p95_ms']:.3f} ms (budget {row['budget_ms']:g} ms)")
+        if row["status"] == "fail":
+            errors.append(f"[latency] {row['entrypoint']} p95 {row['p95_ms']:.3f} ms exceeds budget {row['budget_ms']:g} ms")
+
+    if args.results:
+        write_results(args.results, results, latency, errors, duration_ms)
+
+    for result in results:
+        if result.status == "skip":
+            print(f"SKIP: [{result.pack}] {result.scenario}: {result.note}")
+    for error in errors:
+        print(f"ERROR: {error}")
+    if errors:
+        print(f"FAIL: {len(errors)} error(s) across {len(results)} scenario(s)")
+        return 1
+
+    skipped = sum(1 for result in results if result.status == "skip")
+    print(f"PASS: {len(results)} scenario(s) across {len(pack_dirs)} pack(s), {skipped} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
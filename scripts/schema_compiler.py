@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Compile pack JSON Schemas (draft 2020-12 subset) into validation closures."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+# check(instance, path, errors) appends "<path>: <message>" strings to errors.
+Check = Callable[[Any, str, list[str]], None]
+
+ANNOTATION_KEYWORDS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$comment",
+        "$defs",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "deprecated",
+        "readOnly",
+        "writeOnly",
+    }
+)
+
+FORMATS = {
+    "date-time": re.compile(
+        r"^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})$"
+    ),
+    "date": re.compile(r"^\d{4}-\d{2}-\d{2}$"),
+}
+
+
+class SchemaCompileError(ValueError):
+    """Raised for schema keywords this compiler does not implement."""
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+TYPE_TESTS: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "number": _is_number,
+    "integer": lambda value: _is_number(value) and float(value).is_integer(),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, type-aware form of a JSON value (so 1 != true in enums)."""
+    if isinstance(value, dict):
+        return ("object", frozenset((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ("array", tuple(_freeze(item) for item in value))
+    if isinstance(value, bool):
+        return ("boolean", value)
+    if _is_number(value):
+        return ("number", value)
+    return (type(value).__name__, value)
+
+
+def _sequence(checks: list[Check]) -> Check:
+    if not checks:
+        return lambda instance, path, errors: None
+    if len(checks) == 1:
+        return checks[0]
+    checks_tuple = tuple(checks)
+
+    def run_all(instance: Any, path: str, errors: list[str]) -> None:
+        for check in checks_tuple:
+            check(instance, path, errors)
+
+    return run_all
+
+
+class SchemaCompiler:
+    def __init__(self, root: Any) -> None:
+        self.root = root
+        self.refs: dict[str, Check] = {}
+
+    def compile(self, schema: Any) -> Check:
+        if schema is True:
+            return _sequence([])
+        if schema is False:
+            return lambda instance, path, errors: errors.append(f"{path}: no value is allowed here")
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"schema must be an object or boolean, got {schema!r}")
+
+        unknown = set(schema) - ANNOTATION_KEYWORDS - set(KEYWORDS)
+        if unknown:
+            raise SchemaCompileError(f"unsupported schema keyword(s): {', '.join(sorted(unknown))}")
+
+        checks = [KEYWORDS[keyword](self, schema[keyword], schema) for keyword in KEYWORDS if keyword in schema]
+        return _sequence([check for check in checks if check is not None])
+
+    def ref(self, pointer: str) -> Check:
+        if not pointer.startswith("#"):
+            raise SchemaCompileError(f"only local $ref is supported: {pointer}")
+        if pointer not in self.refs:
+            # Register a trampoline first so recursive schemas terminate.
+            slot: list[Check] = []
+            self.refs[pointer] = lambda instance, path, errors: slot[0](instance, path, errors)
+            target = self.root
+            for token in filter(None, pointer[1:].split("/")):
+                token = token.replace("~1", "/").replace("~0", "~")
+                target = target[int(token)] if isinstance(target, list) else target[token]
+            slot.append(self.compile(target))
+        return self.refs[pointer]
+
+
+def _type(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    names = [value] if isinstance(value, str) else list(value)
+    tests = tuple(TYPE_TESTS[name] for name in names)
+    expected = " or ".join(names)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        for test in tests:
+            if test(instance):
+                return
+        errors.append(f"{path}: expected {expected}")
+
+    return check
+
+
+def _enum(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    allowed = frozenset(_freeze(item) for item in value)
+    label = ", ".join(json.dumps(item) for item in value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if _freeze(instance) not in allowed:
+            errors.append(f"{path}: must be one of {label}")
+
+    return check
+
+
+def _const(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    expected = _freeze(value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if _freeze(instance) != expected:
+            errors.append(f"{path}: must equal {json.dumps(value)}")
+
+    return check
+
+
+def _pattern(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    search = re.compile(value).search
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, str) and not search(instance):
+            errors.append(f"{path}: does not match {value}")
+
+    return check
+
+
+def _format(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check | None:
+    regex = FORMATS.get(value)
+    if regex is None:
+        return None  # unknown formats are annotations only
+    match = regex.match
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, str) and not match(instance):
+            errors.append(f"{path}: is not a valid {value}")
+
+    return check
+
+
+def _bound(kind: type, measure: Callable[[Any], Any], op: Callable[[Any, Any], bool], message: str):
+    def build(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+        def check(instance: Any, path: str, errors: list[str]) -> None:
+            if isinstance(instance, kind) and not isinstance(instance, bool) and not op(measure(instance), value):
+                errors.append(f"{path}: {message} {value}")
+
+        return check
+
+    return build
+
+
+def _required(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    required = frozenset(value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, dict):
+            missing = required.difference(instance)
+            if missing:
+                errors.append(f"{path}: missing required field(s): {', '.join(sorted(missing))}")
+
+    return check
+
+
+def _properties(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    compiled = {name: compiler.compile(subschema) for name, subschema in value.items()}
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, dict):
+            for name, sub_check in compiled.items():
+                if name in instance:
+                    sub_check(instance[name], f"{path}.{name}", errors)
+
+    return check
+
+
+def _additional_properties(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    declared = frozenset(schema.get("properties", {}))
+    if value is False:
+
+        def reject(instance: Any, path: str, errors: list[str]) -> None:
+            if isinstance(instance, dict):
+                extra = instance.keys() - declared
+                if extra:
+                    errors.append(f"{path}: unexpected field(s): {', '.join(sorted(extra))}")
+
+        return reject
+
+    sub_check = compiler.compile(value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, dict):
+            for name in instance.keys() - declared:
+                sub_check(instance[name], f"{path}.{name}", errors)
+
+    return check
+
+
+def _items(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    sub_check = compiler.compile(value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, list):
+            for index, item in enumerate(instance):
+                sub_check(item, f"{path}[{index}]", errors)
+
+    return check
+
+
+def _unique_items(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check | None:
+    if not value:
+        return None
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        if isinstance(instance, list) and len({_freeze(item) for item in instance}) != len(instance):
+            errors.append(f"{path}: items must be unique")
+
+    return check
+
+
+def _all_of(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    return _sequence([compiler.compile(subschema) for subschema in value])
+
+
+def _any_of(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    branches = tuple(compiler.compile(subschema) for subschema in value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        for branch in branches:
+            branch_errors: list[str] = []
+            branch(instance, path, branch_errors)
+            if not branch_errors:
+                return
+        errors.append(f"{path}: does not match any allowed schema")
+
+    return check
+
+
+def _one_of(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    branches = tuple(compiler.compile(subschema) for subschema in value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        matches = 0
+        for branch in branches:
+            branch_errors: list[str] = []
+            branch(instance, path, branch_errors)
+            matches += not branch_errors
+        if matches != 1:
+            errors.append(f"{path}: must match exactly one schema ({matches} matched)")
+
+    return check
+
+
+def _not(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    # Fast path for the lead-card idiom {"not": {"required": [...]}}.
+    if isinstance(value, dict) and set(value) == {"required"}:
+        forbidden = frozenset(value["required"])
+
+        def reject_fields(instance: Any, path: str, errors: list[str]) -> None:
+            if isinstance(instance, dict) and forbidden.issubset(instance):
+                errors.append(f"{path}: forbidden field(s) present: {', '.join(sorted(forbidden))}")
+
+        return reject_fields
+
+    sub_check = compiler.compile(value)
+
+    def check(instance: Any, path: str, errors: list[str]) -> None:
+        sub_errors: list[str] = []
+        sub_check(instance, path, sub_errors)
+        if not sub_errors:
+            errors.append(f"{path}: must not match schema {json.dumps(value)}")
+
+    return check
+
+
+def _ref(compiler: SchemaCompiler, value: Any, schema: dict[str, Any]) -> Check:
+    return compiler.ref(value)
+
+
+# Ordered so cheap structural checks run before per-property recursion.
+KEYWORDS: dict[str, Callable[[SchemaCompiler, Any, dict[str, Any]], Check | None]] = {
+    "$ref": _ref,
+    "type": _type,
+    "enum": _enum,
+    "const": _const,
+    "required": _required,
+    "additionalProperties": _additional_properties,
+    "properties": _properties,
+    "minLength": _bound(str, len, lambda actual, limit: actual >= limit, "length must be >="),
+    "maxLength": _bound(str, len, lambda actual, limit: actual <= limit, "length must be <="),
+    "pattern": _pattern,
+    "format": _format,
+    "minimum": _bound((int, float), lambda v: v, lambda actual, limit: actual >= limit, "must be >="),
+    "maximum": _bound((int, float), lambda v: v, lambda actual, limit: actual <= limit, "must be <="),
+    "exclusiveMinimum": _bound((int, float), lambda v: v, lambda actual, limit: actual > limit, "must be >"),
+    "exclusiveMaximum": _bound((int, float), lambda v: v, lambda actual, limit: actual < limit, "must be <"),
+    "minItems": _bound(list, len, lambda actual, limit: actual >= limit, "item count must be >="),
+    "maxItems": _bound(list, len, lambda actual, limit: actual <= limit, "item count must be <="),
+    "uniqueItems": _unique_items,
+    "items": _items,
+    "allOf": _all_of,
+    "anyOf": _any_of,
+    "oneOf": _one_of,
+    "not": _not,
+}
+
+
+class CompiledSchema:
+    """A schema compiled once into a single checking closure."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self.schema = schema
+        self.check = SchemaCompiler(schema).compile(schema)
+
+    def errors(self, instance: Any, path: str = "$") -> list[str]:
+        errors: list[str] = []
+        self.check(instance, path, errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        return not self.errors(instance)
+
+    def validate_many(self, instances: Iterable[Any]) -> list[list[str]]:
+        """Validate a batch; returns one error list per instance, in order."""
+        check = self.check
+        results: list[list[str]] = []
+        for index, instance in enumerate(instances):
+            errors: list[str] = []
+            check(instance, f"$[{index}]", errors)
+            results.append(errors)
+        return results
+
+
+@lru_cache(maxsize=16)
+def compile_schema_text(text: str) -> CompiledSchema:
+    return CompiledSchema(json.loads(text))
+
+
+def load_schema(path: Path) -> CompiledSchema:
+    return compile_schema_text(path.read_text(encoding="utf-8"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("schema", type=Path)
+    parser.add_argument("instances", nargs="*", type=Path, help="JSON files holding one card or an array of cards")
+    parser.add_argument("--bench", type=int, metavar="N", help="Validate the first instance N times and report cards/s")
+    args = parser.parse_args(argv)
+
+    compiled = load_schema(args.schema)
+    cards: list[Any] = []
+    for path in args.instances:
+        payload = json.loads(path.read_bytes())
+        cards.extend(payload if isinstance(payload, list) else [payload])
+
+    if args.bench:
+        if not cards:
+            parser.error("--bench needs at least one instance")
+        batch = [cards[0]] * args.bench
+        start = time.perf_counter()
+        compiled.validate_many(batch)
+        elapsed = time.perf_counter() - start
+        print(f"{args.bench} card(s) in {elapsed * 1000:.1f} ms ({args.bench / elapsed:,.0f} cards/s)")
+        return 0
+
+    failed = 0
+    for errors in compiled.validate_many(cards):
+        for error in errors:
+            print(error)
+        failed += bool(errors)
+    print(f"{len(cards) - failed}/{len(cards)} card(s) valid")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
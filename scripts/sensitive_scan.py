@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Compiled sensitive-term scanner for Golden Pack example payloads."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+SENSITIVE_TERMS = [
+    "cpf",
+    "renda",
+    "holerite",
+    "documento",
+    "rg",
+    "cnh",
+    "comprovante",
+]
+
+DEFAULT_SKIP_KEYS = frozenset(
+    {
+        "forbidden_chat_fields",
+        "forbidden_fields_absent",
+        "rule_summary",
+        "description",
+    }
+)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so "Cômprovante" scans like "comprovante"."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def format_path(parts: tuple[Any, ...] | None) -> str:
+    segments: list[str] = []
+    while parts is not None:
+        parts, segment = parts
+        segments.append(f"[{segment}]" if isinstance(segment, int) else f".{segment}")
+    return "$" + "".join(reversed(segments))
+
+
+class SensitiveScanner:
+    """Match every term in a single pass with one compiled alternation.
+
+    Terms are folded the same way as scanned text and matched on whole words,
+    so "rg" never fires inside "cargo" and "comprovante" never fires inside
+    "comprovante_renda".
+    """
+
+    def __init__(self, terms: Iterable[str], skip_keys: Iterable[str] = DEFAULT_SKIP_KEYS) -> None:
+        self.terms: dict[str, str] = {}
+        for term in terms:
+            self.terms.setdefault(fold(term), term)
+        self.skip_keys = frozenset(skip_keys)
+
+        alternation = "|".join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        self.pattern = re.compile(rf"\b(?:{alternation})\b") if alternation else None
+
+    def find(self, text: str) -> list[str]:
+        """Return the original spelling of each distinct term found in text."""
+        if self.pattern is None:
+            return []
+        hits = dict.fromkeys(match.group(0) for match in self.pattern.finditer(fold(text)))
+        return [self.terms[hit] for hit in hits]
+
+    def scan(self, node: Any) -> Iterator[tuple[str, str]]:
+        """Yield (term, json_path) for every hit, walking the payload depth-first.
+
+        Uses an explicit stack so deeply nested payloads cannot hit the
+        recursion limit; paths are only formatted when a term is found.
+        """
+        if self.pattern is None:
+            return
+        search = self.pattern.search
+        stack: list[tuple[Any, tuple[Any, ...] | None]] = [(node, None)]
+        while stack:
+            value, parts = stack.pop()
+            if isinstance(value, str):
+                if search(fold(value)):
+                    for term in self.find(value):
+                        yield term, format_path(parts)
+            elif isinstance(value, dict):
+                children = [
+                    (child, (parts, key))
+                    for key, child in value.items()
+                    if key not in self.skip_keys
+                ]
+                stack.extend(reversed(children))
+            elif isinstance(value, list):
+                stack.extend((value[index], (parts, index)) for index in range(len(value) - 1, -1, -1))
+
+
+@lru_cache(maxsize=32)
+def compile_scanner(terms: tuple[str, ...]) -> SensitiveScanner:
+    return SensitiveScanner(terms)
+
+
+def legacy_scan(node: Any, terms: Iterable[str], path: str = "$") -> Iterator[tuple[str, str]]:
+    """Per-term, recursive reference implementation used by the benchmark."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key not in DEFAULT_SKIP_KEYS:
+                yield from legacy_scan(value, terms, f"{path}.{key}")
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from legacy_scan(value, terms, f"{path}[{index}]")
+    elif isinstance(node, str):
+        text = fold(node)
+        for term in terms:
+            if re.search(rf"\b{re.escape(term)}\b", text):
+                yield term, path
+
+
+def build_corpus(target_bytes: int) -> dict[str, Any]:
+    """Synthesize a scenario-shaped payload of roughly target_bytes."""
+    message = (
+        "Cliente quer comprar apartamento de ate 750 mil na Vila Aurora, "
+        "2 quartos, pode visitar na quinta a tarde."
+    )
+    leads = []
+    size = 0
+    index = 0
+    while size < target_bytes:
+        lead = {
+            "lead_id": f"lead_{index:07d}",
+            "message": message if index % 997 else "Cliente enviou o Cômprovante de endereço",
+            "preferred_areas": ["Vila Aurora", "Parque Sol"],
+            "notes": {"history": [message, "retorno agendado"], "description": "cpf rg"},
+        }
+        leads.append(lead)
+        size += len(json.dumps(lead))
+        index += 1
+    return {"scenario_id": "bench", "input": {"leads": leads}, "expected_output": {}}
+
+
+def run_benchmark(size_mb: float, terms: list[str]) -> int:
+    corpus = build_corpus(int(size_mb * 1024 * 1024))
+    scanner = SensitiveScanner(terms)
+
+    start = time.perf_counter()
+    hits = list(scanner.scan(corpus))
+    compiled_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_hits = list(legacy_scan(corpus, [fold(term) for term in terms]))
+    legacy_s = time.perf_counter() - start
+
+    print(f"corpus: {size_mb:.1f} MB, terms: {len(terms)}")
+    print(f"compiled scanner: {compiled_s * 1000:.1f} ms ({len(hits)} hit(s))")
+    print(f"per-term scan:    {legacy_s * 1000:.1f} ms ({len(legacy_hits)} hit(s))")
+    if compiled_s:
+        print(f"speedup: {legacy_s / compiled_s:.1f}x")
+    return 0 if len(hits) == len(legacy_hits) else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", type=Path, help="JSON files to scan")
+    parser.add_argument("--term", action="append", default=[], help="Extra term to scan for")
+    parser.add_argument("--bench", action="store_true", help="Benchmark against the per-term scan")
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Synthetic corpus size for --bench")
+    args = parser.parse_args(argv)
+
+    terms = [*SENSITIVE_TERMS, *args.term]
+    if args.bench:
+        return run_benchmark(args.size_mb, terms)
+
+    scanner = SensitiveScanner(terms)
+    found = 0
+    for path in args.paths:
+        for term, json_path in scanner.scan(json.loads(path.read_bytes())):
+            print(f"{path}: '{term}' at {json_path}")
+            found += 1
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Stream records out of a large JSON array without loading the whole file."""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 16
+# Largest single value (record, or sibling member of the root) held in memory.
+MAX_RECORD_BYTES = 1 << 20
+# A decode error this close to the end of the buffer may be a value cut at the
+# chunk boundary ("tru", "\\u00"); anything earlier is a real syntax error.
+TRUNCATION_SLACK = 16
+WHITESPACE = " \t\n\r"
+
+
+class StreamError(ValueError):
+    """Raised when the document cannot be parsed further; carries the byte offset."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(f"{message} at byte {offset}")
+        self.offset = offset
+
+
+class JsonArrayStream:
+    """Incremental reader that yields the items of one top-level array member.
+
+    Only the current record (plus one read chunk) is held in memory. Sibling
+    members of the root object are decoded and discarded as they are passed.
+    A syntax error fails as soon as it is seen, and a value that is still
+    incomplete after max_record_bytes fails instead of growing the buffer.
+    """
+
+    def __init__(self, handle: BinaryIO, chunk_size: int = CHUNK_SIZE, max_record_bytes: int = MAX_RECORD_BYTES) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.max_record_bytes = max_record_bytes
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        # Byte offset of buf[mark], advanced lazily so each byte is encoded once.
+        self.mark = 0
+        self.mark_bytes = 0
+        self.eof = False
+
+    def offset(self) -> int:
+        """Byte offset of the current read position."""
+        if self.pos != self.mark:
+            self.mark_bytes += len(self.buf[self.mark : self.pos].encode("utf-8"))
+            self.mark = self.pos
+        return self.mark_bytes
+
+    def fill(self, size: int | None = None) -> bool:
+        if self.eof:
+            return False
+        if self.pos:
+            # Drop the consumed prefix; what remains is at most one partial record.
+            self.offset()
+            self.buf = self.buf[self.pos :]
+            self.pos = self.mark = 0
+        raw = self.handle.read(size or self.chunk_size)
+        if not raw:
+            self.buf += self.decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        self.buf += self.decoder.decode(raw)
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of file"
+            raise StreamError(f"expected one of {chars!r}, found {found}", self.offset())
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                truncated = exc.msg.startswith("Unterminated string") or exc.pos >= len(self.buf) - TRUNCATION_SLACK
+                if self.eof or not truncated:
+                    raise StreamError(f"invalid JSON: {exc.msg}", self.offset()) from None
+                if len(self.buf) - self.pos > self.max_record_bytes:
+                    raise StreamError(f"value larger than {self.max_record_bytes} bytes or unterminated", self.offset()) from None
+            else:
+                # A number touching the end of the buffer may still be truncated.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            self.fill(read_size)
+            read_size *= 2
+
+    def iter_member(self, key: str) -> Iterator[tuple[int, Any]]:
+        """Yield (byte_offset, item) for each element of root[key].
+
+        Raises KeyError if the root object has no such member and TypeError if
+        the member is not an array. Once the array is exhausted, the rest of
+        the root object is read too, and anything after it is a StreamError.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            raise KeyError(key)
+        while True:
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                if self.peek() != "[":
+                    raise TypeError(f"{key} is not an array")
+                yield from self._iter_array()
+                while self.expect(",}") == ",":
+                    self.value()
+                    self.expect(":")
+                    self.value()
+                self.expect_end()
+                return
+            self.value()
+            if self.expect(",}") == "}":
+                raise KeyError(key)
+
+    def expect_end(self) -> None:
+        char = self.peek()
+        if char:
+            raise StreamError(f"unexpected {char!r} after the root object", self.offset())
+
+    def _iter_array(self) -> Iterator[tuple[int, Any]]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            self.peek()
+            yield self.offset(), self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+@dataclass
+class RecordError:
+    index: int
+    offset: int
+    message: str
+
+
+@dataclass
+class StreamReport:
+    records: int = 0
+    errors: list[RecordError] = field(default_factory=list)
+    fatal: str | None = None
+    invalid_json: bool = False
+    truncated: bool = False
+
+
+def validate_records(
+    path: Path,
+    key: str,
+    required_fields: Iterable[str],
+    error_budget: int = 50,
+) -> StreamReport:
+    """Check every root[key] item for required fields, one record at a time.
+
+    Stops early once error_budget per-record errors have been collected
+    (0 means no budget).
+    """
+    required = frozenset(required_fields)
+    report = StreamReport()
+    with path.open("rb") as handle:
+        stream = JsonArrayStream(handle)
+        try:
+            for offset, item in stream.iter_member(key):
+                report.records += 1
+                if not isinstance(item, dict):
+                    message = "must be an object"
+                else:
+                    missing = required.difference(item)
+                    if not missing:
+                        continue
+                    message = f"missing fields: {', '.join(sorted(missing))}"
+                report.errors.append(RecordError(report.records, offset, message))
+                if error_budget and len(report.errors) >= error_budget:
+                    report.truncated = True
+                    break
+        except KeyError:
+            report.fatal = f"missing {key} array"
+        except TypeError as exc:
+            report.fatal = str(exc)
+        except StreamError as exc:
+            report.invalid_json = True
+            report.fatal = str(exc)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--key", default="properties", help="Root member holding the records")
+    parser.add_argument("--require", action="append", default=[], help="Required record field")
+    parser.add_argument("--error-budget", type=int, default=50, help="Stop after N record errors (0 = all)")
+    args = parser.parse_args(argv)
+
+    report = validate_records(args.path, args.key, args.require, args.error_budget)
+    for error in report.errors:
+        print(f"record #{error.index} (byte {error.offset}): {error.message}")
+    if report.fatal:
+        print(f"fatal: {report.fatal}")
+    suffix = " (stopped at error budget)" if report.truncated else ""
+    print(f"{report.records} record(s), {len(report.errors)} error(s){suffix}")
+    return 1 if report.errors or report.fatal else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,53 +3,135 @@
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
 import re
 import sys
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+import golden_pack_cache
+import schema_compiler
+import sensitive_scan
+import stream_json
+from golden_pack_cache import FileFindings, ValidationCache, ruleset_version, sha256_bytes, sha256_file
+from pack_composer import CompositionError, PackComposer
+from schema_compiler import CompiledSchema, SchemaCompileError, compile_schema_text
+from sensitive_scan import SENSITIVE_TERMS, compile_scanner
+from stream_json import validate_records
 
 ROOT = Path(__file__).resolve().parents[1]
-REAL_ESTATE_DIR = ROOT / "templates" / "packs" / "realestate"
-TEMPLATE_DIR = ROOT / "templates" / "packs" / "_golden-template"
-
-ERRORS: list[str] = []
-WARNINGS: list[str] = []
-
-SENSITIVE_TERMS = [
-    "cpf",
-    "renda",
-    "holerite",
-    "documento",
-    "rg",
-    "cnh",
-    "comprovante",
+TEMPLATES_DIR = ROOT / "templates"
+PACKS_DIR = TEMPLATES_DIR / "packs"
+TEMPLATE_DIR = PACKS_DIR / "_golden-template"
+REGISTRY_FILE = ROOT / "registry" / "packs.registry.json"
+
+CACHE_FILE = ROOT / "evidence" / "phase2-golden-pack" / "validation-cache.json"
+VALIDATOR_SOURCES = [
+    Path(__file__).resolve(),
+    Path(golden_pack_cache.__file__).resolve(),
+    Path(sensitive_scan.__file__).resolve(),
+    Path(stream_json.__file__).resolve(),
+    Path(schema_compiler.__file__).resolve(),
 ]
+MOCK_ERROR_BUDGET = 50
+
+REQUIRED_SCENARIOS = [
+    "intake_valid.json",
+    "search_results_3_to_5.json",
+    "schedule_requires_confirmation.json",
+    "proposal_template_output.json",
+    "followup_internal_only.json",
+]
+
+REQUIRED_PACK_FILES = [
+    "pack.json",
+    "operational-policy.json",
+    "schemas/lead-card.schema.json",
+    *(f"scenarios/{name}" for name in REQUIRED_SCENARIOS),
+]
+
 
+@dataclass
+class CheckResult:
+    """One row of the machine-readable result stream."""
+
+    check: str
+    pack: str
+    file: str
+    status: str
+    duration_ms: float
+    cached: bool = False
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PackReport:
+    """Errors and warnings collected while validating a single pack."""
+
+    pack: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    checks: list[CheckResult] = field(default_factory=list)
+
+    def fail(self, message: str) -> None:
+        self.errors.append(message)
+
+    def warn(self, message: str) -> None:
+        self.warnings.append(message)
+
+    def record(
+        self,
+        check: str,
+        file: str,
+        errors: list[str],
+        warnings: list[str],
+        duration_ms: float,
+        cached: bool = False,
+    ) -> None:
+        status = "fail" if errors else "warn" if warnings else "pass"
+        self.checks.append(
+            CheckResult(check, self.pack, file, status, round(duration_ms, 3), cached, list(errors), list(warnings))
+        )
+        self.errors.extend(errors)
+        self.warnings.extend(warnings)
 
-def fail(message: str) -> None:
-    ERRORS.append(message)
+    def run_check(self, check: str, file: Path, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(report, *args) as a named, timed check on a scratch report."""
+        scratch = PackReport(pack=self.pack)
+        start = time.perf_counter()
+        result = func(scratch, *args)
+        self.record(check, str(rel(file)), scratch.errors, scratch.warnings, (time.perf_counter() - start) * 1000)
+        return result
 
 
-def warn(message: str) -> None:
-    WARNINGS.append(message)
+def rel(path: Path) -> Path:
+    try:
+        return path.relative_to(ROOT)
+    except ValueError:
+        return path
 
 
-def load_json(path: Path) -> Any | None:
+def load_json(report: PackReport, path: Path) -> Any | None:
     try:
         return json.loads(path.read_text(encoding="utf-8"))
     except Exception as exc:  # noqa: BLE001
-        fail(f"{path.relative_to(ROOT)} invalid JSON: {exc}")
+        report.fail(f"{rel(path)} invalid JSON: {exc}")
         return None
 
 
-def ensure_exists(paths: list[Path]) -> None:
+def ensure_exists(report: PackReport, paths: list[Path]) -> None:
     for path in paths:
         if not path.exists():
-            fail(f"Missing required file: {path.relative_to(ROOT)}")
+            report.fail(f"Missing required file: {rel(path)}")
 
 
-def ensure_pack_contract(pack: dict[str, Any]) -> None:
+def ensure_pack_contract(report: PackReport, pack: dict[str, Any]) -> None:
     required_fields = [
         "id",
         "name",
@@ -61,47 +143,57 @@ def ensure_pack_contract(pack: dict[str, Any]) -> None:
     ]
     for field in required_fields:
         if field not in pack:
-            fail(f"pack.json missing required field: {field}")
+            report.fail(f"pack.json missing required field: {field}")
 
-    deny = pack.get("tool_policy", {}).get("deny", [])
-    allow = pack.get("tool_policy", {}).get("allow", [])
+    tool_policy = pack.get("tool_policy", {})
+    if not isinstance(tool_policy, dict):
+        report.fail("pack.json tool_policy must be an object")
+        tool_policy = {}
+    deny = tool_policy.get("deny", [])
+    allow = tool_policy.get("allow", [])
 
     if not isinstance(deny, list) or not isinstance(allow, list):
-        fail("pack.json tool_policy.allow/deny must be arrays")
+        report.fail("pack.json tool_policy.allow/deny must be arrays")
     else:
         required_deny = {"exec", "browser", "apply_patch"}
         missing_deny = sorted(required_deny - set(deny))
         if missing_deny:
-            fail(f"pack.json deny list missing: {', '.join(missing_deny)}")
+            report.fail(f"pack.json deny list missing: {', '.join(missing_deny)}")
 
     entrypoints = pack.get("entrypoints", {})
+    if not isinstance(entrypoints, dict):
+        report.fail("pack.json entrypoints must be an object")
+        entrypoints = {}
     for key in ["intake", "search", "schedule", "proposal", "followup"]:
         if key not in entrypoints:
-            fail(f"pack.json entrypoints missing key: {key}")
+            report.fail(f"pack.json entrypoints missing key: {key}")
 
     compliance = pack.get("compliance", {})
+    if not isinstance(compliance, dict):
+        report.fail("pack.json compliance must be an object")
+        compliance = {}
     forbidden = compliance.get("forbidden_chat_fields", [])
     if not isinstance(forbidden, list) or len(forbidden) == 0:
-        fail("pack.json compliance.forbidden_chat_fields must be a non-empty array")
+        report.fail("pack.json compliance.forbidden_chat_fields must be a non-empty array")
 
 
-def ensure_operational_policy(policy: dict[str, Any]) -> None:
+def ensure_operational_policy(report: PackReport, policy: dict[str, Any]) -> None:
     if policy.get("default_mode") != "safe":
-        fail("operational-policy.json default_mode must be 'safe'")
+        report.fail("operational-policy.json default_mode must be 'safe'")
 
     if policy.get("external_auto_send") is not False:
-        fail("operational-policy.json external_auto_send must be false")
+        report.fail("operational-policy.json external_auto_send must be false")
 
     assisted = policy.get("assisted_auto_actions", [])
     if not isinstance(assisted, list) or not assisted:
-        fail("operational-policy.json assisted_auto_actions must be a non-empty array")
+        report.fail("operational-policy.json assisted_auto_actions must be a non-empty array")
 
     required_confirm = policy.get("requires_confirmation_actions", [])
     if not isinstance(required_confirm, list) or not required_confirm:
-        fail("operational-policy.json requires_confirmation_actions must be a non-empty array")
+        report.fail("operational-policy.json requires_confirmation_actions must be a non-empty array")
 
 
-def ensure_lead_card_schema(schema: dict[str, Any]) -> None:
+def ensure_lead_card_schema(report: PackReport, schema: dict[str, Any]) -> None:
     required = set(schema.get("required", []))
     expected = {
         "lead_id",
@@ -116,13 +208,13 @@ def ensure_lead_card_schema(schema: dict[str, Any]) -> None:
     }
     missing = sorted(expected - required)
     if missing:
-        fail(f"lead-card.schema.json missing required fields: {', '.join(missing)}")
+        report.fail(f"lead-card.schema.json missing required fields: {', '.join(missing)}")
 
     if schema.get("type") != "object":
-        fail("lead-card.schema.json root type must be object")
+        report.fail("lead-card.schema.json root type must be object")
 
     if schema.get("additionalProperties") is not False:
-        fail("lead-card.schema.json must set additionalProperties=false")
+        report.fail("lead-card.schema.json must set additionalProperties=false")
 
     sensitive_prop_hits = []
     properties = schema.get("properties", {})
@@ -132,115 +224,138 @@ def ensure_lead_card_schema(schema: dict[str, Any]) -> None:
             sensitive_prop_hits.append(key)
 
     if sensitive_prop_hits:
-        fail(
+        report.fail(
             "lead-card.schema.json must not expose sensitive properties: "
             + ", ".join(sorted(sensitive_prop_hits))
         )
 
-
-def ensure_mock_data(data: dict[str, Any]) -> None:
-    props = data.get("properties", [])
-    if not isinstance(props, list) or len(props) < 5:
-        fail("properties.mock.json must contain at least 5 properties")
+    try:
+        CompiledSchema(schema)
+    except (SchemaCompileError, re.error, KeyError, IndexError, TypeError) as exc:
+        report.fail(f"lead-card.schema.json cannot be compiled: {exc}")
+
+
+PROPERTY_REQUIRED_FIELDS = {
+    "id",
+    "title",
+    "area",
+    "city",
+    "state",
+    "price_brl",
+    "bedrooms",
+    "bathrooms",
+    "parking",
+    "property_type",
+    "availability",
+    "source",
+}
+
+
+def ensure_mock_data(report: PackReport, path: Path, error_budget: int = MOCK_ERROR_BUDGET) -> None:
+    """Stream-check properties.mock.json, holding one property in memory at a time."""
+    result = validate_records(path, "properties", PROPERTY_REQUIRED_FIELDS, error_budget)
+
+    for error in result.errors:
+        if error.message == "must be an object":
+            report.fail(f"properties.mock.json property #{error.index} must be an object (byte {error.offset})")
+        else:
+            report.fail(f"properties.mock.json property #{error.index} {error.message} (byte {error.offset})")
+
+    if result.truncated:
+        report.fail(f"properties.mock.json stopped after {error_budget} record error(s)")
+    elif result.invalid_json:
+        report.fail(f"properties.mock.json {result.fatal}")
+    elif result.records < 5:
+        report.fail("properties.mock.json must contain at least 5 properties")
+
+
+def scan_strings_for_sensitive_terms(
+    report: PackReport, node: Any, terms: tuple[str, ...] = tuple(SENSITIVE_TERMS)
+) -> None:
+    for term, path in compile_scanner(terms).scan(node):
+        report.fail(f"Sensitive term '{term}' found in example value at {path}")
+
+
+def pack_sensitive_terms(pack_dir: Path) -> tuple[str, ...]:
+    """SENSITIVE_TERMS plus the pack's own compliance.forbidden_chat_fields."""
+    terms = list(SENSITIVE_TERMS)
+    try:
+        pack = json.loads((pack_dir / "pack.json").read_bytes())
+        forbidden = pack["compliance"]["forbidden_chat_fields"]
+    except (OSError, ValueError, KeyError, TypeError):
+        forbidden = []
+    if isinstance(forbidden, list):
+        terms.extend(term for term in forbidden if isinstance(term, str) and term not in terms)
+    return tuple(terms)
+
+
+def ensure_scenario(
+    report: PackReport, path: Path, payload: Any, terms: tuple[str, ...] = tuple(SENSITIVE_TERMS)
+) -> None:
+    name = path.name
+    if not isinstance(payload, dict) or "input" not in payload or "expected_output" not in payload:
+        report.fail(f"{rel(path)} must contain input and expected_output")
+        if not isinstance(payload, dict):
+            return
+
+    scan_strings_for_sensitive_terms(report, payload, terms)
+
+    if name == "search_results_3_to_5.json":
+        expected = payload.get("expected_output", {})
+        if expected.get("result_count_min") != 3:
+            report.fail("search_results_3_to_5 expected result_count_min must be 3")
+        if expected.get("result_count_max") != 5:
+            report.fail("search_results_3_to_5 expected result_count_max must be 5")
+
+    if name == "schedule_requires_confirmation.json":
+        expected = payload.get("expected_output", {})
+        if expected.get("requires_confirmation") is not True:
+            report.fail("schedule_requires_confirmation must require confirmation")
+        if expected.get("external_action_executed") is not False:
+            report.fail("schedule_requires_confirmation cannot auto execute external action")
+
+    if name == "followup_internal_only.json":
+        expected = payload.get("expected_output", {})
+        if expected.get("outbound_auto_send") is not False:
+            report.fail("followup_internal_only must keep outbound_auto_send=false")
+        if expected.get("internal_alert") is not True:
+            report.fail("followup_internal_only must generate internal alert")
+
+
+def ensure_scenario_lead_cards(report: PackReport, path: Path, payload: Any, schema: CompiledSchema) -> None:
+    """Validate expected_output.lead_card / lead_cards against the pack's lead-card schema."""
+    expected = payload.get("expected_output") if isinstance(payload, dict) else None
+    if not isinstance(expected, dict):
         return
 
-    required_fields = {
-        "id",
-        "title",
-        "area",
-        "city",
-        "state",
-        "price_brl",
-        "bedrooms",
-        "bathrooms",
-        "parking",
-        "property_type",
-        "availability",
-        "source",
-    }
-
-    for idx, item in enumerate(props, start=1):
-        if not isinstance(item, dict):
-            fail(f"properties.mock.json property #{idx} must be an object")
-            continue
-        missing = sorted(required_fields - set(item.keys()))
-        if missing:
-            fail(f"properties.mock.json property #{idx} missing fields: {', '.join(missing)}")
-
+    cards: list[Any] = []
+    if "lead_card" in expected:
+        cards.append(expected["lead_card"])
+    if isinstance(expected.get("lead_cards"), list):
+        cards.extend(expected["lead_cards"])
 
-def scan_strings_for_sensitive_terms(node: Any, path: str = "$") -> None:
-    skip_keys = {
-        "forbidden_chat_fields",
-        "forbidden_fields_absent",
-        "rule_summary",
-        "description",
-    }
-
-    if isinstance(node, dict):
-        for key, value in node.items():
-            if key in skip_keys:
-                continue
-            scan_strings_for_sensitive_terms(value, f"{path}.{key}")
-        return
-
-    if isinstance(node, list):
-        for index, value in enumerate(node):
-            scan_strings_for_sensitive_terms(value, f"{path}[{index}]")
+    if not cards:
+        if expected.get("must_pass_schema") is True:
+            report.warn(f"{rel(path)} sets must_pass_schema but has no expected_output.lead_card to check")
         return
 
-    if isinstance(node, str):
-        text = node.lower()
-        for term in SENSITIVE_TERMS:
-            if re.search(rf"\\b{re.escape(term)}\\b", text):
-                fail(f"Sensitive term '{term}' found in example value at {path}")
-
-
-def ensure_scenarios(scenarios_dir: Path) -> None:
-    required = [
-        "intake_valid.json",
-        "search_results_3_to_5.json",
-        "schedule_requires_confirmation.json",
-        "proposal_template_output.json",
-        "followup_internal_only.json",
-    ]
-    for name in required:
-        path = scenarios_dir / name
-        if not path.exists():
-            fail(f"Missing required scenario: {path.relative_to(ROOT)}")
-            continue
-
-        payload = load_json(path)
-        if payload is None:
+    required_present = expected.get("required_fields_present", [])
+    forbidden_absent = expected.get("forbidden_fields_absent", [])
+    for index, card in enumerate(cards, start=1):
+        # Each card is checked from its own root, so errors read "$.field".
+        for error in schema.errors(card):
+            report.fail(f"{rel(path)} lead card #{index} {error}")
+        if not isinstance(card, dict):
             continue
-
-        if "input" not in payload or "expected_output" not in payload:
-            fail(f"{path.relative_to(ROOT)} must contain input and expected_output")
-
-        scan_strings_for_sensitive_terms(payload)
-
-        if name == "search_results_3_to_5.json":
-            expected = payload.get("expected_output", {})
-            if expected.get("result_count_min") != 3:
-                fail("search_results_3_to_5 expected result_count_min must be 3")
-            if expected.get("result_count_max") != 5:
-                fail("search_results_3_to_5 expected result_count_max must be 5")
-
-        if name == "schedule_requires_confirmation.json":
-            expected = payload.get("expected_output", {})
-            if expected.get("requires_confirmation") is not True:
-                fail("schedule_requires_confirmation must require confirmation")
-            if expected.get("external_action_executed") is not False:
-                fail("schedule_requires_confirmation cannot auto execute external action")
-
-        if name == "followup_internal_only.json":
-            expected = payload.get("expected_output", {})
-            if expected.get("outbound_auto_send") is not False:
-                fail("followup_internal_only must keep outbound_auto_send=false")
-            if expected.get("internal_alert") is not True:
-                fail("followup_internal_only must generate internal alert")
+        missing = sorted(set(required_present) - set(card))
+        if missing:
+            report.fail(f"{rel(path)} lead card #{index} missing required_fields_present: {', '.join(missing)}")
+        leaked = sorted(set(forbidden_absent) & set(card))
+        if leaked:
+            report.fail(f"{rel(path)} lead card #{index} contains forbidden fields: {', '.join(leaked)}")
 
 
-def ensure_template_structure(template_dir: Path) -> None:
+def ensure_template_structure(report: PackReport, template_dir: Path) -> None:
     required = [
         template_dir / "README.md",
         template_dir / "CHECKLIST.md",
@@ -254,54 +369,316 @@ def ensure_template_structure(template_dir: Path) -> None:
         template_dir / "scenarios" / "proposal_template_output.json",
         template_dir / "scenarios" / "followup_internal_only.json",
     ]
-    ensure_exists(required)
+    ensure_exists(report, required)
+
+
+def load_registry(report: PackReport) -> list[str]:
+    """Return pack ids referenced by any vertical in the registry, in order."""
+    if not REGISTRY_FILE.exists():
+        report.fail(f"Missing required file: {rel(REGISTRY_FILE)}")
+        return []
+
+    registry = load_json(report, REGISTRY_FILE)
+    if not isinstance(registry, dict):
+        if registry is not None:
+            report.fail(f"{rel(REGISTRY_FILE)} root must be an object")
+        return []
+
+    pack_ids: list[str] = []
+    for vertical, entry in registry.items():
+        packs = entry.get("packs") if isinstance(entry, dict) else None
+        if not isinstance(packs, list):
+            report.fail(f"{rel(REGISTRY_FILE)} vertical '{vertical}' must declare a packs array")
+            continue
+        for pack_id in packs:
+            if pack_id not in pack_ids:
+                pack_ids.append(pack_id)
+    return pack_ids
+
+
+def discover_packs() -> dict[str, Path]:
+    """Map pack id to directory for every vertical pack under templates/packs."""
+    if not PACKS_DIR.is_dir():
+        return {}
+    return {
+        path.name: path
+        for path in sorted(PACKS_DIR.iterdir())
+        if path.is_dir() and not path.name.startswith("_")
+    }
 
 
-def main() -> int:
-    print("Running Golden Pack validation...")
+def select_packs(report: PackReport) -> list[Path]:
+    """Resolve registry pack ids against the packs found on disk."""
+    discovered = discover_packs()
+    selected: list[Path] = []
+    for pack_id in load_registry(report):
+        if pack_id in discovered:
+            selected.append(discovered.pop(pack_id))
+        elif not (TEMPLATES_DIR / pack_id).is_dir():
+            report.fail(f"{rel(REGISTRY_FILE)} references unknown pack: {pack_id}")
+
+    for pack_id in discovered:
+        report.warn(f"templates/packs/{pack_id} is not referenced by {rel(REGISTRY_FILE)}; skipped")
+    return selected
+
 
-    required_realestate = [
-        REAL_ESTATE_DIR / "pack.json",
-        REAL_ESTATE_DIR / "operational-policy.json",
-        REAL_ESTATE_DIR / "schemas" / "lead-card.schema.json",
-        REAL_ESTATE_DIR / "data" / "properties.mock.json",
-        REAL_ESTATE_DIR / "scenarios" / "intake_valid.json",
-        REAL_ESTATE_DIR / "scenarios" / "search_results_3_to_5.json",
-        REAL_ESTATE_DIR / "scenarios" / "schedule_requires_confirmation.json",
-        REAL_ESTATE_DIR / "scenarios" / "proposal_template_output.json",
-        REAL_ESTATE_DIR / "scenarios" / "followup_internal_only.json",
+def ensure_compositions(report: PackReport) -> None:
+    """Every registry vertical must resolve to one effective pack without conflicts."""
+    composer = PackComposer(REGISTRY_FILE)
+    try:
+        verticals = list(composer.registry())
+    except (OSError, CompositionError):
+        return  # already reported by the registry check
+    for vertical in verticals:
+        try:
+            effective = composer.resolve(vertical)
+        except CompositionError as exc:
+            report.fail(f"vertical '{vertical}' cannot be composed: {exc}")
+            continue
+        for conflict in effective.conflicts:
+            report.warn(f"vertical '{vertical}': {conflict}")
+
+
+FILE_RULES = {
+    "pack_contract": ensure_pack_contract,
+    "operational_policy": ensure_operational_policy,
+    "lead_card_schema": ensure_lead_card_schema,
+}
+
+def load_lead_card_schema(pack_dir: Path) -> CompiledSchema | None:
+    """Compiled lead-card schema, or None when it is unreadable (reported by its own rule)."""
+    try:
+        return compile_schema_text((pack_dir / "schemas" / "lead-card.schema.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError, re.error, KeyError, IndexError, TypeError):
+        return None
+
+
+# (cache key, path, rule, rule params)
+FileJob = tuple[str, Path, str, tuple[str, ...]]
+
+
+def pack_file_rules(pack_dir: Path, error_budget: int = MOCK_ERROR_BUDGET) -> list[tuple[Path, str, tuple[str, ...]]]:
+    """List the (file, rule, params) checks that make up a pack's content checks."""
+    terms = pack_sensitive_terms(pack_dir)
+    rules = [
+        (pack_dir / "pack.json", "pack_contract", ()),
+        (pack_dir / "operational-policy.json", "operational_policy", ()),
+        (pack_dir / "schemas" / "lead-card.schema.json", "lead_card_schema", ()),
+        (pack_dir / "data" / "properties.mock.json", "mock_properties", (str(error_budget),)),
     ]
-    ensure_exists(required_realestate)
+    rules.extend((pack_dir / "scenarios" / name, "scenario", terms) for name in REQUIRED_SCENARIOS)
+
+    schema_path = pack_dir / "schemas" / "lead-card.schema.json"
+    if schema_path.exists():
+        schema_digest = (sha256_file(schema_path),)
+        rules.extend(
+            (pack_dir / "scenarios" / name, "scenario_lead_cards", schema_digest) for name in REQUIRED_SCENARIOS
+        )
+    return [rule for rule in rules if rule[0].exists()]
+
 
-    pack = load_json(REAL_ESTATE_DIR / "pack.json")
-    if isinstance(pack, dict):
-        ensure_pack_contract(pack)
+def rule_id(rule: str, params: tuple[str, ...]) -> str:
+    """Cache identity of a rule, including the params (terms, budget) it runs with."""
+    if not params:
+        return rule
+    return f"{rule}:{hashlib.sha256(chr(0).join(params).encode()).hexdigest()[:12]}"
 
-    operational_policy = load_json(REAL_ESTATE_DIR / "operational-policy.json")
-    if isinstance(operational_policy, dict):
-        ensure_operational_policy(operational_policy)
 
-    schema = load_json(REAL_ESTATE_DIR / "schemas" / "lead-card.schema.json")
-    if isinstance(schema, dict):
-        ensure_lead_card_schema(schema)
+def check_file(key: str, path: Path, rule: str, params: tuple[str, ...] = ()) -> FileFindings:
+    """Run one rule over one file and return its findings with the file fingerprint."""
+    report = PackReport(pack=key)
+    start = time.perf_counter()
+    stat = path.stat()
+
+    if rule == "mock_properties":
+        # Mock datasets can be hundreds of MB: hash and validate them as streams.
+        digest = sha256_file(path)
+        ensure_mock_data(report, path, int(params[0]))
+    else:
+        raw = path.read_bytes()
+        digest = sha256_bytes(raw)
+        try:
+            payload = json.loads(raw)
+        except Exception as exc:  # noqa: BLE001
+            report.fail(f"{rel(path)} invalid JSON: {exc}")
+        else:
+            if rule == "scenario":
+                ensure_scenario(report, path, payload, params)
+            elif rule == "scenario_lead_cards":
+                schema = load_lead_card_schema(path.parents[1])
+                if schema is not None:
+                    ensure_scenario_lead_cards(report, path, payload, schema)
+            elif isinstance(payload, dict):
+                FILE_RULES[rule](report, payload)
+
+    return FileFindings(
+        key=key,
+        rule=rule_id(rule, params),
+        sha256=digest,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        errors=report.errors,
+        warnings=report.warnings,
+        duration_ms=round((time.perf_counter() - start) * 1000, 3),
+    )
+
+
+def check_files(jobs: list[FileJob]) -> list[FileFindings]:
+    return [check_file(*job) for job in jobs]
+
+
+def ensure_pack_structure(report: PackReport, pack_dir: Path) -> None:
+    ensure_exists(report, [pack_dir / name for name in REQUIRED_PACK_FILES])
+
+    mock_files = sorted((pack_dir / "data").glob("*.mock.json"))
+    if not mock_files:
+        report.fail(f"Missing mock dataset: {rel(pack_dir / 'data')}/*.mock.json")
+
+
+def validate_template(template_dir: Path) -> PackReport:
+    report = PackReport(pack=template_dir.name)
+    report.run_check("template_structure", template_dir, ensure_template_structure, template_dir)
+    return report
+
+
+def run_gate(
+    jobs: int | None = None,
+    use_cache: bool = True,
+    error_budget: int = MOCK_ERROR_BUDGET,
+) -> list[PackReport]:
+    """Validate every registered pack plus the golden template.
+
+    File checks whose content hash and rule set match the cache reuse their
+    stored findings. Packs with stale files are re-checked in a worker process
+    each, so gate wall-time tracks the slowest pack rather than the number of
+    packs.
+    """
+    gate = PackReport(pack="registry")
+    pack_dirs = gate.run_check("registry", REGISTRY_FILE, select_packs)
+    gate.run_check("composition", REGISTRY_FILE, ensure_compositions)
+
+    version = ruleset_version(VALIDATOR_SOURCES)
+    cache = ValidationCache.load(CACHE_FILE, version) if use_cache else ValidationCache(CACHE_FILE, version)
+
+    reports: list[PackReport] = []
+    findings: dict[str, FileFindings] = {}
+    pending: list[list[FileJob]] = []
+    plans: list[list[str]] = []
+
+    for pack_dir in pack_dirs:
+        report = PackReport(pack=pack_dir.name)
+        report.run_check("pack_structure", pack_dir, ensure_pack_structure, pack_dir)
+        reports.append(report)
+
+        keys: list[str] = []
+        stale: list[FileJob] = []
+        for path, rule, params in pack_file_rules(pack_dir, error_budget):
+            key = f"{rel(path)}:{rule}"
+            keys.append(key)
+            hit = cache.lookup(key, path, rule_id(rule, params)) if use_cache else None
+            if hit is None:
+                stale.append((key, path, rule, params))
+            else:
+                findings[key] = hit
+        plans.append(keys)
+        if stale:
+            pending.append(stale)
+
+    workers = min(len(pending), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [check_files(batch) for batch in pending]
+    else:
+        # Imported lazily: a fully cached run never needs the pool.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(check_files, pending))
+
+    for batch in results:
+        for result in batch:
+            findings[result.key] = result
+            cache.store(result)
+
+    for report, keys in zip(reports, plans):
+        for key in keys:
+            result = findings[key]
+            file, _, check = key.rpartition(":")
+            report.record(check, file, result.errors, result.warnings, result.duration_ms, result.cached)
+
+    if use_cache:
+        cache.save()
+
+    return [gate, *reports, validate_template(TEMPLATE_DIR)]
+
+
+def write_results(path: Path, reports: list[PackReport], duration_ms: float) -> None:
+    """Write the NDJSON result stream: check records, then one summary record."""
+    error_count = sum(len(r.errors) for r in reports)
+    summary = {
+        "type": "summary",
+        "status": "FAIL" if error_count else "PASS",
+        "errors": error_count,
+        "warnings": sum(len(r.warnings) for r in reports),
+        "checks": sum(len(r.checks) for r in reports),
+        "packs": [r.pack for r in reports if r.pack != "registry"],
+        "duration_ms": round(duration_ms, 3),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for report in reports:
+            for check in report.checks:
+                handle.write(json.dumps({"type": "check", **asdict(check)}) + "\n")
+        handle.write(json.dumps(summary) + "\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Worker processes (default: one per pack, capped at CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not update {rel(CACHE_FILE)}",
+    )
+    parser.add_argument(
+        "--error-budget",
+        type=int,
+        default=MOCK_ERROR_BUDGET,
+        help="Stop checking a mock dataset after N record errors (0 = report all)",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        help="Write one NDJSON record per check plus a final summary record to this file",
+    )
+    args = parser.parse_args(argv)
+
+    print("Running Golden Pack validation...")
+    start = time.perf_counter()
+    reports = run_gate(args.jobs, use_cache=not args.no_cache, error_budget=args.error_budget)
+    duration_ms = (time.perf_counter() - start) * 1000
 
-    mock_data = load_json(REAL_ESTATE_DIR / "data" / "properties.mock.json")
-    if isinstance(mock_data, dict):
-        ensure_mock_data(mock_data)
+    errors = [f"[{r.pack}] {message}" for r in reports for message in r.errors]
+    warnings = [f"[{r.pack}] {message}" for r in reports for message in r.warnings]
 
-    ensure_scenarios(REAL_ESTATE_DIR / "scenarios")
-    ensure_template_structure(TEMPLATE_DIR)
+    if args.results:
+        write_results(args.results, reports, duration_ms)
 
-    for warning in WARNINGS:
+    for warning in warnings:
         print(f"WARN: {warning}")
-    for error in ERRORS:
+    for error in errors:
         print(f"ERROR: {error}")
 
-    if ERRORS:
-        print(f"FAIL: {len(ERRORS)} error(s), {len(WARNINGS)} warning(s)")
+    if errors:
+        print(f"FAIL: {len(errors)} error(s), {len(warnings)} warning(s)")
         return 1
 
-    print(f"PASS: Golden Pack validation succeeded with {len(WARNINGS)} warning(s)")
+    print(f"PASS: Golden Pack validation succeeded with {len(warnings)} warning(s)")
     return 0
 
 
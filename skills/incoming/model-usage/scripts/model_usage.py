@@ -3,6 +3,11 @@
 Summarize CodexBar local cost usage by model.
 
 Defaults to current model (most recent daily entry), or list all models.
+
+Daily rows fetched from codexbar are kept in an on-disk cache, one history per
+provider. Each run ingests only the rows from the cache's high-water mark (its
+latest date) onward; that day is re-read because it may still have been in
+progress. The report is then one pass over the days in date order.
 """
 
 from __future__ import annotations
@@ -12,6 +17,7 @@ import json
 import os
 import subprocess
 import sys
+import tempfile
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Tuple
@@ -61,10 +67,29 @@ def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
     raise RuntimeError("Unsupported JSON input format.")
 
 
+CACHE_VERSION = 1
+
+
 @dataclass
 class ModelCost:
     model: str
-    cost: float
+    cost: Optional[float]
+
+
+@dataclass
+class DayCost:
+    date: str
+    costs: List[ModelCost]
+    fallback_model: Optional[str]
+
+
+@dataclass
+class Summary:
+    totals: Dict[str, float]
+    current_model: Optional[str]
+    current_date: Optional[str]
+    latest: Dict[str, Tuple[str, Optional[float]]]
+    day_count: int
 
 
 def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -83,69 +108,141 @@ def parse_date(value: str) -> Optional[date]:
         return None
 
 
-def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+def to_day_cost(entry: Dict[str, Any]) -> Optional[DayCost]:
+    day = entry.get("date")
+    if not isinstance(day, str):
+        return None
+    costs: List[ModelCost] = []
+    breakdowns = entry.get("modelBreakdowns")
+    if isinstance(breakdowns, list):
+        for item in breakdowns:
+            if not isinstance(item, dict) or not isinstance(item.get("modelName"), str):
+                continue
+            cost = item.get("cost")
+            costs.append(ModelCost(model=item["modelName"], cost=float(cost) if isinstance(cost, (int, float)) else None))
+    models_used = entry.get("modelsUsed")
+    fallback = models_used[-1] if isinstance(models_used, list) and models_used else None
+    return DayCost(date=day, costs=costs, fallback_model=fallback if isinstance(fallback, str) else None)
+
+
+def merge_days(history: List[DayCost], entries: Iterable[Dict[str, Any]]) -> List[DayCost]:
+    """Fold daily rows from the high-water mark onward into a date-ordered history."""
+    high_water = history[-1].date if history else ""
+    fresh: Dict[str, DayCost] = {}
+    for entry in entries:
+        day = to_day_cost(entry)
+        if day is not None and day.date >= high_water:
+            fresh[day.date] = day
+    if not fresh:
+        return history
+    # Fresh rows start at the high-water mark: they replace at most the last
+    # cached day and otherwise extend the history.
+    if history and history[-1].date in fresh:
+        history = history[:-1]
+    return history + [fresh[key] for key in sorted(fresh)]
+
+
+def default_cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "model-usage", "cost-history.json")
+
+
+def load_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    providers = data.get("providers")
+    return providers if isinstance(providers, dict) else {}
+
+
+def history_from_cache(providers: Dict[str, Any], provider: str) -> List[DayCost]:
+    try:
+        return [
+            DayCost(
+                date=row["date"],
+                costs=[ModelCost(model=model, cost=cost) for model, cost in row["costs"]],
+                fallback_model=row.get("fallbackModel"),
+            )
+            for row in providers.get(provider, {}).get("days", [])
+        ]
+    except (KeyError, TypeError, ValueError, AttributeError):
+        # Unreadable history: start over from the next fetch.
+        return []
+
+
+def save_cache(path: str, providers: Dict[str, Any], provider: str, history: List[DayCost]) -> None:
+    providers = dict(providers)
+    providers[provider] = {
+        "highWaterMark": history[-1].date if history else None,
+        "days": [
+            {
+                "date": day.date,
+                "costs": [[item.model, item.cost] for item in day.costs],
+                "fallbackModel": day.fallback_model,
+            }
+            for day in history
+        ],
+    }
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".cost-history-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump({"version": CACHE_VERSION, "providers": providers}, handle)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def filter_by_days(history: List[DayCost], days: Optional[int]) -> List[DayCost]:
     if not days:
-        return entries
+        return history
     cutoff = date.today() - timedelta(days=days - 1)
-    filtered: List[Dict[str, Any]] = []
-    for entry in entries:
-        day = entry.get("date")
-        if not isinstance(day, str):
-            continue
-        parsed = parse_date(day)
+    filtered: List[DayCost] = []
+    for day in history:
+        parsed = parse_date(day.date)
         if parsed and parsed >= cutoff:
-            filtered.append(entry)
+            filtered.append(day)
     return filtered
 
 
-def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+def summarize(history: List[DayCost]) -> Summary:
+    """Totals, current model and each model's latest day cost in one date-ordered pass."""
     totals: Dict[str, float] = {}
-    for entry in entries:
-        breakdowns = entry.get("modelBreakdowns")
-        if not breakdowns:
-            continue
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
+    latest: Dict[str, Tuple[str, Optional[float]]] = {}
+    current_model: Optional[str] = None
+    current_date: Optional[str] = None
+    for day in history:
+        seen = set()
+        best: Optional[ModelCost] = None
+        for item in day.costs:
+            if item.model not in seen:
+                # A row's first entry for a model is its cost that day.
+                seen.add(item.model)
+                latest[item.model] = (day.date, item.cost)
+            if item.cost is None:
                 continue
-            model = item.get("modelName")
-            cost = item.get("cost")
-            if not isinstance(model, str):
-                continue
-            if not isinstance(cost, (int, float)):
-                continue
-            totals[model] = totals.get(model, 0.0) + float(cost)
-    return totals
-
-
-def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
+            totals[item.model] = totals.get(item.model, 0.0) + item.cost
+            if best is None or item.cost > best.cost:
+                best = item
+        # The current model is the top spender of the latest day with costs,
+        # else the last model that day reports using.
+        if best is not None:
+            current_model, current_date = best.model, day.date
+        elif day.fallback_model is not None:
+            current_model, current_date = day.fallback_model, day.date
+    return Summary(
+        totals=totals,
+        current_model=current_model,
+        current_date=current_date,
+        latest=latest,
+        day_count=len(history),
     )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if isinstance(breakdowns, list) and breakdowns:
-            scored: List[ModelCost] = []
-            for item in breakdowns:
-                if not isinstance(item, dict):
-                    continue
-                model = item.get("modelName")
-                cost = item.get("cost")
-                if isinstance(model, str) and isinstance(cost, (int, float)):
-                    scored.append(ModelCost(model=model, cost=float(cost)))
-            if scored:
-                scored.sort(key=lambda item: item.cost, reverse=True)
-                return scored[0].model, entry.get("date") if isinstance(entry.get("date"), str) else None
-        models_used = entry.get("modelsUsed")
-        if isinstance(models_used, list) and models_used:
-            last = models_used[-1]
-            if isinstance(last, str):
-                return last, entry.get("date") if isinstance(entry.get("date"), str) else None
-    return None, None
 
 
 def usd(value: Optional[float]) -> str:
@@ -154,27 +251,6 @@ def usd(value: Optional[float]) -> str:
     return f"${value:,.2f}"
 
 
-def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional[str], Optional[float]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            if item.get("modelName") == model:
-                cost = item.get("cost") if isinstance(item.get("cost"), (int, float)) else None
-                day = entry.get("date") if isinstance(entry.get("date"), str) else None
-                return day, float(cost) if cost is not None else None
-    return None, None
-
-
 def render_text_current(
     provider: str,
     model: str,
@@ -242,29 +318,44 @@ def main() -> int:
     parser.add_argument("--days", type=int, help="Limit to last N days (based on daily rows).")
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument("--cache", help="Path to the daily cost history cache (default: $XDG_CACHE_HOME/model-usage/cost-history.json).")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor update the cache; use only the fetched rows.")
 
     args = parser.parse_args()
 
+    # --input is a one-off payload: it neither reads nor feeds the cache.
+    use_cache = not args.input and not args.no_cache
+    cache_path = args.cache or default_cache_path()
+    providers = load_cache(cache_path) if use_cache else {}
+    history = history_from_cache(providers, args.provider)
+
     try:
         payload = load_payload(args.input, args.provider)
     except Exception as exc:
         eprint(str(exc))
         return 1
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
+    history = merge_days(history, parse_daily_entries(payload))
+    if use_cache:
+        try:
+            save_cache(cache_path, providers, args.provider, history)
+        except OSError as exc:
+            eprint(f"Warning: could not update cache {cache_path}: {exc}")
+
+    history = filter_by_days(history, args.days)
+    summary = summarize(history)
+    totals = summary.totals
 
     if args.mode == "current":
         model = args.model
         latest_date = None
         if not model:
-            model, latest_date = pick_current_model(entries)
+            model, latest_date = summary.current_model, summary.current_date
         if not model:
             eprint("No model data found in codexbar cost payload.")
             return 2
-        totals = aggregate_costs(entries)
         total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
+        latest_cost_date, latest_cost = summary.latest.get(model, (None, None))
 
         if args.format == "json":
             payload_out = build_json_current(
@@ -274,7 +365,7 @@ def main() -> int:
                 total_cost=total_cost,
                 latest_cost=latest_cost,
                 latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
+                entry_count=summary.day_count,
             )
             indent = 2 if args.pretty else None
             print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
@@ -287,12 +378,11 @@ def main() -> int:
                     total_cost=total_cost,
                     latest_cost=latest_cost,
                     latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
+                    entry_count=summary.day_count,
                 )
             )
         return 0
 
-    totals = aggregate_costs(entries)
     if not totals:
         eprint("No model breakdowns found in codexbar cost payload.")
         return 2
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Stress test: concurrent writers must not lose updates.
+
+Creates one task in a scratch workspace, then fires N `log-time <task> 1`
+commands from a process pool, each worker running task_manager commands
+against the shared store like a separate agent would. Afterwards the task's
+actual_minutes must equal N, and the WAL must hold N TIME_LOG entries with
+unique, gap-free sequence numbers.
+
+    python3 scripts/bench_concurrency.py --updates 1000 --workers 16
+    python3 scripts/bench_concurrency.py --backend sqlite
+    python3 scripts/bench_concurrency.py --unlocked    # shows what the lock prevents
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import task_manager
+
+
+def use_workspace(root: str, unlocked: bool = False) -> None:
+    """Point task_manager at a scratch workspace (pool initializer, also used by the parent)."""
+    base = Path(root)
+    task_manager.DATA_DIR = base / "data"
+    task_manager.DATA_FILE = task_manager.DATA_DIR / "tasks.json"
+    task_manager.MEMORY_DIR = base / "memory"
+    task_manager.SESSION_STATE_FILE = base / "SESSION-STATE.md"
+    task_manager.WORKING_BUFFER_FILE = task_manager.MEMORY_DIR / "working-buffer.md"
+    # Forked workers must not share the parent's store, log or lock handles.
+    task_manager._store = task_manager._wal = task_manager._lock = None
+    if unlocked:
+        task_manager.store_lock = contextlib.nullcontext
+
+
+def command(argv: List[str]) -> dict:
+    code, out, err = task_manager.capture(argv)
+    if code:
+        raise RuntimeError(f"{' '.join(argv)} failed ({code}): {err.strip()}")
+    return json.loads(out)
+
+
+def log_minute(task_id: str) -> Tuple[int, bool]:
+    """Log one minute; returns (worker pid, whether the command failed)."""
+    try:
+        command(["log-time", task_id, "1"])
+    except Exception:
+        # Only expected without the lock (e.g. two writers racing on one temp file).
+        return os.getpid(), True
+    return os.getpid(), False
+
+
+def wal_entries(memory_dir: Path) -> List[dict]:
+    entries = []
+    for path in sorted(memory_dir.glob("WAL-*.log")):
+        with open(path) as f:
+            entries.extend(json.loads(line) for line in f)
+    return entries
+
+
+def run_benchmark(updates: int, workers: int, backend: str, unlocked: bool) -> dict:
+    os.environ["PROACTIVE_TASKS_BACKEND"] = backend
+    with tempfile.TemporaryDirectory() as root:
+        for sub in ("data", "memory"):
+            (Path(root) / sub).mkdir()
+        use_workspace(root)
+        command(["add-goal", "Concurrency"])
+        task_id = command(["add-task", "Concurrency", "Shared counter"])["task"]["id"]
+        task_manager.reset_store()
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_workspace, initargs=(root, unlocked)) as pool:
+            outcomes = list(pool.map(log_minute, [task_id] * updates, chunksize=1))
+        elapsed = time.perf_counter() - start
+
+        use_workspace(root)
+        task = command(["list-tasks", "Concurrency"])["tasks"][0]
+        task_manager.reset_store()
+        entries = wal_entries(Path(root) / "memory")
+
+    actual = task.get("actual_minutes", 0)
+    time_logs = sum(1 for entry in entries if entry.get("event_type") == "TIME_LOG")
+    seqs_ok = [entry["seq"] for entry in entries] == list(range(1, len(entries) + 1))
+    return {
+        "backend": backend,
+        "locked": not unlocked,
+        "updates": updates,
+        "workers": workers,
+        "worker_processes": len({pid for pid, _ in outcomes}),
+        "failed_commands": sum(1 for _, failed in outcomes if failed),
+        "elapsed_s": round(elapsed, 2),
+        "updates_per_s": round(updates / elapsed, 1),
+        "actual_minutes": actual,
+        "lost_updates": updates - actual,
+        "wal_time_logs": time_logs,
+        "wal_seq_unique_and_contiguous": seqs_ok,
+        "ok": actual == updates and time_logs == updates and seqs_ok,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent log-time stress test for the task store")
+    parser.add_argument("--updates", type=int, default=1000, help="Number of concurrent log-time updates")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Process pool size")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--unlocked", action="store_true", help="Disable the store lock to show lost updates")
+    args = parser.parse_args(argv)
+
+    # Silence the per-command JSON the workers would print.
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_benchmark(args.updates, args.workers, args.backend, args.unlocked)
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
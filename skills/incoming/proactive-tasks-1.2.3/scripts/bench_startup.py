@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: how long read-only CLI commands spend importing modules.
+
+Copies the scripts into a scratch workspace with a small store, then runs each
+command in a fresh interpreter under `python -X importtime` (daemon bypassed,
+bytecode caching on, one warm-up run). Reported per command, as medians:
+
+    import_ms   import time above a bare `python -c pass` (the skill's own cost)
+    wall_ms     wall-clock time of the whole process
+
+and the deferred modules (DEFERRED_MODULES) each command still loaded. Exits 1
+if a command's import_ms exceeds --budget-ms or it loads a deferred module,
+so it can guard against a top-level import creeping back in.
+
+    python3 scripts/bench_startup.py
+    python3 scripts/bench_startup.py --runs 20 --budget-ms 40
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+DEFAULT_COMMANDS = ["status", "next-task", "list-goals", "list-tasks Startup", "--help"]
+DEFAULT_BUDGET_MS = 45.0
+# Imported only by the commands that need them; none of the read-only ones do.
+DEFERRED_MODULES = {
+    "sqlite3", "gzip", "shutil", "socket", "signal", "uuid", "random", "hashlib", "traceback",
+}
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ, PROACTIVE_TASKS_DIRECT="1")
+    # Without cached bytecode every run would measure compilation, not imports.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def timed_run(argv: List[str], cwd: Path) -> Tuple[float, float, Set[str]]:
+    """Run `python -X importtime argv`; returns (total import ms, wall ms, modules)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        cwd=cwd, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode:
+        raise RuntimeError(f"{' '.join(argv)} failed ({proc.returncode})")
+    # "import time: self [us] | cumulative | imported package"
+    import_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                import_us += int(self_us)
+                modules.add(name.strip())
+    return import_us / 1000, wall_ms, modules
+
+
+def median_run(argv: List[str], cwd: Path, runs: int) -> Tuple[float, float, Set[str]]:
+    _, _, modules = timed_run(argv, cwd)  # warm-up: writes __pycache__
+    samples = [timed_run(argv, cwd) for _ in range(runs)]
+    return statistics.median(s[0] for s in samples), statistics.median(s[1] for s in samples), modules
+
+
+def seed_workspace(root: Path) -> Path:
+    """A skill directory two levels under root, as in a real workspace."""
+    skill = root / "skills" / "proactive-tasks"
+    shutil.copytree(SCRIPTS_DIR, skill / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    manager = ["scripts/task_manager.py"]
+    env = _env()
+    subprocess.run([sys.executable] + manager + ["add-goal", "Startup"], cwd=skill, env=env, check=True, stdout=subprocess.DEVNULL)
+    for i in range(20):
+        subprocess.run([sys.executable] + manager + ["add-task", "Startup", f"Task {i}"], cwd=skill, env=env, check=True, stdout=subprocess.DEVNULL)
+    return skill
+
+
+def run_benchmark(commands: List[str], runs: int, budget_ms: float) -> Dict:
+    with tempfile.TemporaryDirectory() as root:
+        skill = seed_workspace(Path(root))
+        baseline_ms, baseline_wall, _ = median_run(["-c", "pass"], skill, runs)
+        results = {}
+        for cmd in commands:
+            import_ms, wall_ms, modules = median_run(["scripts/task_manager.py"] + cmd.split(), skill, runs)
+            results[cmd] = {
+                "import_ms": round(import_ms - baseline_ms, 1),
+                "wall_ms": round(wall_ms, 1),
+                "deferred_loaded": sorted(modules & DEFERRED_MODULES),
+            }
+    over = [cmd for cmd, r in results.items() if r["import_ms"] > budget_ms or r["deferred_loaded"]]
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "budget_ms": budget_ms,
+        "baseline": {"import_ms": round(baseline_ms, 1), "wall_ms": round(baseline_wall, 1)},
+        "commands": results,
+        "over_budget": over,
+        "ok": not over,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for read-only task_manager commands")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per command (median reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum import ms per command above bare Python")
+    parser.add_argument("--commands", nargs="+", default=DEFAULT_COMMANDS, help="Commands to time (quote ones with arguments)")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.commands, args.runs, args.budget_ms)
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Declarative rules for `health-check`.
+
+Each per-task rule names the task fields it reads and a test over those
+fields as columns: the scanner extracts every needed column once per chunk
+of tasks (missing and null values replaced by the field's default), and a
+test is one pass over its columns returning the positions that break the
+rule. "Now" is taken once per check and passed in as an ISO string.
+
+A rule also renders its issue line and, unless it only flags, the field
+updates that fix the task plus a line describing the fix. Findings come out
+in task order, then rule order, so the report reads task by task.
+
+Large stores are scanned in chunks by forked worker processes, which inherit
+the task list and get only chunk bounds; where fork is unavailable the scan
+runs in this process.
+
+    python3 scripts/health_rules.py --bench 1000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Column value for a task without the field (or with null).
+COLUMN_DEFAULTS: Dict[str, Any] = {
+    "progress": 100,
+    "completed_at": "",
+    "actual_minutes": 0,
+    "estimate_minutes": 1,
+}
+
+# Store-level rule, checked by the store's dependency graph instead of columns.
+CYCLE_RULE = "dependency-cycle"
+
+CHUNK_SIZE = 50_000
+# A serial scan costs about 1.5 microseconds per task, so smaller stores
+# finish in this process in well under the time it takes to start workers.
+PARALLEL_MIN_TASKS = 200_000
+
+Columns = Dict[str, List[Any]]
+
+
+class Rule:
+    """A per-task health rule."""
+
+    def __init__(
+        self,
+        name: str,
+        fields: Sequence[str],
+        test: Callable[[Columns, str], List[int]],
+        issue: Callable[[Dict, str], str],
+        fix: Optional[Callable[[Dict, str], Dict]] = None,
+        fixed: Optional[Callable[[Dict], str]] = None,
+    ):
+        self.name = name
+        self.fields = tuple(fields)
+        self.test = test
+        self.issue = issue
+        self.fix = fix
+        self.fixed = fixed
+
+
+def _orphaned_recurring(cols: Columns, now: str) -> List[int]:
+    return [i for i, (recurring, goal_id) in enumerate(zip(cols["recurring"], cols["goal_id"])) if recurring and not goal_id]
+
+
+def _impossible_progress(cols: Columns, now: str) -> List[int]:
+    return [i for i, (status, progress) in enumerate(zip(cols["status"], cols["progress"])) if status == "completed" and progress < 100]
+
+
+def _missing_completed_at(cols: Columns, now: str) -> List[int]:
+    return [i for i, (status, completed_at) in enumerate(zip(cols["status"], cols["completed_at"])) if status == "completed" and not completed_at]
+
+
+def _time_anomaly(cols: Columns, now: str) -> List[int]:
+    return [i for i, (actual, estimate) in enumerate(zip(cols["actual_minutes"], cols["estimate_minutes"])) if actual > estimate * 10]
+
+
+def _future_date(cols: Columns, now: str) -> List[int]:
+    # ISO strings in UTC compare chronologically.
+    return [i for i, (status, completed_at) in enumerate(zip(cols["status"], cols["completed_at"])) if status == "completed" and completed_at > now]
+
+
+def _anomaly_issue(task: Dict, now: str) -> str:
+    actual = task.get("actual_minutes")
+    estimate = task.get("estimate_minutes")
+    # Same defaults as the columns; a zero estimate is infinitely exceeded.
+    divisor = COLUMN_DEFAULTS["estimate_minutes"] if estimate is None else estimate
+    ratio = (actual or 0) / divisor if divisor else float("inf")
+    return f"Time anomaly: {task['id']} actual={actual}m vs estimate={estimate}m ({ratio:.1f}x)"
+
+
+# In report order. Issue and fix lines match the pre-rule-engine health-check.
+RULES = (
+    Rule(
+        "orphaned-recurring", ("recurring", "goal_id"), _orphaned_recurring,
+        issue=lambda task, now: f"Orphaned recurring task: {task['id']}",
+        fix=lambda task, now: {"recurring": None},
+        fixed=lambda task: f"Removed recurring flag from {task['id']}",
+    ),
+    Rule(
+        "impossible-progress", ("status", "progress"), _impossible_progress,
+        issue=lambda task, now: f"Impossible state: {task['id']} completed but progress={task.get('progress')}%",
+        fix=lambda task, now: {"progress": 100},
+        fixed=lambda task: f"Set progress=100% for completed task {task['id']}",
+    ),
+    Rule(
+        "missing-completed-at", ("status", "completed_at"), _missing_completed_at,
+        issue=lambda task, now: f"Inconsistent completion: {task['id']} status=completed but no completed_at",
+        fix=lambda task, now: {"completed_at": now + "Z"},
+        fixed=lambda task: f"Added completed_at timestamp to {task['id']}",
+    ),
+    # Flagged for review, never fixed.
+    Rule("time-anomaly", ("actual_minutes", "estimate_minutes"), _time_anomaly, issue=_anomaly_issue),
+    Rule(
+        "future-date", ("status", "completed_at"), _future_date,
+        issue=lambda task, now: f"Bad date: {task['id']} completed_at={task.get('completed_at')} is in future",
+        fix=lambda task, now: {"completed_at": now + "Z"},
+        fixed=lambda task: f"Reset completed_at for {task['id']}",
+    ),
+)
+
+RULE_NAMES = tuple(rule.name for rule in RULES) + (CYCLE_RULE,)
+
+
+def select_rules(spec: Optional[str]) -> List[str]:
+    """Rule names from a comma-separated --rules value (all rules if None)."""
+    if spec is None:
+        return list(RULE_NAMES)
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    unknown = [name for name in names if name not in RULE_NAMES]
+    if unknown or not names:
+        listed = ", ".join(unknown) if unknown else repr(spec)
+        raise ValueError(f"Unknown rule(s): {listed}; choose from {', '.join(RULE_NAMES)}")
+    return [name for name in RULE_NAMES if name in names]
+
+
+def columns(tasks: Sequence[Dict], fields: Sequence[str]) -> Columns:
+    """One list per field, with COLUMN_DEFAULTS filled in."""
+    cols = {}
+    for field in fields:
+        values = [task.get(field) for task in tasks]
+        default = COLUMN_DEFAULTS.get(field)
+        if default is not None:
+            values = [default if value is None else value for value in values]
+        cols[field] = values
+    return cols
+
+
+def _scan_range(tasks: Sequence[Dict], rules: Sequence[Rule], now: str, start: int, stop: int) -> List[Tuple[int, int]]:
+    """(task position, rule position) for each finding among tasks[start:stop]."""
+    cols = columns(tasks[start:stop], {field for rule in rules for field in rule.fields})
+    hits = []
+    for r, rule in enumerate(rules):
+        hits.extend((start + i, r) for i in rule.test(cols, now))
+    return hits
+
+
+# What forked workers scan; set only while a pool is running.
+_shared: Optional[Tuple[Sequence[Dict], Sequence[Rule], str]] = None
+
+
+def _scan_shared(bounds: Tuple[int, int]) -> List[Tuple[int, int]]:
+    tasks, rules, now = _shared
+    return _scan_range(tasks, rules, now, *bounds)
+
+
+def scan(
+    tasks: Sequence[Dict],
+    rules: Sequence[Rule],
+    now: str,
+    jobs: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Tuple[int, Rule]]:
+    """Findings as (task position, rule), in task order then rule order.
+
+    jobs: worker processes; 0 picks one per CPU for stores of at least
+    PARALLEL_MIN_TASKS tasks and scans smaller ones in this process.
+    """
+    global _shared
+    if jobs <= 0:
+        jobs = (os.cpu_count() or 1) if len(tasks) >= PARALLEL_MIN_TASKS else 1
+    bounds = [(start, min(start + chunk_size, len(tasks))) for start in range(0, len(tasks), chunk_size)]
+
+    hits: List[Tuple[int, int]] = []
+    if jobs > 1 and len(bounds) > 1 and _can_fork():
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        _shared = (tasks, rules, now)
+        try:
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=min(jobs, len(bounds)), mp_context=context) as pool:
+                for chunk_hits in pool.map(_scan_shared, bounds):
+                    hits.extend(chunk_hits)
+        finally:
+            _shared = None
+    else:
+        for start, stop in bounds:
+            hits.extend(_scan_range(tasks, rules, now, start, stop))
+    hits.sort()
+    return [(pos, rules[r]) for pos, r in hits]
+
+
+def _can_fork() -> bool:
+    import multiprocessing
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _bench_tasks(count: int) -> List[Dict]:
+    """Synthetic tasks with a sprinkling of every per-task problem."""
+    from task_index import synthetic_data
+    tasks = synthetic_data(count)["tasks"]
+    for n, task in enumerate(tasks):
+        if task["status"] == "completed":
+            task["completed_at"] = "2026-02-01T03:00:00+00:00Z"
+            if n % 997 == 0:
+                del task["completed_at"]
+            elif n % 991 == 0:
+                task["completed_at"] = "2099-01-01T00:00:00+00:00Z"
+            elif n % 983 == 0:
+                task["progress"] = 40
+        if n % 977 == 0:
+            task["recurring"] = "daily"
+            task["goal_id"] = None
+        task["estimate_minutes"] = 30
+        task["actual_minutes"] = 400 if n % 971 == 0 else 25
+    return tasks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from datetime import datetime, timezone
+
+    parser = argparse.ArgumentParser(description="Benchmark the health-check rule scan on synthetic tasks")
+    parser.add_argument("--bench", type=int, default=1_000_000, metavar="N", help="Number of synthetic tasks")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to time")
+    args = parser.parse_args(argv)
+
+    tasks = _bench_tasks(args.bench)
+    now = datetime.now(timezone.utc).isoformat()
+    timings = {}
+    found = None
+    for jobs in args.jobs:
+        start = time.perf_counter()
+        findings = scan(tasks, RULES, now, jobs=jobs)
+        timings[str(jobs)] = round((time.perf_counter() - start) * 1000, 1)
+        by_rule: Dict[str, int] = {}
+        for _, rule in findings:
+            by_rule[rule.name] = by_rule.get(rule.name, 0) + 1
+        if found is not None and by_rule != found:
+            print(json.dumps({"success": False, "error": f"jobs={jobs} found {by_rule}, expected {found}"}), file=sys.stderr)
+            return 1
+        found = by_rule
+
+    print(json.dumps({"tasks": args.bench, "scan_ms_by_jobs": timings, "findings": found}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
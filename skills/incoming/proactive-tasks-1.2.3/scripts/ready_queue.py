@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware ready queue for `next-task`.
+
+A task is ready when it is pending and every task it depends on is completed.
+ReadyQueue keeps, per task, the number of unmet dependencies and a reverse
+dependency map, and holds ready tasks in a heap keyed on
+(priority rank, created_at, creation order). Status changes update only the
+counters of the changed task's dependents, so polling for the next task is
+O(log n) instead of a scan over every pending task.
+
+Heap entries are invalidated lazily: an entry whose task is no longer ready,
+or whose priority changed, is dropped when it reaches the top.
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}
+OTHER_RANK = len(PRIORITY_RANK)
+
+Entry = Tuple[int, str, int, str]
+
+
+def priority_rank(priority: Optional[str]) -> int:
+    return PRIORITY_RANK.get(priority, OTHER_RANK)
+
+
+def find_cycles(edges: Dict[str, List[str]]) -> List[List[str]]:
+    """Dependency cycles in a task -> depends_on graph, one list of task ids per cycle."""
+    WHITE, GREY, BLACK = 0, 1, 2
+    color: Dict[str, int] = {}
+    cycles: List[List[str]] = []
+    for root in edges:
+        if color.get(root, WHITE) != WHITE:
+            continue
+        path: List[str] = []
+        stack: List[Tuple[str, Iterator[str]]] = [(root, iter(edges.get(root, ())))]
+        color[root] = GREY
+        path.append(root)
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                path.pop()
+                color[node] = BLACK
+                continue
+            state = color.get(child, WHITE)
+            if state == GREY:
+                cycles.append(path[path.index(child):])
+            elif state == WHITE and child in edges:
+                color[child] = GREY
+                path.append(child)
+                stack.append((child, iter(edges[child])))
+    return cycles
+
+
+class ReadyQueue:
+    """Ready tasks in a lazily-invalidated heap plus per-task unmet-dependency counters."""
+
+    def __init__(self, tasks: Iterable[Dict] = ()) -> None:
+        self.tasks: Dict[str, Dict] = {}
+        self.status: Dict[str, Optional[str]] = {}
+        self.order: Dict[str, int] = {}
+        self.unmet: Dict[str, int] = {}
+        self.deps: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        self.heap: List[Entry] = []
+        self.queued: Dict[str, Entry] = {}
+
+        tasks = list(tasks)
+        for task in tasks:
+            self.tasks[task["id"]] = task
+            self.status[task["id"]] = task.get("status")
+            self.order[task["id"]] = len(self.order)
+        for task in tasks:
+            self._link(task, push=False)
+        heapq.heapify(self.heap)
+
+    def _key(self, task: Dict) -> Entry:
+        return (priority_rank(task.get("priority")), task.get("created_at") or "", self.order[task["id"]], task["id"])
+
+    def _link(self, task: Dict, push: bool = True) -> None:
+        task_id = task["id"]
+        deps = list(task.get("depends_on") or [])
+        self.deps[task_id] = deps
+        for dep_id in deps:
+            self.dependents.setdefault(dep_id, []).append(task_id)
+        self.unmet[task_id] = sum(1 for dep_id in deps if self.status.get(dep_id) != "completed")
+        self._enqueue(task_id, push)
+
+    def _enqueue(self, task_id: str, push: bool = True) -> None:
+        if self.status.get(task_id) != "pending" or self.unmet.get(task_id):
+            return
+        entry = self._key(self.tasks[task_id])
+        if self.queued.get(task_id) == entry:
+            return
+        self.queued[task_id] = entry
+        if push:
+            heapq.heappush(self.heap, entry)
+        else:
+            self.heap.append(entry)
+
+    def _valid(self, entry: Entry) -> bool:
+        task_id = entry[3]
+        task = self.tasks.get(task_id)
+        return (
+            task is not None
+            and self.queued.get(task_id) == entry
+            and task.get("status") == "pending"
+            and not self.unmet.get(task_id)
+            and self._key(task) == entry
+        )
+
+    def _drop(self, entry: Entry) -> None:
+        if self.queued.get(entry[3]) == entry:
+            del self.queued[entry[3]]
+
+    def put(self, task: Dict) -> None:
+        """Register a new task or apply a changed one (status, priority, dependencies)."""
+        task_id = task["id"]
+        if task_id not in self.tasks:
+            # Tasks that already named this id as a dependency counted it unmet.
+            waiting = list(self.dependents.get(task_id, ()))
+            self.tasks[task_id] = task
+            self.status[task_id] = task.get("status")
+            self.order[task_id] = len(self.order)
+            self._link(task)
+            if task.get("status") == "completed":
+                for dependent in waiting:
+                    self.unmet[dependent] -= 1
+                    self._enqueue(dependent)
+            return
+
+        self.tasks[task_id] = task
+        old_status, new_status = self.status[task_id], task.get("status")
+        self.status[task_id] = new_status
+        relinked = (task.get("depends_on") or []) != self.deps[task_id]
+        if relinked:
+            for dep_id in self.deps[task_id]:
+                self.dependents[dep_id].remove(task_id)
+            self._link(task)
+        if (old_status == "completed") != (new_status == "completed"):
+            # A relinked task already counted itself at its new status.
+            delta = -1 if new_status == "completed" else 1
+            for dependent in self.dependents.get(task_id, ()):
+                if relinked and dependent == task_id:
+                    continue
+                self.unmet[dependent] += delta
+                if delta < 0:
+                    self._enqueue(dependent)
+        self._enqueue(task_id)
+
+    def peek(self, goal_id: Optional[str] = None, max_estimate: Optional[int] = None) -> Optional[Dict]:
+        """Highest-priority ready task, optionally restricted to a goal and estimate."""
+        while self.heap and not self._valid(self.heap[0]):
+            self._drop(heapq.heappop(self.heap))
+        if not self.heap:
+            return None
+        if goal_id is None and not max_estimate:
+            return self.tasks[self.heap[0][3]]
+
+        # Filtered: best-first walk over the heap array without popping.
+        frontier = [(self.heap[0], 0)]
+        while frontier:
+            entry, i = heapq.heappop(frontier)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child], child))
+            if not self._valid(entry):
+                continue
+            task = self.tasks[entry[3]]
+            if goal_id is not None and task.get("goal_id") != goal_id:
+                continue
+            if max_estimate and not ("estimate_minutes" in task and task["estimate_minutes"] <= max_estimate):
+                continue
+            return task
+        return None
+
+    def cycles(self) -> List[List[str]]:
+        return find_cycles({task_id: task.get("depends_on") or [] for task_id, task in self.tasks.items()})
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from task_index import synthetic_data
+
+    parser = argparse.ArgumentParser(description="Benchmark the ready queue on synthetic data")
+    parser.add_argument("--bench", type=int, default=100_000, metavar="N", help="Number of synthetic tasks")
+    parser.add_argument("--polls", type=int, default=1_000, help="next-task polls, each followed by a completion")
+    args = parser.parse_args(argv)
+
+    tasks = synthetic_data(args.bench)["tasks"]
+    start = time.perf_counter()
+    queue = ReadyQueue(tasks)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    polls = 0
+    for _ in range(args.polls):
+        task = queue.peek()
+        if task is None:
+            break
+        task["status"] = "completed"
+        queue.put(task)
+        polls += 1
+    poll_us = (time.perf_counter() - start) * 1e6 / max(polls, 1)
+
+    print(json.dumps({
+        "tasks": args.bench,
+        "build_ms": round(build_ms, 1),
+        "polls": polls,
+        "poll_and_complete_us": round(poll_us, 2),
+        "cycles": len(queue.cycles()),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Writers for the agent-facing memory files: SESSION-STATE.md and working-buffer.md.
+
+DebouncedFile renders SESSION-STATE.md:
+
+- Change detection: the rendered text is hashed without its volatile line
+  ("Last updated: ..."); an identical render is not written at all.
+- Coalescing: at most one write per window. An update inside the window is
+  held and only the latest one is written when the window ends (flush_due),
+  or when the process finishes its command (flush).
+- Atomic replace (task_wal.atomic_write): agents reading the file at the same
+  moment see the old or the new version, never a partial one.
+
+AppendFile keeps working-buffer.md open for appends across commands (the
+daemon), reopening it if the file was removed or replaced in the meantime.
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional, TextIO, Tuple
+
+from task_wal import atomic_write
+
+COALESCE_SECONDS = 2.0
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class DebouncedFile:
+    """A rendered file written only on change, at most once per window, atomically."""
+
+    def __init__(self, path: Path, volatile_prefix: str = "", window: float = COALESCE_SECONDS):
+        self.path = path
+        self.volatile_prefix = volatile_prefix
+        self.window = window
+        self.pending: Optional[str] = None
+        self.writes = 0
+        self._last_write = float("-inf")
+        # Digest and file stamp of what this writer last saw on disk.
+        self._digest: Optional[str] = None
+        self._stamp: Optional[Tuple[int, int, int]] = None
+
+    def _digest_of(self, content: str) -> str:
+        lines = content.splitlines(True)
+        if self.volatile_prefix:
+            lines = [line for line in lines if not line.startswith(self.volatile_prefix)]
+        return hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+
+    def _on_disk(self) -> Optional[str]:
+        """Digest of the file as it is now, re-read only if someone else changed it."""
+        stamp = _stamp(self.path)
+        if stamp != self._stamp:
+            self._stamp = stamp
+            try:
+                self._digest = self._digest_of(self.path.read_text())
+            except FileNotFoundError:
+                self._digest = None
+        return self._digest
+
+    def submit(self, content: str) -> None:
+        """Queue a render; written now unless a write happened within the window."""
+        self.pending = content
+        if self.due() == 0:
+            self.flush()
+
+    def due(self) -> Optional[float]:
+        """Seconds until the held render should be written (None if nothing is held)."""
+        if self.pending is None:
+            return None
+        return max(0.0, self._last_write + self.window - time.monotonic())
+
+    def flush(self) -> bool:
+        """Write the held render if it differs from the file; True if written."""
+        content, self.pending = self.pending, None
+        if content is None:
+            return False
+        digest = self._digest_of(content)
+        if digest == self._on_disk():
+            return False
+        atomic_write(self.path, content)
+        self._digest, self._stamp = digest, _stamp(self.path)
+        self._last_write = time.monotonic()
+        self.writes += 1
+        return True
+
+    def flush_due(self) -> Optional[float]:
+        """Write the held render if its window has passed; returns due() afterwards."""
+        if self.due() == 0:
+            self.flush()
+        return self.due()
+
+
+class AppendFile:
+    """An append-only text file kept open between writes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[TextIO] = None
+
+    def write(self, text: str) -> None:
+        if self._file is not None:
+            stamp = _stamp(self.path)
+            if stamp is None or stamp[0] != os.fstat(self._file.fileno()).st_ino:
+                # Removed or replaced since it was opened (e.g. by an agent).
+                self.close()
+        if self._file is None:
+            self._file = open(self.path, 'a')
+        self._file.write(text)
+        # Flushed per write: agents read this file while the daemon runs.
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
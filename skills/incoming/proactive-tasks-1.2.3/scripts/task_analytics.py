@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Time-tracking analytics over the write-ahead log.
+
+`analytics` streams every daily log in memory/ (WAL-YYYY-MM-DD.log, and
+.log.gz once compacted) through a generator pipeline:
+
+    log files -> lines -> time-tracking entries -> one partial per day
+
+A day's partial holds what that day's log recorded, by task: minutes from
+TIME_LOG, net progress points from PROGRESS_CHANGE and tasks completed
+(STATUS_CHANGE to completed). Redo records (PUT_GOAL, PUT_TASK,
+DELETE_TASK) are most of a log's bytes; lines are matched against the
+wanted event types before any JSON is parsed, so they are never decoded.
+Entries are counted once per sequence number, so a day left as both .log
+and .log.gz by an interrupted compaction is not counted twice.
+
+Partials of closed days (before today, UTC) are cached in
+memory/analytics-cache.json with the names and sizes of the files they were
+read from. A run re-reads only today's log and any day whose files changed
+(compacted, or appended to late). The partials are then merged and joined
+with the tasks (estimates, goals) into the report built by summarize().
+
+    python3 scripts/task_analytics.py --bench 365
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from task_wal import COMPACTED_SUFFIX, WAL_PREFIX, WAL_SUFFIX, atomic_write
+
+CACHE_FILE_NAME = "analytics-cache.json"
+CACHE_VERSION = 1
+
+TIME_LOG = "TIME_LOG"
+PROGRESS_CHANGE = "PROGRESS_CHANGE"
+STATUS_CHANGE = "STATUS_CHANGE"
+EVENT_TYPES = (TIME_LOG, PROGRESS_CHANGE, STATUS_CHANGE)
+# How the event types appear in a log line (json.dumps default separators).
+_MARKERS = tuple(f'"event_type": "{event_type}"'.encode() for event_type in EVENT_TYPES)
+
+# actual/estimate within 1 +/- this counts as an accurate estimate.
+ACCURACY_TOLERANCE = 0.25
+
+Partial = Dict[str, Dict]
+
+
+def log_days(wal_dir: Path) -> Dict[str, List[Path]]:
+    """Log files by day (YYYY-MM-DD), plain and compacted."""
+    days: Dict[str, List[Path]] = {}
+    for path in sorted(wal_dir.glob(f"{WAL_PREFIX}*{WAL_SUFFIX}*")):
+        name = path.name[len(WAL_PREFIX):]
+        for suffix in (WAL_SUFFIX, WAL_SUFFIX + COMPACTED_SUFFIX):
+            if name.endswith(suffix):
+                days.setdefault(name[:-len(suffix)], []).append(path)
+                break
+    return days
+
+
+def read_lines(paths: Iterable[Path]) -> Iterator[bytes]:
+    """Raw lines of each log in turn, decompressing compacted ones."""
+    for path in paths:
+        if path.name.endswith(COMPACTED_SUFFIX):
+            import gzip
+            try:
+                with gzip.open(path, 'rb') as f:
+                    yield from f
+            except FileNotFoundError:
+                raise
+            except (EOFError, OSError) as exc:
+                # Compaction replaces files atomically, so this is damage from outside.
+                raise ValueError(f"corrupt WAL log {path}: {exc}") from None
+        else:
+            with open(path, 'rb') as f:
+                yield from f
+
+
+def time_entries(lines: Iterable[bytes]) -> Iterator[Dict]:
+    """TIME_LOG, PROGRESS_CHANGE and STATUS_CHANGE entries; torn lines are skipped."""
+    for raw in lines:
+        if not any(marker in raw for marker in _MARKERS):
+            continue
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            continue
+        if (isinstance(entry, dict) and entry.get("event_type") in EVENT_TYPES
+                and isinstance(entry.get("content"), dict) and entry["content"].get("task_id")):
+            yield entry
+
+
+def day_partial(entries: Iterable[Dict]) -> Partial:
+    """Per-task minutes, progress points and completions from one day's entries."""
+    minutes: Dict[str, int] = {}
+    progress: Dict[str, int] = {}
+    completed = set()
+    seen = set()
+    for entry in entries:
+        seq = entry.get("seq")
+        if seq is not None:
+            if seq in seen:
+                continue
+            seen.add(seq)
+        content = entry["content"]
+        task_id = content["task_id"]
+        if entry["event_type"] == TIME_LOG:
+            minutes[task_id] = minutes.get(task_id, 0) + (content.get("minutes_logged") or 0)
+        elif entry["event_type"] == PROGRESS_CHANGE:
+            delta = (content.get("new_progress") or 0) - (content.get("old_progress") or 0)
+            progress[task_id] = progress.get(task_id, 0) + delta
+        elif content.get("new_status") == "completed":
+            completed.add(task_id)
+    return {"minutes": minutes, "progress": progress, "completed": sorted(completed)}
+
+
+def _load_cache(path: Path) -> Dict[str, Dict]:
+    try:
+        with open(path) as f:
+            doc = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(doc, dict) or doc.get("version") != CACHE_VERSION:
+        return {}
+    return doc.get("days") or {}
+
+
+def load_partials(
+    wal_dir: Path,
+    cache_path: Path,
+    today: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    rebuild: bool = False,
+) -> Tuple[Dict[str, Partial], Dict[str, int]]:
+    """Partials for the days in [since, until], from the cache where it is current.
+
+    Returns the partials by day and counts of days taken from the cache and read.
+    Run under the store lock: logs are only compacted by commits, so none is
+    renamed while it is read.
+    """
+    cached = {} if rebuild else _load_cache(cache_path)
+    kept: Dict[str, Dict] = {}
+    partials: Dict[str, Partial] = {}
+    counts = {"days_cached": 0, "days_read": 0}
+    for day, paths in sorted(log_days(wal_dir).items()):
+        sources = {path.name: path.stat().st_size for path in paths}
+        hit = cached.get(day)
+        if hit is not None and hit.get("sources") == sources:
+            kept[day] = hit
+            if (since is None or day >= since) and (until is None or day <= until):
+                partials[day] = hit["partial"]
+                counts["days_cached"] += 1
+            continue
+        if (since is not None and day < since) or (until is not None and day > until):
+            continue
+        partial = day_partial(time_entries(read_lines(paths)))
+        partials[day] = partial
+        counts["days_read"] += 1
+        if day < today:
+            kept[day] = {"sources": sources, "partial": partial}
+
+    if kept != cached:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(cache_path, json.dumps({"version": CACHE_VERSION, "days": kept}))
+    return partials, counts
+
+
+def task_ids(partials: Dict[str, Partial]) -> List[str]:
+    """Every task the partials mention, for the caller to look up."""
+    ids = set()
+    for partial in partials.values():
+        for by_task in partial.values():
+            ids.update(by_task)
+    return sorted(ids)
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 2) if denominator else None
+
+
+def summarize(
+    partials: Dict[str, Partial],
+    tasks: Dict[str, Dict],
+    goal_title: Callable[[str], Optional[str]],
+) -> Dict:
+    """Estimate accuracy, velocity per goal and throughput per day.
+
+    tasks maps task ids to their records (for estimate_minutes and goal_id);
+    tasks missing from it count towards throughput only.
+    """
+    minutes: Dict[str, int] = {}
+    progress: Dict[str, int] = {}
+    completed = set()
+    throughput = []
+    for day in sorted(partials):
+        partial = partials[day]
+        for task_id, logged in partial["minutes"].items():
+            minutes[task_id] = minutes.get(task_id, 0) + logged
+        for task_id, points in partial["progress"].items():
+            progress[task_id] = progress.get(task_id, 0) + points
+        completed.update(partial["completed"])
+        throughput.append({
+            "date": day,
+            "minutes_logged": sum(partial["minutes"].values()),
+            "progress_points": sum(partial["progress"].values()),
+            "tasks_completed": len(partial["completed"]),
+            "tasks_touched": len(set(partial["minutes"]) | set(partial["progress"]) | set(partial["completed"])),
+        })
+
+    # Completed tasks with an estimate and time logged in the window.
+    ratios = []
+    estimated = actual = 0
+    unlogged = 0
+    for task_id in sorted(completed):
+        estimate = (tasks.get(task_id) or {}).get("estimate_minutes") or 0
+        if estimate <= 0:
+            continue
+        if not minutes.get(task_id):
+            unlogged += 1
+            continue
+        ratios.append(minutes[task_id] / estimate)
+        estimated += estimate
+        actual += minutes[task_id]
+    accuracy = {
+        "tasks": len(ratios),
+        "median_ratio": round(statistics.median(ratios), 2) if ratios else None,
+        "mean_ratio": round(statistics.mean(ratios), 2) if ratios else None,
+        "total_ratio": _ratio(actual, estimated),
+        "accurate": sum(1 for r in ratios if abs(r - 1) <= ACCURACY_TOLERANCE),
+        "underestimated": sum(1 for r in ratios if r > 1 + ACCURACY_TOLERANCE),
+        "overestimated": sum(1 for r in ratios if r < 1 - ACCURACY_TOLERANCE),
+        "completed_without_time": unlogged,
+    }
+
+    goals: Dict[Optional[str], Dict] = {}
+    for task_id in set(minutes) | set(progress) | completed:
+        goal_id = (tasks.get(task_id) or {}).get("goal_id")
+        goal = goals.setdefault(goal_id, {"minutes_logged": 0, "progress_points": 0, "tasks_completed": 0})
+        goal["minutes_logged"] += minutes.get(task_id, 0)
+        goal["progress_points"] += progress.get(task_id, 0)
+        goal["tasks_completed"] += int(task_id in completed)
+    velocity = []
+    for goal_id, goal in goals.items():
+        velocity.append({
+            "goal_id": goal_id,
+            "title": goal_title(goal_id) if goal_id else None,
+            **goal,
+            "points_per_hour": _ratio(goal["progress_points"] * 60, goal["minutes_logged"]),
+            "tasks_per_hour": _ratio(goal["tasks_completed"] * 60, goal["minutes_logged"]),
+        })
+    velocity.sort(key=lambda goal: (-goal["minutes_logged"], goal["goal_id"] or ""))
+
+    return {
+        "days": len(throughput),
+        "first_day": throughput[0]["date"] if throughput else None,
+        "last_day": throughput[-1]["date"] if throughput else None,
+        "estimate_accuracy": accuracy,
+        "velocity_by_goal": velocity,
+        "throughput_by_day": throughput,
+    }
+
+
+def _write_bench_logs(wal_dir: Path, days: int, events_per_day: int) -> None:
+    """Synthetic daily logs: time and progress events among full PUT_TASK images."""
+    from datetime import date, timedelta
+    seq = 0
+    start = date.today() - timedelta(days=days - 1)
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        lines = []
+        for n in range(events_per_day):
+            task_id = f"task_{(d * 7 + n) % 500:08x}"
+            seq += 1
+            if n % 3 == 0:
+                event = (TIME_LOG, {"task_id": task_id, "minutes_logged": 15 + n % 30})
+            elif n % 3 == 1:
+                event = (PROGRESS_CHANGE, {"task_id": task_id, "old_progress": 20, "new_progress": 40})
+            else:
+                event = (STATUS_CHANGE, {"task_id": task_id, "old_status": "in_progress", "new_status": "completed"})
+            lines.append(json.dumps({"seq": seq, "timestamp": f"{day}T12:00:00+00:00", "event_type": event[0], "content": event[1]}))
+            seq += 1
+            image = {"id": task_id, "goal_id": f"goal_{n % 20:08x}", "title": f"Task {n}", "notes": "x" * 200,
+                     "status": "in_progress", "estimate_minutes": 60, "actual_minutes": n}
+            lines.append(json.dumps({"seq": seq, "timestamp": f"{day}T12:00:00+00:00", "event_type": "PUT_TASK", "content": {"task": image}}))
+        (wal_dir / f"{WAL_PREFIX}{day}{WAL_SUFFIX}").write_text("\n".join(lines) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import tempfile
+    from datetime import date
+
+    parser = argparse.ArgumentParser(description="Benchmark WAL analytics with and without the per-day cache")
+    parser.add_argument("--bench", type=int, default=365, metavar="DAYS", help="Number of synthetic daily logs")
+    parser.add_argument("--events", type=int, default=200, help="Time-tracking events per day (each beside a PUT_TASK record)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        wal_dir = Path(root)
+        cache_path = wal_dir / CACHE_FILE_NAME
+        _write_bench_logs(wal_dir, args.bench, args.events)
+        today = date.today().isoformat()
+        timings = {}
+        reports = []
+        for label in ("cold_ms", "warm_ms"):
+            start = time.perf_counter()
+            partials, counts = load_partials(wal_dir, cache_path, today)
+            report = summarize(partials, {}, lambda goal_id: None)
+            timings[label] = round((time.perf_counter() - start) * 1000, 1)
+            reports.append(report)
+        if reports[0] != reports[1]:
+            print(json.dumps({"success": False, "error": "cached report differs from the uncached one"}), file=sys.stderr)
+            return 1
+
+    print(json.dumps({"days": args.bench, "events_per_day": args.events, **timings, "warm_counts": counts}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
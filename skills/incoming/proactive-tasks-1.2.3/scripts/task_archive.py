@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Cold storage for finished tasks.
+
+`archive --days N` moves completed and cancelled tasks that finished more than
+N days ago out of the task store into compressed, month-partitioned segments:
+
+    data/archive/tasks-2026-02.ndjson.gz     one JSON task per line
+    data/archive/index.json                  per-segment counts by status
+
+A task is only archived once no remaining (hot) task depends on it, so the
+ready queue and unmet-dependency counters never see a dependency vanish.
+
+Segments are rewritten atomically (the existing members are copied and a new
+gzip member appended in a temp file, then renamed), and tasks already in a
+segment are skipped, so re-running after a crash between writing the segment
+and removing the tasks from the store neither loses nor duplicates anything.
+Readers also skip archived copies of tasks that are still in the store.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from task_wal import atomic_write, fsync_dir
+
+# gzip and shutil are imported where used: `status` loads this module only
+# to read index.json.
+
+ARCHIVE_DIR_NAME = "archive"
+SEGMENT_PREFIX = "tasks-"
+SEGMENT_SUFFIX = ".ndjson.gz"
+INDEX_FILE_NAME = "index.json"
+ARCHIVABLE_STATUSES = ("completed", "cancelled")
+
+
+def finished_at(task: Dict) -> Optional[datetime]:
+    """When a task finished: completed_at, else its last update (cancelled tasks)."""
+    stamp = task.get("completed_at") or task.get("updated_at") or task.get("created_at")
+    if not stamp:
+        return None
+    try:
+        # Stored as isoformat() + "Z", i.e. "...+00:00Z"; older files use a bare "Z".
+        parsed = datetime.fromisoformat(stamp[:-1] if stamp.endswith("Z") else stamp)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def select_archivable(tasks: List[Dict], cutoff: datetime) -> List[Dict]:
+    """Finished tasks older than cutoff that no task staying in the store depends on."""
+    candidates: Dict[str, Dict] = {}
+    for task in tasks:
+        if task.get("status") in ARCHIVABLE_STATUSES:
+            finished = finished_at(task)
+            if finished is not None and finished < cutoff:
+                candidates[task["id"]] = task
+
+    # Keeping a candidate for a hot dependent keeps its own dependencies too.
+    needed = [dep_id for task in tasks if task["id"] not in candidates for dep_id in task.get("depends_on") or []]
+    while needed:
+        kept = candidates.pop(needed.pop(), None)
+        if kept is not None:
+            needed.extend(kept.get("depends_on") or [])
+    return list(candidates.values())
+
+
+def _read_segment(path: Path) -> Iterator[Dict]:
+    import gzip
+    try:
+        with gzip.open(path, 'rt') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError:
+        return
+    except (EOFError, OSError) as exc:
+        # Segments are replaced atomically, so this is damage from outside.
+        raise ValueError(f"corrupt archive segment {path}: {exc}") from None
+
+
+class TaskArchive:
+    """Month-partitioned gzip NDJSON segments of finished tasks."""
+
+    def __init__(self, archive_dir: Path):
+        self.dir = archive_dir
+
+    def segments(self) -> List[Path]:
+        return sorted(self.dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def segment_for(self, task: Dict) -> Path:
+        month = finished_at(task).strftime("%Y-%m")
+        return self.dir / f"{SEGMENT_PREFIX}{month}{SEGMENT_SUFFIX}"
+
+    def _load_index(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.dir / INDEX_FILE_NAME) as f:
+                return json.load(f).get("segments", {})
+        except FileNotFoundError:
+            return {}
+
+    def count(self) -> int:
+        """Archived tasks, from the index (no segment is read)."""
+        return sum(sum(by_status.values()) for by_status in self._load_index().values())
+
+    def write(self, tasks: Iterable[Dict]) -> Dict[str, int]:
+        """Append tasks to their month segments; returns tasks written per segment."""
+        by_segment: Dict[Path, List[Dict]] = {}
+        for task in tasks:
+            by_segment.setdefault(self.segment_for(task), []).append(task)
+        if not by_segment:
+            return {}
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        index = self._load_index()
+        written = {}
+        for path in sorted(by_segment):
+            present = {task["id"] for task in _read_segment(path)}
+            fresh = [task for task in by_segment[path] if task["id"] not in present]
+            if fresh:
+                self._append(path, fresh)
+                counts = index.setdefault(path.name, {})
+                for task in fresh:
+                    counts[task["status"]] = counts.get(task["status"], 0) + 1
+            written[path.name] = len(fresh)
+        atomic_write(self.dir / INDEX_FILE_NAME, json.dumps({"segments": index}, indent=2))
+        return written
+
+    def _append(self, path: Path, tasks: List[Dict]) -> None:
+        import gzip
+        import shutil
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as out:
+            if path.exists():
+                # gzip members concatenate; copy the ones already written.
+                with open(path, 'rb') as previous:
+                    shutil.copyfileobj(previous, out)
+            with gzip.GzipFile(fileobj=out, mode='wb') as dst:
+                dst.write("".join(json.dumps(task) + "\n" for task in tasks).encode("utf-8"))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+        fsync_dir(self.dir)
+
+    def iter_tasks(
+        self,
+        goal_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        skip: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[Dict]:
+        """Stream archived tasks matching the filters, oldest segment first.
+
+        skip(task_id) drops tasks that are still in the store (a crash between
+        archiving and removal leaves both copies; the store's is current).
+        """
+        seen: Set[str] = set()
+        for path in self.segments():
+            for task in _read_segment(path):
+                if goal_id is not None and task.get("goal_id") != goal_id:
+                    continue
+                if status is not None and task.get("status") != status:
+                    continue
+                if priority is not None and task.get("priority") != priority:
+                    continue
+                if task["id"] in seen or (skip is not None and skip(task["id"])):
+                    continue
+                seen.add(task["id"])
+                yield task
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+On-disk formats for the JSON store's snapshot (data/tasks.json).
+
+- pretty:   json.dumps(indent=2), the v1.2 format and the default
+- minified: the same JSON without indentation or spaces
+- packed:   a binary record file (below)
+
+decode() detects the format from the content, and the store writes back in
+the format it read, so a store stays in whatever format `convert-storage`
+last chose. The file keeps its name whatever the format: the lock, reload
+checks and `migrate-storage` all key off data/tasks.json.
+
+Packed layout (integers are LEB128 varints, signed ones zigzag-encoded):
+
+    b"PTSK" version(1)
+    string table   count, then length + UTF-8 bytes per string
+    shape table    count, then key count + key string refs per shape
+    counts         goals, tasks
+    records        length + value, for the document head (the top-level
+                   dict, goals and tasks set to null), then each goal, then
+                   each task
+
+Values are tagged: null/false/true, int, float (8-byte double), str,
+string ref, list, dict and time. A dict is its shape (its keys, in order)
+followed by its values; records written by the same command share a shape.
+Status/priority/goal_id values are string refs. Timestamps become a style
+byte recording how the string was written ("+00:00Z" suffix, bare "Z", ...)
+and 8-byte microseconds since the epoch; a string that would not be
+re-rendered byte for byte stays a string, so decode(encode(doc)) == doc
+exactly, key order included.
+
+    python3 scripts/task_codec.py --bench 100000
+"""
+
+import argparse
+import gc
+import json
+import struct
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMATS = ("pretty", "minified", "packed")
+DEFAULT_FORMAT = "pretty"
+
+MAGIC = b"PTSK"
+VERSION = 1
+
+# String values stored once in the table, like keys.
+INTERNED_VALUES = frozenset(("status", "priority", "goal_id"))
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _REF, _LIST, _DICT, _TIME = range(10)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICRO = timedelta(microseconds=1)
+_DOUBLE = struct.Struct("<d")
+_MICROS = struct.Struct("<q")
+
+# (naive, "Z" suffix) by style byte. Style 1 is what the CLI writes:
+# datetime.now(timezone.utc).isoformat() + "Z".
+_TIME_STYLES = ((False, False), (False, True), (True, True), (True, False))
+_TIME_SUFFIXES = ("+00:00", "+00:00Z", "Z", "")
+
+
+def encode(doc: Dict[str, Any], fmt: str) -> bytes:
+    """Serialize a store document ({"goals": [...], "tasks": [...], ...})."""
+    if fmt == "pretty":
+        return json.dumps(doc, indent=2).encode("utf-8")
+    if fmt == "minified":
+        return json.dumps(doc, separators=(",", ":")).encode("utf-8")
+    if fmt == "packed":
+        return _Packer().pack(doc)
+    raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+
+def decode(raw: bytes) -> Tuple[Dict[str, Any], str]:
+    """Parse a snapshot in any format; returns (document, format)."""
+    # The document is a tree of fresh containers: collections triggered by
+    # allocating them would only rescan it (about a third of a large load).
+    paused = gc.isenabled()
+    gc.disable()
+    try:
+        if raw.startswith(MAGIC):
+            return _unpack(raw), "packed"
+        text = raw.decode("utf-8")
+        return json.loads(text), ("pretty" if text.startswith("{\n") else "minified")
+    finally:
+        if paused:
+            gc.enable()
+
+
+@lru_cache(maxsize=4096)
+def _day(days: int) -> str:
+    return (_EPOCH + timedelta(days=days)).date().isoformat() + "T"
+
+
+def _render_time(micros: int, style: int) -> str:
+    """What datetime.isoformat() (+ "Z") gives for this instant, without building a datetime."""
+    days, rest = divmod(micros, 86_400_000_000)
+    seconds, fraction = divmod(rest, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    if fraction:
+        clock = "%02d:%02d:%02d.%06d" % (hour, minute, second, fraction)
+    else:
+        clock = "%02d:%02d:%02d" % (hour, minute, second)
+    return _day(days) + clock + _TIME_SUFFIXES[style]
+
+
+def _parse_time(text: str) -> Optional[Tuple[int, int]]:
+    """(micros since epoch, style) if text is a UTC timestamp this module re-renders exactly."""
+    if not 19 <= len(text) <= 33 or text[10:11] != "T" or text[4:5] != "-":
+        return None
+    z = text.endswith("Z")
+    try:
+        moment = datetime.fromisoformat(text[:-1] if z else text)
+    except ValueError:
+        return None
+    naive = moment.tzinfo is None
+    if naive:
+        moment = moment.replace(tzinfo=timezone.utc)
+    elif moment.utcoffset():
+        return None
+    style = _TIME_STYLES.index((naive, z))
+    micros = (moment - _EPOCH) // _MICRO
+    return (micros, style) if _render_time(micros, style) == text else None
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n: int) -> int:
+    return -(n >> 1) - 1 if n & 1 else n >> 1
+
+
+class _Packer:
+    def __init__(self):
+        self.strings: List[str] = []
+        self.refs: Dict[str, int] = {}
+        self.shapes: Dict[Tuple[str, ...], int] = {}
+
+    def _ref(self, text: str) -> int:
+        ref = self.refs.get(text)
+        if ref is None:
+            ref = self.refs[text] = len(self.strings)
+            self.strings.append(text)
+        return ref
+
+    def _value(self, out: bytearray, value: Any, intern: bool = False) -> None:
+        """Append one tagged value. Strings and ints inside containers, the
+        bulk of a store, are written inline rather than through a call each."""
+        if isinstance(value, dict):
+            keys = tuple(value)
+            shape = self.shapes.get(keys)
+            if shape is None:
+                shape = self.shapes[keys] = len(self.shapes)
+            out.append(_DICT)
+            _write_varint(out, shape)
+            items = value.items()
+        elif isinstance(value, list):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            items = [(None, item) for item in value]
+        else:
+            self._leaf(out, value, intern)
+            return
+        for key, item in items:
+            if item.__class__ is str:
+                if key in INTERNED_VALUES:
+                    ref = self.refs.get(item)
+                    if ref is None:
+                        ref = self._ref(item)
+                    out.append(_REF)
+                    if ref < 0x80:
+                        out.append(ref)
+                    else:
+                        _write_varint(out, ref)
+                    continue
+                parsed = _parse_time(item) if item[10:11] == "T" else None
+                if parsed is not None:
+                    out.append(_TIME)
+                    out.append(parsed[1])
+                    out += _MICROS.pack(parsed[0])
+                    continue
+                data = item.encode("utf-8")
+                out.append(_STR)
+                if len(data) < 0x80:
+                    out.append(len(data))
+                else:
+                    _write_varint(out, len(data))
+                out += data
+            elif item.__class__ is int and 0 <= item < 0x40:
+                out.append(_INT)
+                out.append(item * 2)
+            else:
+                self._value(out, item, key in INTERNED_VALUES)
+
+    def _leaf(self, out: bytearray, value: Any, intern: bool) -> None:
+        if isinstance(value, str):
+            if intern:
+                out.append(_REF)
+                _write_varint(out, self._ref(value))
+                return
+            parsed = _parse_time(value)
+            if parsed is not None:
+                out.append(_TIME)
+                out.append(parsed[1])
+                out += _MICROS.pack(parsed[0])
+                return
+            data = value.encode("utf-8")
+            out.append(_STR)
+            _write_varint(out, len(data))
+            out += data
+        elif value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, _zigzag(value))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        else:
+            raise TypeError(f"cannot pack {type(value).__name__}")
+
+    def _record(self, body: bytearray, value: Any) -> None:
+        record = bytearray()
+        self._value(record, value)
+        _write_varint(body, len(record))
+        body += record
+
+    def pack(self, doc: Dict[str, Any]) -> bytes:
+        goals = doc.get("goals", [])
+        tasks = doc.get("tasks", [])
+        body = bytearray()
+        # goals/tasks stay in the head as null placeholders, keeping the key order.
+        self._record(body, {key: None if key in ("goals", "tasks") else value for key, value in doc.items()})
+        for goal in goals:
+            self._record(body, goal)
+        for task in tasks:
+            self._record(body, task)
+
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        shape_refs = [[self._ref(key) for key in keys] for keys in self.shapes]
+        _write_varint(out, len(self.strings))
+        for text in self.strings:
+            data = text.encode("utf-8")
+            _write_varint(out, len(data))
+            out += data
+        _write_varint(out, len(shape_refs))
+        for refs in shape_refs:
+            _write_varint(out, len(refs))
+            for ref in refs:
+                _write_varint(out, ref)
+        _write_varint(out, len(goals))
+        _write_varint(out, len(tasks))
+        out += body
+        return bytes(out)
+
+
+def _read(buf: bytes, pos: int, strings: List[str], shapes: List[Tuple[str, ...]]) -> Tuple[Any, int]:
+    """Decode the value at pos; returns it and the position after it.
+
+    Mirrors _Packer._value: container members that are strings, times or
+    ints are decoded inline, everything else recurses.
+    """
+    tag = buf[pos]
+    pos += 1
+    if tag == _DICT:
+        shape, pos = _read_varint(buf, pos)
+        keys = shapes[shape]
+        count = len(keys)
+    elif tag == _LIST:
+        count, pos = _read_varint(buf, pos)
+        keys = None
+    elif tag == _REF:
+        n, pos = _read_varint(buf, pos)
+        return strings[n], pos
+    elif tag == _STR:
+        n, pos = _read_varint(buf, pos)
+        return buf[pos:pos + n].decode("utf-8"), pos + n
+    elif tag == _TIME:
+        return _render_time(_MICROS.unpack_from(buf, pos + 1)[0], buf[pos]), pos + 9
+    elif tag == _INT:
+        n, pos = _read_varint(buf, pos)
+        return _unzigzag(n), pos
+    elif tag == _NONE:
+        return None, pos
+    elif tag == _TRUE:
+        return True, pos
+    elif tag == _FALSE:
+        return False, pos
+    elif tag == _FLOAT:
+        return _DOUBLE.unpack_from(buf, pos)[0], pos + 8
+    else:
+        raise ValueError(f"corrupt packed store: unknown tag {tag} at byte {pos - 1}")
+
+    items = []
+    append = items.append
+    for _ in range(count):
+        tag = buf[pos]
+        if tag == _REF:
+            n = buf[pos + 1]
+            pos += 2
+            if n & 0x80:
+                n, pos = _read_varint(buf, pos - 1)
+            append(strings[n])
+        elif tag == _STR:
+            n = buf[pos + 1]
+            pos += 2
+            if n & 0x80:
+                n, pos = _read_varint(buf, pos - 1)
+            append(buf[pos:pos + n].decode("utf-8"))
+            pos += n
+        elif tag == _TIME:
+            append(_render_time(_MICROS.unpack_from(buf, pos + 2)[0], buf[pos + 1]))
+            pos += 10
+        elif tag == _INT:
+            n = buf[pos + 1]
+            pos += 2
+            if n & 0x80:
+                n, pos = _read_varint(buf, pos - 1)
+            append(_unzigzag(n))
+        else:
+            item, pos = _read(buf, pos, strings, shapes)
+            append(item)
+    return (items if keys is None else dict(zip(keys, items))), pos
+
+
+def _unpack(buf: bytes) -> Dict[str, Any]:
+    if len(buf) <= len(MAGIC) or buf[len(MAGIC)] != VERSION:
+        raise ValueError(f"unsupported packed store version {buf[len(MAGIC):len(MAGIC) + 1]!r}")
+    pos = len(MAGIC) + 1
+    strings = []
+    count, pos = _read_varint(buf, pos)
+    for _ in range(count):
+        size, pos = _read_varint(buf, pos)
+        strings.append(buf[pos:pos + size].decode("utf-8"))
+        pos += size
+    shapes = []
+    count, pos = _read_varint(buf, pos)
+    for _ in range(count):
+        size, pos = _read_varint(buf, pos)
+        refs = []
+        for _ in range(size):
+            ref, pos = _read_varint(buf, pos)
+            refs.append(strings[ref])
+        shapes.append(tuple(refs))
+    goal_count, pos = _read_varint(buf, pos)
+    task_count, pos = _read_varint(buf, pos)
+
+    records = []
+    for _ in range(1 + goal_count + task_count):
+        size, pos = _read_varint(buf, pos)
+        record, end = _read(buf, pos, strings, shapes)
+        if end != pos + size:
+            raise ValueError("corrupt packed store: record length mismatch")
+        records.append(record)
+        pos = end
+    doc = records[0]
+    if "goals" in doc:
+        doc["goals"] = records[1:1 + goal_count]
+    if "tasks" in doc:
+        doc["tasks"] = records[1 + goal_count:]
+    return doc
+
+
+def _bench_doc(count: int) -> Dict[str, Any]:
+    """Synthetic store shaped like a real one: per-task timestamps, notes, completions."""
+    from task_index import synthetic_data
+    from task_stats import TaskStats
+    doc = synthetic_data(count)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for n, task in enumerate(doc["tasks"]):
+        created = start + timedelta(seconds=37 * n, microseconds=n % 999983)
+        task["created_at"] = created.isoformat() + "Z"
+        task["notes"] = ""
+        if task["status"] == "completed":
+            task["completed_at"] = (created + timedelta(hours=3)).isoformat() + "Z"
+            task["actual_minutes"] = 30 + n % 90
+        elif task["status"] == "in_progress":
+            task["progress"] = n % 100
+            task["updated_at"] = (created + timedelta(minutes=50)).isoformat() + "Z"
+    for goal in doc["goals"]:
+        goal.update({"context": "", "created_at": start.isoformat() + "Z"})
+    doc["wal"] = {"segment": "WAL-2026-10-17.log", "seq": count * 2}
+    doc["stats"] = TaskStats.build(doc["goals"], doc["tasks"]).to_dict()
+    return doc
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import tempfile
+    from task_wal import atomic_write
+
+    parser = argparse.ArgumentParser(description="Compare snapshot formats on a synthetic store")
+    parser.add_argument("--bench", type=int, default=100_000, metavar="N", help="Number of synthetic tasks")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per format (best time reported)")
+    args = parser.parse_args(argv)
+
+    doc = _bench_doc(args.bench)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tasks.json"
+        for fmt in FORMATS:
+            # save/load as the store does them: encode + atomic replace, read + decode.
+            save_ms = load_ms = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                atomic_write(path, encode(doc, fmt))
+                save_ms = min(save_ms, (time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                loaded, found = decode(path.read_bytes())
+                load_ms = min(load_ms, (time.perf_counter() - start) * 1000)
+            results[fmt] = {
+                "bytes": path.stat().st_size,
+                "save_ms": round(save_ms, 1),
+                "load_ms": round(load_ms, 1),
+                "round_trip": loaded == doc and found == fmt,
+            }
+    pretty = results["pretty"]["bytes"]
+    for result in results.values():
+        result["size_vs_pretty"] = round(result["bytes"] / pretty, 3)
+
+    print(json.dumps({"tasks": args.bench, "formats": results}, indent=2))
+    return 0 if all(result["round_trip"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
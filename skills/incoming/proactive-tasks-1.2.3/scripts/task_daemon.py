@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Resident task daemon and its client shim.
+
+`task_manager.py serve` keeps the task store, its indexes and the ready queue
+in memory and answers CLI commands over a Unix domain socket, so an agent
+polling `next-task` does not pay interpreter startup and a full data load on
+every call.
+
+Protocol: JSON lines over the socket, one request and one reply per line.
+
+    -> {"argv": ["next-task", "--goal", "goal_1a2b3c4d"]}
+    <- {"exit": 0, "stdout": "{...}\\n", "stderr": ""}
+
+    -> {"argv": ["batch"], "stdin": "{\\"argv\\": [...]}\\n..."}
+
+    -> {"op": "ping"}        <- {"ok": true, "pid": 4242}
+    -> {"op": "shutdown"}    <- {"ok": true}
+
+stdout, stderr and the exit code are exactly what the command prints and
+returns in direct mode. Commands are executed one at a time, in arrival order.
+
+The client side (forward) only needs socket and json, and returns None when
+no daemon is listening so the CLI can fall back to running the command itself.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import socket
+
+# socket and signal are imported where used: the CLI imports this module on
+# every call but only touches a socket when a daemon's socket file exists.
+
+SOCKET_ENV = "PROACTIVE_TASKS_SOCKET"
+DIRECT_ENV = "PROACTIVE_TASKS_DIRECT"
+SOCKET_FILE_NAME = "taskd.sock"
+
+# A connected client that sends nothing for this long is dropped, so one
+# stuck caller cannot wedge the daemon for everyone else.
+CLIENT_TIMEOUT = 30.0
+
+Executor = Callable[[List[str], str], Tuple[int, str, str]]
+
+
+class DaemonError(Exception):
+    """The daemon cannot start or a forwarded command lost its connection."""
+
+
+def socket_path(data_dir: Path) -> Path:
+    """Socket path from PROACTIVE_TASKS_SOCKET, else data/taskd.sock."""
+    override = os.environ.get(SOCKET_ENV, "").strip()
+    return Path(override) if override else data_dir / SOCKET_FILE_NAME
+
+
+def _connect(path: Path) -> Optional["socket.socket"]:
+    if not path.exists():
+        return None
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # Stale socket file left by a daemon that did not shut down cleanly.
+        sock.close()
+        return None
+    return sock
+
+
+def _call(sock: "socket.socket", request: Dict) -> Dict:
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise DaemonError("daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def forward(path: Path, argv: List[str], stdin: Optional[str] = None) -> Optional[Dict]:
+    """Run argv in the daemon; None when no daemon is listening (or direct mode is forced)."""
+    if os.environ.get(DIRECT_ENV, "").strip() not in ("", "0"):
+        return None
+    sock = _connect(path)
+    if sock is None:
+        return None
+    # Once the request is sent it is never retried locally: the daemon may
+    # already have applied it.
+    request: Dict = {"argv": argv}
+    if stdin is not None:
+        request["stdin"] = stdin
+    return _call(sock, request)
+
+
+def ping(path: Path) -> Optional[Dict]:
+    sock = _connect(path)
+    if sock is None:
+        return None
+    try:
+        return _call(sock, {"op": "ping"})
+    except (OSError, ValueError, DaemonError):
+        return None
+
+
+def shutdown(path: Path) -> bool:
+    sock = _connect(path)
+    if sock is None:
+        return False
+    return bool(_call(sock, {"op": "shutdown"}).get("ok"))
+
+
+def _reply(request: Dict, execute: Executor) -> Tuple[Dict, bool]:
+    """Reply to one request; the flag asks the server loop to stop."""
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}, False
+    if op == "shutdown":
+        return {"ok": True}, True
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        return {"exit": 2, "stdout": "", "stderr": "bad request: expected {\"argv\": [str, ...]}\n"}, False
+    stdin = request.get("stdin")
+    code, out, err = execute(argv, stdin if isinstance(stdin, str) else "")
+    return {"exit": code, "stdout": out, "stderr": err}, False
+
+
+def _serve_connection(conn: "socket.socket", execute: Executor) -> bool:
+    import socket
+    conn.settimeout(CLIENT_TIMEOUT)
+    with conn, conn.makefile("rwb") as stream:
+        try:
+            for line in stream:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if isinstance(request, dict):
+                    reply, stop = _reply(request, execute)
+                else:
+                    reply, stop = {"exit": 2, "stdout": "", "stderr": "bad request: not a JSON object\n"}, False
+                stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+                stream.flush()
+                if stop:
+                    return True
+        except (socket.timeout, ConnectionError):
+            pass
+    return False
+
+
+def serve(
+    path: Path,
+    execute: Executor,
+    on_ready: Optional[Callable[[], None]] = None,
+    on_idle: Optional[Callable[[], Optional[float]]] = None,
+) -> None:
+    """Accept connections until a shutdown request, SIGTERM or SIGINT.
+
+    on_idle runs after every connection and whenever the delay it last
+    returned (seconds, None for no deadline) passes without a connection;
+    it lets deferred work such as a held SESSION-STATE.md render finish.
+    """
+    import signal
+    import socket
+    
+    if ping(path) is not None:
+        raise DaemonError(f"a daemon is already listening on {path}")
+    if path.exists():
+        path.unlink()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(str(path))
+    except OSError as exc:
+        listener.close()
+        raise DaemonError(f"cannot bind {path}: {exc}") from None
+    os.chmod(path, 0o600)
+    listener.listen(16)
+
+    def stop(signum, frame):
+        # Not SystemExit: commands exit through SystemExit and the executor catches it.
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        if on_ready:
+            on_ready()
+        while True:
+            listener.settimeout(on_idle() if on_idle else None)
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            if _serve_connection(conn, execute):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+In-memory lookup indexes for the Proactive Task Manager.
+
+TaskIndex is built once per load of tasks.json and kept current as commands
+change records, replacing the linear scans over the goal and task lists:
+
+- id -> task and id -> goal maps
+- goal_id -> task ids, in creation order
+- status and (status, priority) buckets
+- a trigram index for case-insensitive substring search on goal titles
+
+Record order (creation order) is preserved everywhere, so results match the
+old list scans exactly.
+"""
+
+import argparse
+import json
+import sys
+import time
+from bisect import insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class TitleIndex:
+    """Case-insensitive substring search over titles, first match in insertion order.
+
+    Queries of at least three characters only verify records sharing the
+    query's rarest trigram; shorter queries scan the lowered titles.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.position: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+
+    def put(self, record_id: str, title: str) -> None:
+        lowered = title.lower()
+        pos = self.position.get(record_id)
+        if pos is None:
+            pos = len(self.ids)
+            self.position[record_id] = pos
+            self.ids.append(record_id)
+            self.titles.append(lowered)
+            for gram in _grams(lowered):
+                self.postings.setdefault(gram, []).append(pos)
+            return
+        old = self.titles[pos]
+        if old == lowered:
+            return
+        old_grams, new_grams = _grams(old), _grams(lowered)
+        for gram in old_grams - new_grams:
+            self.postings[gram].remove(pos)
+        for gram in new_grams - old_grams:
+            insort(self.postings.setdefault(gram, []), pos)
+        self.titles[pos] = lowered
+
+    def find(self, query: str) -> Optional[str]:
+        needle = query.lower()
+        if len(needle) < GRAM:
+            candidates: Iterable[int] = range(len(self.titles))
+        else:
+            lists = [self.postings.get(gram, []) for gram in _grams(needle)]
+            candidates = min(lists, key=len)
+        for pos in candidates:
+            if needle in self.titles[pos]:
+                return self.ids[pos]
+        return None
+
+
+class TaskIndex:
+    """Lookup maps over goals and tasks, updated incrementally by put_goal/put_task."""
+
+    def __init__(self, goals: Iterable[Dict] = (), tasks: Iterable[Dict] = ()) -> None:
+        self.goals_by_id: Dict[str, Dict] = {}
+        self.goal_titles = TitleIndex()
+        self.tasks_by_id: Dict[str, Dict] = {}
+        self.position: Dict[str, int] = {}
+        self.by_goal: Dict[str, List[str]] = {}
+        self.by_status: Dict[str, Set[str]] = {}
+        self.by_status_priority: Dict[Tuple[str, str], Set[str]] = {}
+        # Indexed (goal_id, status, priority) per task: callers mutate task
+        # dicts in place, so the old keys must be remembered to move buckets.
+        self._keys: Dict[str, Tuple[str, str, str]] = {}
+        self._goal_status: Dict[str, Optional[str]] = {}
+        for goal in goals:
+            self.put_goal(goal)
+        for task in tasks:
+            self.put_task(task)
+
+    def put_goal(self, goal: Dict) -> None:
+        self.goals_by_id[goal["id"]] = goal
+        self.goal_titles.put(goal["id"], goal.get("title", ""))
+        self._goal_status[goal["id"]] = goal.get("status")
+
+    def indexed_goal_status(self, goal_id: str) -> Optional[str]:
+        """Status the goal had when last indexed, even if its dict was since mutated."""
+        return self._goal_status.get(goal_id)
+
+    def put_task(self, task: Dict) -> None:
+        task_id = task["id"]
+        keys = (task.get("goal_id"), task.get("status"), task.get("priority"))
+        old = self._keys.get(task_id)
+        self.tasks_by_id[task_id] = task
+        if old == keys:
+            return
+        if old is None:
+            self.position[task_id] = len(self.position)
+        else:
+            self._unlink(task_id, old)
+        goal_id, status_name, priority = keys
+        ids = self.by_goal.setdefault(goal_id, [])
+        ids.append(task_id)
+        if len(ids) > 1 and self.position[ids[-2]] > self.position[task_id]:
+            # Only when an existing task moves to another goal.
+            ids.sort(key=self.position.__getitem__)
+        self.by_status.setdefault(status_name, set()).add(task_id)
+        self.by_status_priority.setdefault((status_name, priority), set()).add(task_id)
+        self._keys[task_id] = keys
+
+    def indexed_status(self, task_id: str) -> Optional[str]:
+        """Status the task had when last indexed, even if its dict was since mutated."""
+        keys = self._keys.get(task_id)
+        return keys[1] if keys else None
+
+    def _unlink(self, task_id: str, keys: Tuple[str, str, str]) -> None:
+        goal_id, status_name, priority = keys
+        self.by_goal[goal_id].remove(task_id)
+        self.by_status[status_name].discard(task_id)
+        self.by_status_priority[(status_name, priority)].discard(task_id)
+
+    def find_goal_by_title(self, title: str) -> Optional[Dict]:
+        goal_id = self.goal_titles.find(title)
+        return self.goals_by_id[goal_id] if goal_id is not None else None
+
+    def _ordered(self, ids: Iterable[str]) -> List[str]:
+        return sorted(ids, key=self.position.__getitem__)
+
+    def iter_tasks(
+        self,
+        goal_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """Tasks matching every given filter, in creation order, from the smallest bucket."""
+        if status is not None and priority is not None:
+            ids = self.by_status_priority.get((status, priority), set())
+        elif status is not None:
+            ids = self.by_status.get(status, set())
+        else:
+            ids = None
+        if goal_id is not None:
+            goal_ids = self.by_goal.get(goal_id, [])
+            if ids is None or len(goal_ids) <= len(ids):
+                ordered: Iterable[str] = goal_ids
+            else:
+                ordered = self._ordered(ids)
+        elif ids is not None:
+            ordered = self._ordered(ids)
+        else:
+            ordered = self.tasks_by_id
+        for task_id in ordered:
+            task = self.tasks_by_id[task_id]
+            if goal_id is not None and task.get("goal_id") != goal_id:
+                continue
+            if status is not None and task.get("status") != status:
+                continue
+            if priority is not None and task.get("priority") != priority:
+                continue
+            yield task
+
+    def count_by_status(self) -> Dict[str, int]:
+        return {status_name: len(ids) for status_name, ids in self.by_status.items() if ids}
+
+
+def synthetic_data(count: int, goals: int = 200, seed: int = 7) -> Dict[str, List[Dict]]:
+    # Benchmark-only; kept out of the import the CLI pays for on every call.
+    import random
+    rng = random.Random(seed)
+    goal_list = [
+        {"id": f"goal_{g:05d}", "title": f"Goal {g} {rng.choice(['launch', 'research', 'hardware', 'ops'])}",
+         "priority": rng.choice(["low", "medium", "high"]), "status": "active"}
+        for g in range(goals)
+    ]
+    tasks = []
+    for n in range(count):
+        task = {
+            "id": f"task_{n:07d}",
+            "goal_id": f"goal_{rng.randrange(goals):05d}",
+            "title": f"Task {n}",
+            "priority": rng.choice(["low", "medium", "high"]),
+            "status": rng.choice(["pending", "completed", "completed", "in_progress"]),
+            "created_at": "2026-02-01T00:00:00+00:00Z",
+        }
+        if n and rng.random() < 0.3:
+            task["depends_on"] = [f"task_{rng.randrange(n):07d}" for _ in range(rng.randint(1, 3))]
+        tasks.append(task)
+    return {"goals": goal_list, "tasks": tasks}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the task index on synthetic data")
+    parser.add_argument("--bench", type=int, default=100_000, metavar="N", help="Number of synthetic tasks")
+    args = parser.parse_args(argv)
+
+    data = synthetic_data(args.bench)
+    start = time.perf_counter()
+    index = TaskIndex(data["goals"], data["tasks"])
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def deps_met(task: Dict) -> bool:
+        for dep_id in task.get("depends_on") or []:
+            dep = index.tasks_by_id.get(dep_id)
+            if dep is None or dep["status"] != "completed":
+                return False
+        return True
+
+    start = time.perf_counter()
+    found = None
+    for priority in ("high", "medium", "low"):
+        found = next((t for t in index.iter_tasks(status="pending", priority=priority) if deps_met(t)), None)
+        if found:
+            break
+    next_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    goal = index.find_goal_by_title("hardware")
+    title_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "tasks": args.bench,
+        "index_build_ms": round(build_ms, 1),
+        "next_task_ms": round(next_ms, 3),
+        "next_task": found and found["id"],
+        "goal_title_search_ms": round(title_ms, 3),
+        "goal": goal and goal["id"],
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
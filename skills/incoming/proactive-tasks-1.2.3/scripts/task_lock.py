@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Inter-process lock for the Proactive Task Manager.
+
+Every command is a read-modify-write of the store (plus the WAL, the working
+buffer and SESSION-STATE.md). StoreLock serializes commands across processes
+with an advisory fcntl.flock on data/tasks.lock, held for one whole command,
+so concurrent agents can no longer overwrite each other's updates.
+
+flock locks are released by the kernel when their process dies, so a crashed
+command never leaves the workspace locked. On platforms without fcntl the lock
+is a no-op, as before.
+"""
+
+import os
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+LOCK_FILE_NAME = "tasks.lock"
+
+
+class StoreLock:
+    """Re-entrant exclusive lock on a lock file: nested holders (batch commands) share it."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+
+    def __enter__(self) -> "StoreLock":
+        if self._depth == 0 and fcntl is not None:
+            fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
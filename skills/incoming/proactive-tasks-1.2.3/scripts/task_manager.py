@@ -7,11 +7,19 @@ Includes Phase 2: WAL, SESSION-STATE, working buffer, self-healing.
 
 import json
 import argparse
+import os
 import sys
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Optional, Dict, List, Any
-import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Any, Tuple
+
+from task_daemon import DaemonError, forward, socket_path
+from task_lock import LOCK_FILE_NAME, StoreLock
+
+# The stores, WAL, archive and state-file writers (and uuid, traceback, io)
+# are imported by the functions that use them: most invocations are a single
+# read-only command, whose cost is mostly interpreter startup and imports.
+# scripts/bench_startup.py keeps that in check.
 
 # Data file location
 SCRIPT_DIR = Path(__file__).parent
@@ -23,57 +31,101 @@ MEMORY_DIR = WORKSPACE_ROOT / "memory"
 SESSION_STATE_FILE = WORKSPACE_ROOT / "SESSION-STATE.md"
 WORKING_BUFFER_FILE = MEMORY_DIR / "working-buffer.md"
 
-# Ensure directories exist
-DATA_DIR.mkdir(exist_ok=True)
-MEMORY_DIR.mkdir(exist_ok=True)
+def ensure_dirs() -> None:
+    """Create data/ and memory/ (read-only commands never do)."""
+    DATA_DIR.mkdir(exist_ok=True)
+    MEMORY_DIR.mkdir(exist_ok=True)
 
-def load_data() -> Dict[str, Any]:
-    """Load tasks data from JSON file."""
-    if not DATA_FILE.exists():
-        return {"goals": [], "tasks": []}
-    
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+_store = None
+_wal = None
+_lock = None
+_session_state = None
+_working_buffer = None
+# Set by serve: held SESSION-STATE.md renders are written by the daemon's idle
+# hook instead of at the end of every command.
+_resident = False
+
+def store_lock() -> StoreLock:
+    """The inter-process lock every command except serve runs under."""
+    global _lock
+    if _lock is None:
+        _lock = StoreLock(DATA_DIR / LOCK_FILE_NAME)
+    return _lock
+
+def get_wal() -> "WriteAheadLog":
+    """The write-ahead log in memory/, shared by the store and log_to_wal."""
+    global _wal
+    if _wal is None:
+        from task_wal import WriteAheadLog
+        _wal = WriteAheadLog(MEMORY_DIR)
+    return _wal
+
+def session_state_file() -> "DebouncedFile":
+    """The debounced SESSION-STATE.md writer (hash compare, coalescing, atomic replace)."""
+    global _session_state
+    if _session_state is None or _session_state.path != SESSION_STATE_FILE:
+        from state_files import DebouncedFile
+        _session_state = DebouncedFile(SESSION_STATE_FILE, volatile_prefix="Last updated:")
+    return _session_state
+
+def working_buffer() -> "AppendFile":
+    """The working buffer, kept open for appends."""
+    global _working_buffer
+    if _working_buffer is None or _working_buffer.path != WORKING_BUFFER_FILE:
+        from state_files import AppendFile
+        _working_buffer = AppendFile(WORKING_BUFFER_FILE)
+    return _working_buffer
+
+def get_archive() -> "TaskArchive":
+    """Cold storage for finished tasks, under data/archive/."""
+    from task_archive import ARCHIVE_DIR_NAME, TaskArchive
+    return TaskArchive(DATA_DIR / ARCHIVE_DIR_NAME)
 
-def save_data(data: Dict[str, Any]) -> None:
-    """Save tasks data to JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+def get_store():
+    """Open the configured task store (JSON or SQLite) once per process."""
+    global _store
+    if _store is None:
+        from task_store import open_store
+        _store = open_store(DATA_DIR, wal=get_wal())
+    return _store
+
+def commit_store(store) -> None:
+    """Commit the command's writes, or leave them for the batch to commit once."""
+    if _deferred is None:
+        store.commit()
+
+def reset_store() -> None:
+    """Close and forget the open store and any unsynced log entries; the next get_store() reopens it."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+    if _wal is not None:
+        _wal.discard()
+
+def use_empty_store() -> None:
+    """Make get_store() return an empty JSON store that is never saved."""
+    global _store
+    from task_store import JSON_FILE_NAME, JsonTaskStore
+    reset_store()
+    _store = JsonTaskStore(DATA_DIR / JSON_FILE_NAME, get_wal())
 
 def generate_id(prefix: str) -> str:
     """Generate a unique ID."""
+    import uuid
     return f"{prefix}_{uuid.uuid4().hex[:8]}"
 
-def find_goal_by_title(data: Dict[str, Any], title: str) -> Optional[Dict]:
+def find_goal_by_title(store, title: str) -> Optional[Dict]:
     """Find a goal by title (case-insensitive partial match)."""
-    title_lower = title.lower()
-    for goal in data["goals"]:
-        if title_lower in goal["title"].lower():
-            return goal
-    return None
+    return store.find_goal_by_title(title)
 
-def find_task_by_id(data: Dict[str, Any], task_id: str) -> Optional[Dict]:
+def find_task_by_id(store, task_id: str) -> Optional[Dict]:
     """Find a task by ID."""
-    for task in data["tasks"]:
-        if task["id"] == task_id:
-            return task
-    return None
-
-def get_task_dependencies_met(data: Dict[str, Any], task: Dict) -> bool:
-    """Check if all task dependencies are completed."""
-    if "depends_on" not in task or not task["depends_on"]:
-        return True
-    
-    for dep_id in task["depends_on"]:
-        dep_task = find_task_by_id(data, dep_id)
-        if not dep_task or dep_task["status"] != "completed":
-            return False
-    
-    return True
+    return store.get_task(task_id)
 
 def add_goal(args) -> None:
     """Add a new goal."""
-    data = load_data()
+    store = get_store()
     
     goal = {
         "id": generate_id("goal"),
@@ -84,17 +136,17 @@ def add_goal(args) -> None:
         "status": args.status
     }
     
-    data["goals"].append(goal)
-    save_data(data)
+    store.put_goal(goal)
+    commit_store(store)
     
     print(json.dumps({"success": True, "goal": goal}, indent=2))
 
 def add_task(args) -> None:
     """Add a task to a goal."""
-    data = load_data()
+    store = get_store()
     
     # Find the goal
-    goal = find_goal_by_title(data, args.goal_title)
+    goal = find_goal_by_title(store, args.goal_title)
     if not goal:
         print(json.dumps({"success": False, "error": f"Goal not found: {args.goal_title}"}), file=sys.stderr)
         sys.exit(1)
@@ -115,44 +167,25 @@ def add_task(args) -> None:
     if args.estimate:
         task["estimate_minutes"] = args.estimate
     
-    data["tasks"].append(task)
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
     print(json.dumps({"success": True, "task": task}, indent=2))
 
 def next_task(args) -> None:
     """Get the next task to work on."""
-    data = load_data()
-    
-    # Filter pending tasks
-    candidates = [
-        task for task in data["tasks"]
-        if task["status"] == "pending" and get_task_dependencies_met(data, task)
-    ]
-    
-    # Apply goal filter if specified
-    if args.goal:
-        candidates = [t for t in candidates if t["goal_id"] == args.goal]
-    
-    # Apply time estimate filter if specified
-    if args.max_estimate:
-        candidates = [
-            t for t in candidates
-            if "estimate_minutes" in t and t["estimate_minutes"] <= args.max_estimate
-        ]
-    
-    if not candidates:
-        print(json.dumps({"success": True, "task": None, "message": "No tasks available"}))
-        return
+    store = get_store()
     
-    # Sort by priority (high > medium > low)
-    priority_order = {"high": 3, "medium": 2, "low": 1}
-    candidates.sort(key=lambda t: priority_order.get(t["priority"], 0), reverse=True)
+    # Pending tasks whose dependencies are all completed, ordered by priority
+    # (high > medium > low) and then age; see ready_queue.py.
+    next_task = store.next_ready(args.goal, args.max_estimate)
     
-    next_task = candidates[0]
+    if not next_task:
+        print(json.dumps({"success": True, "task": None, "message": "No tasks available"}))
+        return
     
     # Get goal info
-    goal = next((g for g in data["goals"] if g["id"] == next_task["goal_id"]), None)
+    goal = store.get_goal(next_task["goal_id"])
     
     result = {
         "success": True,
@@ -164,33 +197,50 @@ def next_task(args) -> None:
 
 def complete_task(args) -> None:
     """Mark a task as completed."""
-    data = load_data()
+    store = get_store()
     
-    task = find_task_by_id(data, args.task_id)
+    task = find_task_by_id(store, args.task_id)
     if not task:
         print(json.dumps({"success": False, "error": f"Task not found: {args.task_id}"}), file=sys.stderr)
         sys.exit(1)
     
+    # WAL FIRST
+    log_to_wal("STATUS_CHANGE", {
+        "task_id": args.task_id,
+        "old_status": task.get("status", "pending"),
+        "new_status": "completed",
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+    
     task["status"] = "completed"
     task["completed_at"] = datetime.now(timezone.utc).isoformat() + "Z"
     
     if args.notes:
         task["notes"] = args.notes
     
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
     print(json.dumps({"success": True, "task": task}, indent=2))
 
 def update_task(args) -> None:
     """Update a task."""
-    data = load_data()
+    store = get_store()
     
-    task = find_task_by_id(data, args.task_id)
+    task = find_task_by_id(store, args.task_id)
     if not task:
         print(json.dumps({"success": False, "error": f"Task not found: {args.task_id}"}), file=sys.stderr)
         sys.exit(1)
     
     if args.status:
+        old_status = task.get("status", "pending")
+        if args.status != old_status:
+            log_to_wal("STATUS_CHANGE", {
+                "task_id": args.task_id,
+                "old_status": old_status,
+                "new_status": args.status,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            })
         task["status"] = args.status
     
     if args.priority:
@@ -204,83 +254,93 @@ def update_task(args) -> None:
     
     task["updated_at"] = datetime.now(timezone.utc).isoformat() + "Z"
     
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
     print(json.dumps({"success": True, "task": task}, indent=2))
 
 def list_goals(args) -> None:
     """List all goals."""
-    data = load_data()
+    store = get_store()
     
-    goals = data["goals"]
-    
-    if args.status:
-        goals = [g for g in goals if g["status"] == args.status]
-    
-    if args.priority:
-        goals = [g for g in goals if g["priority"] == args.priority]
+    goals = list(store.iter_goals(status=args.status, priority=args.priority))
     
     print(json.dumps({"success": True, "goals": goals}, indent=2))
 
 def list_tasks(args) -> None:
     """List tasks for a goal."""
-    data = load_data()
+    store = get_store()
     
-    goal = find_goal_by_title(data, args.goal_title)
+    goal = find_goal_by_title(store, args.goal_title)
     if not goal:
         print(json.dumps({"success": False, "error": f"Goal not found: {args.goal_title}"}), file=sys.stderr)
         sys.exit(1)
     
-    tasks = [t for t in data["tasks"] if t["goal_id"] == goal["id"]]
-    
-    if args.status:
-        tasks = [t for t in tasks if t["status"] == args.status]
+    tasks = list(store.iter_tasks(goal_id=goal["id"], status=args.status, priority=args.priority))
+    result = {"success": True, "goal": goal, "tasks": tasks}
     
-    if args.priority:
-        tasks = [t for t in tasks if t["priority"] == args.priority]
+    if args.include_archived:
+        # Segments are only opened when asked for.
+        result["archived_tasks"] = list(get_archive().iter_tasks(
+            goal_id=goal["id"], status=args.status, priority=args.priority,
+            skip=lambda task_id: store.get_task(task_id) is not None,
+        ))
     
-    print(json.dumps({"success": True, "goal": goal, "tasks": tasks}, indent=2))
+    print(json.dumps(result, indent=2))
 
 def status(args) -> None:
-    """Show overall status."""
-    data = load_data()
+    """Show overall status from the counters the store keeps current."""
+    store = get_store()
     
-    active_goals = [g for g in data["goals"] if g["status"] == "active"]
+    if args.rebuild_stats:
+        store.rebuild_stats()
+        commit_store(store)
+    stats = store.stats()
     
     tasks_by_status = {}
     for status_name in ["pending", "in_progress", "blocked", "needs_input", "completed"]:
-        tasks_by_status[status_name] = len([t for t in data["tasks"] if t["status"] == status_name])
-    
-    # Recent completions (last 5)
-    completed_tasks = [t for t in data["tasks"] if t["status"] == "completed"]
-    completed_tasks.sort(key=lambda t: t.get("completed_at", ""), reverse=True)
-    recent_completions = completed_tasks[:5]
+        tasks_by_status[status_name] = stats.tasks_by_status.get(status_name, 0)
     
     result = {
         "success": True,
-        "active_goals_count": len(active_goals),
+        "active_goals_count": stats.goals_by_status.get("active", 0),
         "tasks_by_status": tasks_by_status,
-        "recent_completions": recent_completions
+        "recent_completions": stats.recent(5)
     }
+    archived = get_archive().count()
+    if archived:
+        result["archived_tasks"] = archived
     
     print(json.dumps(result, indent=2))
 
 # ==================== PHASE 2: WAL, SESSION-STATE, HEALTH-CHECK ====================
 
-def log_to_wal(event_type: str, content: Dict[str, Any]) -> None:
-    """Write-Ahead Logging: Log critical changes BEFORE persisting data."""
-    timestamp = datetime.now(timezone.utc).isoformat()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    wal_file = MEMORY_DIR / f"WAL-{today}.log"
+class Deferred:
+    """Side effects held back while a batch runs, then applied once by flush()."""
     
-    wal_entry = {
-        "timestamp": timestamp,
-        "event_type": event_type,
-        "content": content
-    }
+    def __init__(self):
+        self.buffer: List[str] = []
+        self.session: Optional[tuple] = None
+    
+    def flush(self, store) -> None:
+        # One commit: the whole batch's WAL entries in one fsynced write, then
+        # the data. Then the working buffer and a single SESSION-STATE.md render.
+        store.commit()
+        
+        if self.buffer:
+            working_buffer().write("".join(self.buffer))
+        if self.session:
+            write_session_state(*self.session)
+
+_deferred: Optional[Deferred] = None
+
+def log_to_wal(event_type: str, content: Dict[str, Any]) -> None:
+    """Write-Ahead Logging: Log critical changes BEFORE persisting data.
     
-    with open(wal_file, 'a') as f:
-        f.write(json.dumps(wal_entry) + "\n")
+    Entries are group-committed: the store's commit (or the end of the
+    command) writes them, with the changed records, in one fsynced append.
+    """
+    get_wal().record(event_type, content)
 
 
 def append_to_buffer(event_type: str, details: str) -> None:
@@ -288,12 +348,23 @@ def append_to_buffer(event_type: str, details: str) -> None:
     timestamp = datetime.now(timezone.utc).isoformat()
     entry = f"- {event_type} ({timestamp}): {details}\n"
     
-    with open(WORKING_BUFFER_FILE, 'a') as f:
-        f.write(entry)
+    if _deferred is not None:
+        _deferred.buffer.append(entry)
+        return
+    
+    working_buffer().write(entry)
 
 
 def update_session_state(task: Dict, goal: Dict, action: str = "") -> None:
-    """Update SESSION-STATE.md with current task context."""
+    """Update SESSION-STATE.md with current task context (once, at the end of a batch)."""
+    if _deferred is not None:
+        _deferred.session = (task, goal, action)
+        return
+    write_session_state(task, goal, action)
+
+
+def write_session_state(task: Dict, goal: Dict, action: str = "") -> None:
+    """Render SESSION-STATE.md; written only if it changed, and at most once per coalescing window."""
     progress = task.get("progress", 0)
     estimate = task.get("estimate_minutes", 0)
     actual = task.get("actual_minutes", 0)
@@ -337,14 +408,13 @@ Last updated: {datetime.now(timezone.utc).isoformat()}
 {action or "Continue with current task or mark as complete"}
 """
     
-    with open(SESSION_STATE_FILE, 'w') as f:
-        f.write(content)
+    session_state_file().submit(content)
 
 
 def mark_progress(args) -> None:
     """Mark task progress (0-100%) - Phase 2 enhanced."""
-    data = load_data()
-    task = find_task_by_id(data, args.task_id)
+    store = get_store()
+    task = find_task_by_id(store, args.task_id)
     
     if not task:
         print(json.dumps({"success": False, "error": f"Task not found: {args.task_id}"}), file=sys.stderr)
@@ -374,9 +444,10 @@ def mark_progress(args) -> None:
     elif args.progress > 0 and task.get("status") == "pending":
         task["status"] = "in_progress"
     
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
-    goal = next((g for g in data["goals"] if g["id"] == task.get("goal_id")), None)
+    goal = store.get_goal(task.get("goal_id"))
     if goal:
         update_session_state(task, goal, f"Progress marked: {old_progress}% → {args.progress}%")
     
@@ -392,8 +463,8 @@ def mark_progress(args) -> None:
 
 def log_time(args) -> None:
     """Log time spent on a task - Phase 2 enhanced."""
-    data = load_data()
-    task = find_task_by_id(data, args.task_id)
+    store = get_store()
+    task = find_task_by_id(store, args.task_id)
     
     if not task:
         print(json.dumps({"success": False, "error": f"Task not found: {args.task_id}"}), file=sys.stderr)
@@ -423,9 +494,10 @@ def log_time(args) -> None:
     if task.get("status") == "pending" and new_actual > 0:
         task["status"] = "in_progress"
     
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
-    goal = next((g for g in data["goals"] if g["id"] == task.get("goal_id")), None)
+    goal = store.get_goal(task.get("goal_id"))
     if goal:
         update_session_state(task, goal, f"Logged {args.minutes} min (total: {new_actual} min)")
     
@@ -453,8 +525,8 @@ def log_time(args) -> None:
 
 def mark_blocked(args) -> None:
     """Mark task as blocked - Phase 2 enhanced."""
-    data = load_data()
-    task = find_task_by_id(data, args.task_id)
+    store = get_store()
+    task = find_task_by_id(store, args.task_id)
     
     if not task:
         print(json.dumps({"success": False, "error": f"Task not found: {args.task_id}"}), file=sys.stderr)
@@ -475,9 +547,10 @@ def mark_blocked(args) -> None:
     task["blocked_reason"] = args.reason
     task["updated_at"] = datetime.now(timezone.utc).isoformat() + "Z"
     
-    save_data(data)
+    store.put_task(task)
+    commit_store(store)
     
-    goal = next((g for g in data["goals"] if g["id"] == task.get("goal_id")), None)
+    goal = store.get_goal(task.get("goal_id"))
     if goal:
         update_session_state(task, goal, f"BLOCKED: {args.reason}")
     
@@ -493,47 +566,58 @@ def mark_blocked(args) -> None:
 
 
 def health_check(args) -> None:
-    """Health check: detect and report broken task states."""
-    data = load_data()
+    """Health check: detect and report broken task states (rules in health_rules.py)."""
+    from health_rules import CYCLE_RULE, RULES, scan, select_rules
+    try:
+        selected = select_rules(args.rules)
+    except ValueError as exc:
+        print(json.dumps({"success": False, "error": str(exc)}), file=sys.stderr)
+        sys.exit(1)
+    
+    store = get_store()
+    now = datetime.now(timezone.utc).isoformat()
+    tasks = list(store.iter_tasks())
     issues = []
     fixes = []
+    fixed_tasks = {}
+    
+    rules = [rule for rule in RULES if rule.name in selected]
+    for pos, rule in scan(tasks, rules, now, jobs=args.jobs):
+        task = tasks[pos]
+        issues.append(rule.issue(task, now))
+        if rule.fix is not None:
+            if not args.dry_run:
+                task.update(rule.fix(task, now))
+                fixed_tasks[pos] = task
+            fixes.append(rule.fixed(task))
+    
+    if CYCLE_RULE in selected:
+        for cycle in store.dependency_cycles():
+            issues.append(f"Dependency cycle: {' -> '.join(cycle + cycle[:1])} (tasks can never become ready)")
+    
+    if args.dry_run:
+        result = {
+            "success": True,
+            "dry_run": True,
+            "health_status": "healthy" if not issues else "issues_found",
+            "issues": issues,
+            "would_fix": fixes,
+            "summary": f"Found {len(issues)} issues, would auto-fix {len(fixes)}"
+        }
+        if args.rules is not None:
+            result["rules"] = selected
+        print(json.dumps(result, indent=2))
+        return
     
-    for task in data["tasks"]:
-        task_id = task.get("id", "unknown")
-        
-        if task.get("recurring") and not task.get("goal_id"):
-            issues.append(f"Orphaned recurring task: {task_id}")
-            task["recurring"] = None
-            fixes.append(f"Removed recurring flag from {task_id}")
-        
-        if task.get("status") == "completed" and task.get("progress", 100) < 100:
-            issues.append(f"Impossible state: {task_id} completed but progress={task.get('progress')}%")
-            task["progress"] = 100
-            fixes.append(f"Set progress=100% for completed task {task_id}")
-        
-        if task.get("status") == "completed" and not task.get("completed_at"):
-            issues.append(f"Inconsistent completion: {task_id} status=completed but no completed_at")
-            task["completed_at"] = datetime.now(timezone.utc).isoformat() + "Z"
-            fixes.append(f"Added completed_at timestamp to {task_id}")
-        
-        if task.get("actual_minutes", 0) > task.get("estimate_minutes", 1) * 10:
-            ratio = task.get("actual_minutes", 0) / task.get("estimate_minutes", 1)
-            issues.append(f"Time anomaly: {task_id} actual={task.get('actual_minutes')}m vs estimate={task.get('estimate_minutes')}m ({ratio:.1f}x)")
-        
-        if task.get("status") == "completed":
-            completed_at = task.get("completed_at", "")
-            if completed_at > datetime.now(timezone.utc).isoformat():
-                issues.append(f"Bad date: {task_id} completed_at={completed_at} is in future")
-                task["completed_at"] = datetime.now(timezone.utc).isoformat() + "Z"
-                fixes.append(f"Reset completed_at for {task_id}")
-    
-    if fixes:
-        save_data(data)
+    for task in fixed_tasks.values():
+        store.put_task(task)
+    if fixed_tasks:
+        commit_store(store)
     
     log_to_wal("HEALTH_CHECK", {
         "issues_found": len(issues),
         "auto_fixes_applied": len(fixes),
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": now
     })
     
     result = {
@@ -543,6 +627,8 @@ def health_check(args) -> None:
         "auto_fixes": fixes,
         "summary": f"Found {len(issues)} issues, auto-fixed {len(fixes)}"
     }
+    if args.rules is not None:
+        result["rules"] = selected
     print(json.dumps(result, indent=2))
 
 
@@ -575,19 +661,298 @@ def flush_buffer(args) -> None:
     }
     print(json.dumps(result, indent=2))
 
-def main():
-    parser = argparse.ArgumentParser(description="Proactive Task Manager")
+def archive(args) -> None:
+    """Move completed/cancelled tasks finished more than --days ago into data/archive/."""
+    from task_archive import select_archivable
+    store = get_store()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    tasks = select_archivable(list(store.iter_tasks()), cutoff)
+    
+    if args.dry_run:
+        segments: Dict[str, int] = {}
+        for task in tasks:
+            name = get_archive().segment_for(task).name
+            segments[name] = segments.get(name, 0) + 1
+        print(json.dumps({"success": True, "dry_run": True, "would_archive": len(tasks), "segments": segments}, indent=2))
+        return
+    
+    # Segments first: a crash before the store commit leaves the tasks in
+    # both places, and the next run skips what is already archived.
+    segments = get_archive().write(tasks)
+    log_to_wal("ARCHIVE", {
+        "older_than_days": args.days,
+        "archived": len(tasks),
+        "segments": segments,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+    store.delete_tasks(task["id"] for task in tasks)
+    commit_store(store)
+    
+    result = {
+        "success": True,
+        "archived": len(tasks),
+        "segments": segments,
+        "remaining_tasks": store.stats().task_count()
+    }
+    print(json.dumps(result, indent=2))
+
+def analytics(args) -> None:
+    """Estimate accuracy, velocity per goal and throughput per day from the WAL (task_analytics.py)."""
+    from task_analytics import CACHE_FILE_NAME, load_partials, summarize, task_ids
+    for day in (args.since, args.until):
+        try:
+            if day is not None:
+                datetime.strptime(day, "%Y-%m-%d")
+        except ValueError:
+            print(json.dumps({"success": False, "error": f"Invalid date (expected YYYY-MM-DD): {day}"}), file=sys.stderr)
+            sys.exit(1)
+    
+    store = get_store()
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    try:
+        partials, counts = load_partials(
+            MEMORY_DIR, MEMORY_DIR / CACHE_FILE_NAME, today,
+            since=args.since, until=args.until, rebuild=args.rebuild_cache,
+        )
+    except ValueError as exc:
+        print(json.dumps({"success": False, "error": str(exc)}), file=sys.stderr)
+        sys.exit(1)
+    
+    tasks = {}
+    missing = set()
+    for task_id in task_ids(partials):
+        task = store.get_task(task_id)
+        if task is not None:
+            tasks[task_id] = task
+        else:
+            missing.add(task_id)
+    if missing:
+        # Finished tasks may have been archived since they were logged.
+        for task in get_archive().iter_tasks(skip=lambda task_id: task_id not in missing):
+            tasks[task["id"]] = task
+            missing.discard(task["id"])
+            if not missing:
+                break
+    
+    def goal_title(goal_id: str) -> Optional[str]:
+        goal = store.get_goal(goal_id)
+        return goal.get("title") if goal else None
+    
+    result = {"success": True, **summarize(partials, tasks, goal_title), "cache": counts}
+    print(json.dumps(result, indent=2))
+
+def migrate_storage(args) -> None:
+    """One-shot migration of data/tasks.json into the SQLite store."""
+    from task_daemon import ping
+    from task_store import SQLITE_FILE_NAME, SqliteTaskStore, migrate_json_to_sqlite
+    db_path = DATA_DIR / SQLITE_FILE_NAME
+    if ping(socket_path(DATA_DIR)) is not None:
+        print(json.dumps({"success": False, "error": "A task daemon is running; stop it first with: serve --stop"}), file=sys.stderr)
+        sys.exit(1)
+    
+    if not DATA_FILE.exists():
+        print(json.dumps({"success": False, "error": f"Nothing to migrate: {DATA_FILE} not found"}), file=sys.stderr)
+        sys.exit(1)
+    
+    store = SqliteTaskStore(db_path, get_wal())
+    if not store.is_empty():
+        store.close()
+        print(json.dumps({"success": False, "error": f"{db_path} already holds data; refusing to overwrite"}), file=sys.stderr)
+        sys.exit(1)
+    
+    counts = migrate_json_to_sqlite(DATA_FILE, store)
+    store.close()
+    
+    result = {
+        "success": True,
+        "backend": "sqlite",
+        "database": str(db_path),
+        "migrated": counts,
+        "message": f"{DATA_FILE.name} moved aside; commands now use {db_path.name}"
+    }
+    print(json.dumps(result, indent=2))
+
+def convert_storage(args) -> None:
+    """Rewrite data/tasks.json in another on-disk format (pretty, minified or packed)."""
+    store = get_store()
+    if store.backend != "json":
+        print(json.dumps({"success": False, "error": f"convert-storage applies to {DATA_FILE.name}; this workspace uses the {store.backend} backend"}), file=sys.stderr)
+        sys.exit(1)
+    
+    size_before = DATA_FILE.stat().st_size if DATA_FILE.exists() else 0
+    previous = store.convert(args.format)
+    
+    result = {
+        "success": True,
+        "format": args.format,
+        "previous_format": previous,
+        "bytes_before": size_before,
+        "bytes_after": DATA_FILE.stat().st_size
+    }
+    print(json.dumps(result, indent=2))
+
+def batch(args) -> None:
+    """Apply NDJSON commands from stdin with one WAL write, one save and one session render.
+    
+    Each input line is {"argv": ["log-time", "task_1a2b3c4d", "15"]}; one NDJSON
+    response follows per command. A command that fails (unknown task, bad
+    arguments) is reported and changes nothing; an unexpected error aborts the
+    whole batch before anything is written.
+    """
+    global _deferred
+    store = get_store()
+    responses = []
+    _deferred = Deferred()
+    try:
+        for line_no, line in enumerate(sys.stdin, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            argv = request.get("argv") if isinstance(request, dict) else None
+            if not isinstance(argv, list) or not argv or not all(isinstance(arg, str) for arg in argv):
+                responses.append({"line": line_no, "exit": 2, "error": 'expected {"argv": ["command", ...]}'})
+                continue
+            if argv[0] in BATCH_EXCLUDED:
+                responses.append({"line": line_no, "exit": 2, "error": f"{argv[0]} cannot run in a batch"})
+                continue
+            
+            code, out, err = capture(argv)
+            response = {"line": line_no, "exit": code}
+            if out.strip():
+                try:
+                    response["result"] = json.loads(out)
+                except ValueError:
+                    response["output"] = out
+            if err.strip():
+                try:
+                    response["error"] = json.loads(err).get("error", err.strip())
+                except (ValueError, AttributeError):
+                    response["error"] = err.strip()
+            responses.append(response)
+        
+        deferred, _deferred = _deferred, None
+        deferred.flush(store)
+    except Exception as exc:
+        reset_store()
+        print(json.dumps({"success": False, "error": f"Batch aborted, nothing applied: {exc!r}"}), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        _deferred = None
+    
+    for response in responses:
+        print(json.dumps(response))
+    if any(response["exit"] for response in responses):
+        sys.exit(1)
+
+def serve(args) -> None:
+    """Keep the store resident and answer commands over a Unix socket (see task_daemon.py)."""
+    from task_daemon import serve as serve_forever, shutdown
+    path = Path(args.socket) if args.socket else socket_path(DATA_DIR)
+    
+    if args.stop:
+        if not shutdown(path):
+            print(json.dumps({"success": False, "error": f"No daemon listening on {path}"}), file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps({"success": True, "message": f"Daemon on {path} stopped"}, indent=2))
+        return
+    
+    # Load the store, its indexes and the ready queue before taking requests.
+    with store_lock():
+        store = get_store()
+        store.next_ready()
+    
+    def announce() -> None:
+        print(json.dumps({"success": True, "socket": str(path), "pid": os.getpid(), "backend": store.backend}, indent=2))
+        sys.stdout.flush()
+    
+    def write_held_state() -> Optional[float]:
+        writer = session_state_file()
+        if writer.due() == 0:
+            with store_lock():
+                writer.flush()
+        return writer.due()
+    
+    global _resident
+    _resident = True
+    try:
+        serve_forever(path, execute, on_ready=announce, on_idle=write_held_state)
+    except DaemonError as exc:
+        print(json.dumps({"success": False, "error": str(exc)}), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        _resident = False
+        with store_lock():
+            session_state_file().flush()
+        working_buffer().close()
+        reset_store()
+
+# Run by the CLI itself, never forwarded to (or executed inside) a daemon.
+DIRECT_COMMANDS = {"serve", "migrate-storage"}
+# Everything else runs under store_lock(); serve takes it per request instead.
+UNLOCKED_COMMANDS = {"serve"}
+# Never write (status --rebuild-stats aside), so never create data/ or memory/.
+READ_ONLY_COMMANDS = {"next-task", "list-goals", "list-tasks", "status"}
+BATCH_EXCLUDED = DIRECT_COMMANDS | {"batch", "flush-buffer", "archive", "convert-storage"}
+
+COMMANDS = {
+    "add-goal": add_goal,
+    "add-task": add_task,
+    "next-task": next_task,
+    "complete-task": complete_task,
+    "update-task": update_task,
+    "list-goals": list_goals,
+    "list-tasks": list_tasks,
+    "status": status,
+    "mark-progress": mark_progress,
+    "log-time": log_time,
+    "mark-blocked": mark_blocked,
+    "health-check": health_check,
+    "flush-buffer": flush_buffer,
+    "archive": archive,
+    "analytics": analytics,
+    "migrate-storage": migrate_storage,
+    "convert-storage": convert_storage,
+    "batch": batch,
+    "serve": serve
+}
+
+class _SkippedParser:
+    """Stands in for the subparsers build_parser() was not asked to build."""
+    
+    def add_argument(self, *args, **kwargs) -> None:
+        pass
+
+_SKIPPED = _SkippedParser()
+
+def _help_formatter(prog: str) -> argparse.HelpFormatter:
+    # argparse creates formatters while building parsers (add_argument checks
+    # each argument with one), not just for --help; without a width it imports
+    # shutil (and zlib, bz2, lzma) to ask the terminal. Wraps at $COLUMNS or 100.
+    columns = os.environ.get("COLUMNS", "")
+    return argparse.HelpFormatter(prog, width=(int(columns) if columns.isdigit() else 100) - 2)
+
+def build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """The CLI parser; given a known command, only that command's subparser is built."""
+    parser = argparse.ArgumentParser(description="Proactive Task Manager", formatter_class=_help_formatter)
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
+    def add_parser(name: str, **kwargs):
+        if command is None or name == command:
+            return subparsers.add_parser(name, formatter_class=_help_formatter, **kwargs)
+        return _SKIPPED
+    
     # add-goal
-    parser_add_goal = subparsers.add_parser("add-goal", help="Add a new goal")
+    parser_add_goal = add_parser("add-goal", help="Add a new goal")
     parser_add_goal.add_argument("title", help="Goal title")
     parser_add_goal.add_argument("--priority", choices=["low", "medium", "high"], default="medium")
     parser_add_goal.add_argument("--context", help="Goal context/background")
     parser_add_goal.add_argument("--status", choices=["active", "paused", "completed"], default="active")
     
     # add-task
-    parser_add_task = subparsers.add_parser("add-task", help="Add a task to a goal")
+    parser_add_task = add_parser("add-task", help="Add a task to a goal")
     parser_add_task.add_argument("goal_title", help="Goal title (partial match)")
     parser_add_task.add_argument("task_title", help="Task title")
     parser_add_task.add_argument("--priority", choices=["low", "medium", "high"])
@@ -595,85 +960,198 @@ def main():
     parser_add_task.add_argument("--estimate", type=int, help="Estimated minutes to complete")
     
     # next-task
-    parser_next_task = subparsers.add_parser("next-task", help="Get next task to work on")
+    parser_next_task = add_parser("next-task", help="Get next task to work on")
     parser_next_task.add_argument("--goal", help="Goal ID filter")
     parser_next_task.add_argument("--max-estimate", type=int, help="Max time estimate filter")
     
     # complete-task
-    parser_complete_task = subparsers.add_parser("complete-task", help="Mark task as completed")
+    parser_complete_task = add_parser("complete-task", help="Mark task as completed")
     parser_complete_task.add_argument("task_id", help="Task ID")
     parser_complete_task.add_argument("--notes", help="Completion notes")
     
     # update-task
-    parser_update_task = subparsers.add_parser("update-task", help="Update a task")
+    parser_update_task = add_parser("update-task", help="Update a task")
     parser_update_task.add_argument("task_id", help="Task ID")
     parser_update_task.add_argument("--status", choices=["pending", "in_progress", "blocked", "needs_input", "completed", "cancelled"])
     parser_update_task.add_argument("--priority", choices=["low", "medium", "high"])
     parser_update_task.add_argument("--notes", help="Add notes")
     
     # list-goals
-    parser_list_goals = subparsers.add_parser("list-goals", help="List goals")
+    parser_list_goals = add_parser("list-goals", help="List goals")
     parser_list_goals.add_argument("--status", choices=["active", "paused", "completed"])
     parser_list_goals.add_argument("--priority", choices=["low", "medium", "high"])
     
     # list-tasks
-    parser_list_tasks = subparsers.add_parser("list-tasks", help="List tasks for a goal")
+    parser_list_tasks = add_parser("list-tasks", help="List tasks for a goal")
     parser_list_tasks.add_argument("goal_title", help="Goal title (partial match)")
     parser_list_tasks.add_argument("--status", choices=["pending", "in_progress", "blocked", "needs_input", "completed", "cancelled"])
     parser_list_tasks.add_argument("--priority", choices=["low", "medium", "high"])
+    parser_list_tasks.add_argument("--include-archived", action="store_true", help="Also list matching tasks from data/archive/")
     
     # status
-    parser_status = subparsers.add_parser("status", help="Show overall status")
+    parser_status = add_parser("status", help="Show overall status")
+    parser_status.add_argument("--rebuild-stats", action="store_true", help="Recount the status counters from every task")
     
     # Phase 2 commands
     
     # mark-progress
-    parser_mark_progress = subparsers.add_parser("mark-progress", help="Mark task progress (0-100%)")
+    parser_mark_progress = add_parser("mark-progress", help="Mark task progress (0-100%%)")
     parser_mark_progress.add_argument("task_id", help="Task ID")
     parser_mark_progress.add_argument("progress", type=int, help="Progress percentage (0-100)")
     parser_mark_progress.add_argument("--notes", help="Optional notes")
     
     # log-time
-    parser_log_time = subparsers.add_parser("log-time", help="Log time spent on task")
+    parser_log_time = add_parser("log-time", help="Log time spent on task")
     parser_log_time.add_argument("task_id", help="Task ID")
     parser_log_time.add_argument("minutes", type=int, help="Minutes spent")
     parser_log_time.add_argument("--notes", help="Optional notes")
     
     # mark-blocked
-    parser_mark_blocked = subparsers.add_parser("mark-blocked", help="Mark task as blocked")
+    parser_mark_blocked = add_parser("mark-blocked", help="Mark task as blocked")
     parser_mark_blocked.add_argument("task_id", help="Task ID")
     parser_mark_blocked.add_argument("reason", help="Reason for blocking")
     
     # health-check
-    parser_health_check = subparsers.add_parser("health-check", help="Check and fix broken task states")
+    parser_health_check = add_parser("health-check", help="Check and fix broken task states")
+    parser_health_check.add_argument("--dry-run", action="store_true", help="Report issues and the fixes that would be applied without changing anything")
+    parser_health_check.add_argument("--rules", help="Comma-separated rules to run (default: all): orphaned-recurring, impossible-progress, missing-completed-at, time-anomaly, future-date, dependency-cycle")
+    parser_health_check.add_argument("--jobs", type=int, default=0, help="Worker processes for the scan (default: one per CPU for stores of 200,000+ tasks, else 1)")
     
     # flush-buffer
-    parser_flush_buffer = subparsers.add_parser("flush-buffer", help="Flush working buffer to daily memory")
+    parser_flush_buffer = add_parser("flush-buffer", help="Flush working buffer to daily memory")
+    
+    # archive
+    parser_archive = add_parser("archive", help="Move old completed/cancelled tasks into compressed archive segments")
+    parser_archive.add_argument("--days", type=int, default=30, help="Archive tasks finished more than this many days ago (default: 30)")
+    parser_archive.add_argument("--dry-run", action="store_true", help="Report what would be archived without moving anything")
     
-    args = parser.parse_args()
+    # analytics
+    parser_analytics = add_parser("analytics", help="Estimate accuracy, velocity per goal and throughput per day from the WAL")
+    parser_analytics.add_argument("--since", help="First day to include (YYYY-MM-DD, UTC)")
+    parser_analytics.add_argument("--until", help="Last day to include (YYYY-MM-DD, UTC)")
+    parser_analytics.add_argument("--rebuild-cache", action="store_true", help="Re-read every log instead of using memory/analytics-cache.json")
+    
+    # migrate-storage
+    parser_migrate_storage = add_parser("migrate-storage", help="Move tasks.json into the SQLite store")
+    
+    # convert-storage
+    parser_convert_storage = add_parser("convert-storage", help="Rewrite tasks.json in another on-disk format")
+    parser_convert_storage.add_argument("--format", required=True, choices=["pretty", "minified", "packed"], help="pretty: indented JSON (default); minified: JSON without whitespace; packed: binary records")
+    
+    # batch
+    parser_batch = add_parser("batch", help="Apply NDJSON commands from stdin in one transaction")
+    
+    # serve
+    parser_serve = add_parser("serve", help="Run the resident daemon answering commands over a Unix socket")
+    parser_serve.add_argument("--socket", help="Socket path (default: data/taskd.sock or $PROACTIVE_TASKS_SOCKET)")
+    parser_serve.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    
+    return parser
+
+_parsers: Dict[Optional[str], argparse.ArgumentParser] = {}
+
+def get_parser(argv: List[str]) -> argparse.ArgumentParser:
+    """Parser for argv: just its command's subparser when the command is known, else the full tree."""
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    if command not in _parsers:
+        _parsers[command] = build_parser(command)
+    return _parsers[command]
+
+def run(argv: List[str]) -> None:
+    """Parse argv and run the command in this process."""
+    parser = get_parser(argv)
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
-    # Route to command handlers
-    commands = {
-        "add-goal": add_goal,
-        "add-task": add_task,
-        "next-task": next_task,
-        "complete-task": complete_task,
-        "update-task": update_task,
-        "list-goals": list_goals,
-        "list-tasks": list_tasks,
-        "status": status,
-        "mark-progress": mark_progress,
-        "log-time": log_time,
-        "mark-blocked": mark_blocked,
-        "health-check": health_check,
-        "flush-buffer": flush_buffer
-    }
+    if args.command not in READ_ONLY_COMMANDS or getattr(args, "rebuild_stats", False):
+        ensure_dirs()
+    elif not DATA_DIR.exists():
+        # Nothing stored yet: answer from an empty store without creating
+        # anything (there is no tasks.db to open, whatever the backend).
+        use_empty_store()
+        try:
+            COMMANDS[args.command](args)
+        finally:
+            reset_store()
+        return
+    
+    if args.command in UNLOCKED_COMMANDS:
+        COMMANDS[args.command](args)
+        return
     
-    commands[args.command](args)
+    with store_lock():
+        # Another process may have written since this one last looked. Not
+        # inside a batch: it holds the lock, and its commands' changes are
+        # uncommitted until the end.
+        if _store is not None and _deferred is None:
+            _store.refresh()
+        try:
+            COMMANDS[args.command](args)
+        finally:
+            # Events logged without a data change (e.g. a clean health-check).
+            if _deferred is None and _wal is not None:
+                _wal.sync()
+            if _deferred is None and not _resident and _session_state is not None:
+                _session_state.flush()
+
+def capture(argv: List[str]) -> Tuple[int, str, str]:
+    """Run one command in-process, returning its exit code, stdout and stderr."""
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    with redirect_stdout(out), redirect_stderr(err):
+        try:
+            run(argv)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                code = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+    return code, out.getvalue(), err.getvalue()
+
+def execute(argv: List[str], stdin: str = "") -> Tuple[int, str, str]:
+    """Daemon side: run one forwarded command (stdin is only read by batch)."""
+    import io
+    import traceback
+    if argv and argv[0] in DIRECT_COMMANDS:
+        return 1, "", json.dumps({"success": False, "error": f"{argv[0]} cannot run inside the daemon"}) + "\n"
+    
+    saved_stdin, sys.stdin = sys.stdin, io.StringIO(stdin)
+    try:
+        return capture(argv)
+    except Exception:
+        # Whatever the command half-applied in memory is dropped with the store.
+        reset_store()
+        return 1, "", traceback.format_exc()
+    finally:
+        sys.stdin = saved_stdin
+
+def main():
+    argv = sys.argv[1:]
+    
+    # Thin client: hand the command to a running daemon, else run it here.
+    if argv and argv[0] not in DIRECT_COMMANDS:
+        stdin = None
+        if argv[0] == "batch":
+            import io
+            stdin = sys.stdin.read()
+            sys.stdin = io.StringIO(stdin)
+        try:
+            reply = forward(socket_path(DATA_DIR), argv, stdin)
+        except (OSError, ValueError, DaemonError) as exc:
+            print(json.dumps({"success": False, "error": f"Task daemon failed: {exc}"}), file=sys.stderr)
+            sys.exit(1)
+        if reply is not None:
+            sys.stdout.write(reply["stdout"])
+            sys.stderr.write(reply["stderr"])
+            sys.exit(reply["exit"])
+    
+    run(argv)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Materialized aggregates for the Proactive Task Manager's `status` command.
+
+TaskStats holds per-status task and goal counts plus the most recently
+completed tasks, and is updated by the stores on every put, so `status`
+reads a handful of numbers and at most RECENT_KEPT records instead of
+scanning and sorting the whole task history.
+
+The recent-completions list keeps the invariant that it is the top-K
+completed tasks by completed_at (newest first) for its current length K:
+
+- a newly completed task is inserted if it ranks inside the list, or if the
+  list already holds every completed task;
+- a task that leaves "completed" is removed, leaving the top K-1.
+
+Reopening tasks can shrink the list below what `status` shows; recent()
+then returns None and the store rebuilds the stats in one pass.
+
+Persisted form (tasks.json "stats" key, or the SQLite meta table):
+
+    {"tasks_by_status": {...}, "goals_by_status": {...}, "recent_completions": [task, ...]}
+"""
+
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+# status shows RECENT_SHOWN completions; the slack absorbs reopened tasks
+# before a rebuild is needed.
+RECENT_SHOWN = 5
+RECENT_KEPT = 20
+
+
+def _completed_key(task: Dict) -> str:
+    return task.get("completed_at") or ""
+
+
+def _bump(counts: Dict[str, int], old_status: Optional[str], new_status: Optional[str]) -> None:
+    if old_status is not None:
+        counts[old_status] = counts.get(old_status, 0) - 1
+        if not counts[old_status]:
+            del counts[old_status]
+    counts[new_status] = counts.get(new_status, 0) + 1
+
+
+class TaskStats:
+    """Status counters and a bounded, newest-first list of completed tasks."""
+
+    def __init__(self, doc: Optional[Dict] = None):
+        doc = doc or {}
+        self.tasks_by_status: Dict[str, int] = dict(doc.get("tasks_by_status") or {})
+        self.goals_by_status: Dict[str, int] = dict(doc.get("goals_by_status") or {})
+        self.recent_completions: List[Dict] = list(doc.get("recent_completions") or [])
+
+    @classmethod
+    def build(cls, goals: Iterable[Dict], tasks: Iterable[Dict]) -> "TaskStats":
+        """Recompute everything in one pass over the records."""
+        stats = cls()
+        for goal in goals:
+            _bump(stats.goals_by_status, None, goal.get("status"))
+        completed = []
+        for task in tasks:
+            _bump(stats.tasks_by_status, None, task.get("status"))
+            if task.get("status") == "completed":
+                completed.append(task)
+        stats.recent_completions = heapq.nlargest(RECENT_KEPT, completed, key=_completed_key)
+        return stats
+
+    def to_dict(self) -> Dict:
+        return {
+            "tasks_by_status": self.tasks_by_status,
+            "goals_by_status": self.goals_by_status,
+            "recent_completions": self.recent_completions,
+        }
+
+    def task_count(self) -> int:
+        return sum(self.tasks_by_status.values())
+
+    def goal_count(self) -> int:
+        return sum(self.goals_by_status.values())
+
+    def put_goal(self, goal: Dict, old_status: Optional[str] = None, new: bool = False) -> None:
+        """Count a new goal, or move a changed one from old_status."""
+        if new or old_status != goal.get("status"):
+            _bump(self.goals_by_status, None if new else old_status, goal.get("status"))
+
+    def put_task(self, task: Dict, old_status: Optional[str] = None, new: bool = False) -> None:
+        """Count a new task, or apply a changed one that had old_status."""
+        status_name = task.get("status")
+        if new or old_status != status_name:
+            _bump(self.tasks_by_status, None if new else old_status, status_name)
+
+        recent = self.recent_completions
+        listed_key = None
+        for i, listed in enumerate(recent):
+            if listed["id"] == task["id"]:
+                listed_key = _completed_key(listed)
+                del recent[i]
+                break
+        if status_name != "completed":
+            return
+
+        # Whether the list held every other completed task before this put.
+        others = self.tasks_by_status.get("completed", 0) - 1
+        holds_all = len(recent) == others
+        key = _completed_key(task)
+        pos = len(recent)
+        while pos and _completed_key(recent[pos - 1]) < key:
+            pos -= 1
+        # Every unlisted completion ranks at or below a listed task's old key.
+        if pos < len(recent) or holds_all or (listed_key is not None and key >= listed_key):
+            recent.insert(pos, task)
+            del recent[RECENT_KEPT:]
+
+    def remove_task(self, task: Dict, old_status: Optional[str]) -> None:
+        """Forget a task leaving the store (archived); it had old_status."""
+        remaining = self.tasks_by_status.get(old_status, 0) - 1
+        if remaining > 0:
+            self.tasks_by_status[old_status] = remaining
+        else:
+            self.tasks_by_status.pop(old_status, None)
+        self.recent_completions = [listed for listed in self.recent_completions if listed["id"] != task["id"]]
+
+    def recent(self, limit: int = RECENT_SHOWN) -> Optional[List[Dict]]:
+        """The newest `limit` completions, or None if the list ran short and needs a rebuild."""
+        if len(self.recent_completions) < min(limit, self.tasks_by_status.get("completed", 0)):
+            return None
+        return self.recent_completions[:limit]
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Storage backends for the Proactive Task Manager.
+
+Two interchangeable stores expose the same small API:
+
+- JsonTaskStore: the original data/tasks.json file, loaded and rewritten whole.
+  With a write-ahead log, every commit logs the changed records first and
+  replaces the file atomically; loading replays what the file is missing.
+  The file is written in the format it was read in: pretty JSON, minified
+  JSON or packed records (task_codec.py, `convert-storage`).
+- SqliteTaskStore: data/tasks.db in WAL journal mode, one row per goal/task
+  with indexed id, goal_id, status and priority columns, so a command only
+  reads and writes the rows it touches.
+
+Both answer next_ready() from a dependency-aware ready queue: an in-memory
+heap (ReadyQueue) for JSON, and persisted unmet-dependency counters behind a
+ready index for SQLite. Both keep TaskStats (status counts, recent
+completions) current on every put and persist it with the data: under the
+"stats" key of tasks.json, or in the meta table.
+
+Goals and tasks stay plain dicts in both backends; SQLite keeps the full
+record as JSON next to the indexed columns, so command output is unchanged.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ready_queue import ReadyQueue, find_cycles, priority_rank
+from task_index import TaskIndex
+from task_codec import DEFAULT_FORMAT, decode, encode
+from task_stats import TaskStats
+from task_wal import DELETE_TASK, PUT_GOAL, PUT_TASK, WriteAheadLog, atomic_write
+
+BACKEND_ENV = "PROACTIVE_TASKS_BACKEND"
+JSON_FILE_NAME = "tasks.json"
+SQLITE_FILE_NAME = "tasks.db"
+MIGRATED_SUFFIX = ".migrated"
+
+
+class JsonTaskStore:
+    """Whole-file JSON store (the v1.2 format), indexed in memory once per load.
+
+    The snapshot's "wal" key holds the log position it is current to.
+    `format` is the on-disk format (task_codec.FORMATS) saves are written in.
+    """
+
+    backend = "json"
+
+    def __init__(self, path: Path, wal: Optional[WriteAheadLog] = None):
+        self.path = path
+        self.wal = wal
+        self._data: Optional[Dict[str, Any]] = None
+        self._index: Optional[TaskIndex] = None
+        self._ready: Optional[ReadyQueue] = None
+        self._stats: Optional[TaskStats] = None
+        self._dirty = False
+        self._stamp: Optional[tuple] = None
+        self.format = DEFAULT_FORMAT
+        # Records changed since the last commit, logged as redo entries on
+        # commit; None marks a deleted task.
+        self._changed: Dict[tuple, Optional[Dict]] = {}
+
+    def _file_stamp(self) -> Optional[tuple]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        # Atomic saves replace the file, so the inode changes on every write.
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._stamp = self._file_stamp()
+            if self._stamp is not None:
+                with open(self.path, 'rb') as f:
+                    self._data, self.format = decode(f.read())
+            else:
+                self._data = {"goals": [], "tasks": []}
+            if self.wal is not None:
+                self._recover()
+        return self._data
+
+    def _recover(self) -> None:
+        """Replay logged goal/task images and deletions newer than the snapshot, then checkpoint."""
+        replayed = 0
+        positions: Dict[str, Dict[str, int]] = {}
+        deleted = set()
+        for entry in self.wal.entries_after(self._data.get("wal")):
+            if entry.get("event_type") == DELETE_TASK:
+                # Applied in one pass at the end; positions stay valid until then.
+                deleted.add((entry.get("content") or {}).get("task_id"))
+                replayed += 1
+                continue
+            kind = {PUT_GOAL: "goal", PUT_TASK: "task"}.get(entry.get("event_type"))
+            record = (entry.get("content") or {}).get(kind) if kind else None
+            if not isinstance(record, dict):
+                continue
+            records = self._data[kind + "s"]
+            if kind not in positions:
+                positions[kind] = {item["id"]: i for i, item in enumerate(records)}
+            pos = positions[kind].get(record["id"])
+            if pos is None:
+                positions[kind][record["id"]] = len(records)
+                records.append(record)
+            else:
+                records[pos] = record
+            if kind == "task":
+                deleted.discard(record["id"])
+            replayed += 1
+        if deleted:
+            self._data["tasks"] = [task for task in self._data["tasks"] if task["id"] not in deleted]
+        if replayed:
+            # Replayed records bypassed the counters; recount them for the checkpoint.
+            self._data.pop("stats", None)
+            self._stats = None
+            self._write_snapshot()
+
+    def refresh(self) -> None:
+        """Drop everything loaded if another process rewrote tasks.json since (long-lived callers)."""
+        if self._data is not None and self._file_stamp() != self._stamp:
+            self._data = self._index = self._ready = self._stats = None
+            self._dirty = False
+            self._changed.clear()
+
+    @property
+    def index(self) -> TaskIndex:
+        if self._index is None:
+            self._index = TaskIndex(self.data["goals"], self.data["tasks"])
+        return self._index
+
+    @property
+    def ready(self) -> ReadyQueue:
+        if self._ready is None:
+            self._ready = ReadyQueue(self.data["tasks"])
+        return self._ready
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        return self.index.tasks_by_id.get(task_id)
+
+    def get_goal(self, goal_id: str) -> Optional[Dict]:
+        return self.index.goals_by_id.get(goal_id)
+
+    def find_goal_by_title(self, title: str) -> Optional[Dict]:
+        return self.index.find_goal_by_title(title)
+
+    def iter_goals(self, status: Optional[str] = None, priority: Optional[str] = None) -> Iterator[Dict]:
+        for goal in self.data["goals"]:
+            if (status is None or goal["status"] == status) and (priority is None or goal["priority"] == priority):
+                yield goal
+
+    def iter_tasks(
+        self,
+        goal_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        return self.index.iter_tasks(goal_id=goal_id, status=status, priority=priority)
+
+    def _current_stats(self) -> Optional[TaskStats]:
+        """The persisted stats, or None if the file has none that match its records."""
+        if self._stats is None:
+            doc = self.data.get("stats")
+            stats = TaskStats(doc) if isinstance(doc, dict) else None
+            if stats is not None and (stats.task_count(), stats.goal_count()) == (len(self.data["tasks"]), len(self.data["goals"])):
+                self._stats = stats
+            else:
+                # Written by an older version or edited by hand: recounted on demand.
+                self.data.pop("stats", None)
+        return self._stats
+
+    def stats(self) -> TaskStats:
+        stats = self._current_stats()
+        if stats is None or stats.recent() is None:
+            stats = self._stats = TaskStats.build(self.data["goals"], self.data["tasks"])
+        return stats
+
+    def rebuild_stats(self) -> TaskStats:
+        self._stats = TaskStats.build(self.data["goals"], self.data["tasks"])
+        self._dirty = True
+        return self._stats
+
+    def put_goal(self, goal: Dict) -> None:
+        existing = self.index.goals_by_id.get(goal["id"])
+        stats = self._current_stats()
+        if stats is not None:
+            stats.put_goal(goal, self.index.indexed_goal_status(goal["id"]), new=existing is None)
+        if existing is None:
+            self.data["goals"].append(goal)
+        elif existing is not goal:
+            self.data["goals"][self.index.goal_titles.position[goal["id"]]] = goal
+        self.index.put_goal(goal)
+        self._changed[("goal", goal["id"])] = goal
+        self._dirty = True
+
+    def put_task(self, task: Dict) -> None:
+        existing = self.index.tasks_by_id.get(task["id"])
+        stats = self._current_stats()
+        if stats is not None:
+            stats.put_task(task, self.index.indexed_status(task["id"]), new=existing is None)
+        if existing is None:
+            self.data["tasks"].append(task)
+        elif existing is not task:
+            self.data["tasks"][self.index.position[task["id"]]] = task
+        self.index.put_task(task)
+        if self._ready is not None:
+            self._ready.put(task)
+        self._changed[("task", task["id"])] = task
+        self._dirty = True
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        """Remove tasks from the store (archival); unknown ids are ignored."""
+        doomed = set()
+        stats = self._current_stats()
+        for task_id in task_ids:
+            task = self.index.tasks_by_id.get(task_id)
+            if task is None:
+                continue
+            if stats is not None:
+                stats.remove_task(task, self.index.indexed_status(task_id))
+            self._changed[("task", task_id)] = None
+            doomed.add(task_id)
+        if not doomed:
+            return
+        self.data["tasks"] = [task for task in self.data["tasks"] if task["id"] not in doomed]
+        # Rare and bulk: rebuilt on next use rather than maintained.
+        self._index = self._ready = None
+        self._dirty = True
+
+    def next_ready(self, goal_id: Optional[str] = None, max_estimate: Optional[int] = None) -> Optional[Dict]:
+        return self.ready.peek(goal_id, max_estimate)
+
+    def dependency_cycles(self) -> List[List[str]]:
+        return self.ready.cycles()
+
+    def commit(self) -> None:
+        if not self._dirty:
+            if self.wal is not None:
+                self.wal.sync()
+            return
+        if self.wal is not None:
+            for (kind, record_id), record in self._changed.items():
+                if record is None:
+                    self.wal.record(DELETE_TASK, {"task_id": record_id})
+                else:
+                    self.wal.record(PUT_GOAL if kind == "goal" else PUT_TASK, {kind: record})
+            self.wal.sync()
+        self._changed.clear()
+        self._write_snapshot()
+        self._dirty = False
+
+    def _write_snapshot(self) -> None:
+        if self.wal is not None:
+            self.data["wal"] = self.wal.position()
+        self.data["stats"] = self.stats().to_dict()
+        atomic_write(self.path, encode(self.data, self.format))
+        self._stamp = self._file_stamp()
+        if self.wal is not None:
+            self.wal.checkpointed(self.data["wal"]["seq"])
+
+    def convert(self, fmt: str) -> str:
+        """Rewrite the snapshot in another on-disk format; returns the previous one."""
+        self.commit()
+        self.data  # loading picks up the format the file is in
+        previous, self.format = self.format, fmt
+        self._write_snapshot()
+        return previous
+
+    def close(self) -> None:
+        pass
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS goals (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    status TEXT,
+    priority TEXT,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    goal_id TEXT,
+    status TEXT,
+    priority TEXT,
+    created_at TEXT,
+    body TEXT NOT NULL,
+    priority_rank INTEGER NOT NULL DEFAULT 3,
+    estimate_minutes INTEGER,
+    unmet INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS task_deps (
+    task_id TEXT NOT NULL,
+    dep_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_deps_task_id ON task_deps(task_id);
+CREATE INDEX IF NOT EXISTS idx_task_deps_dep_id ON task_deps(dep_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_goal_id ON tasks(goal_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(status, priority);
+CREATE INDEX IF NOT EXISTS idx_goals_status ON goals(status);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# Created after _upgrade(), which adds the ready-queue columns to v1 databases.
+READY_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks(status, unmet, priority_rank, created_at);
+"""
+READY_COLUMNS = {
+    "priority_rank": "INTEGER NOT NULL DEFAULT 3",
+    "estimate_minutes": "INTEGER",
+    "unmet": "INTEGER NOT NULL DEFAULT 0",
+}
+
+# Recomputes unmet counters from task_deps; a missing dependency counts as unmet.
+RECOUNT_UNMET = """
+UPDATE tasks SET unmet = (
+    SELECT COUNT(*) FROM task_deps d LEFT JOIN tasks dep ON dep.id = d.dep_id
+    WHERE d.task_id = tasks.id AND (dep.status IS NULL OR dep.status != 'completed')
+)
+"""
+
+
+def _goal_row(goal: Dict) -> tuple:
+    return (goal["id"], goal.get("title", ""), goal.get("status"), goal.get("priority"), json.dumps(goal))
+
+
+def _task_row(task: Dict) -> tuple:
+    return (
+        task["id"],
+        task.get("goal_id"),
+        task.get("status"),
+        task.get("priority"),
+        task.get("created_at"),
+        json.dumps(task),
+        priority_rank(task.get("priority")),
+        task.get("estimate_minutes"),
+    )
+
+
+def _dep_rows(task: Dict) -> List[tuple]:
+    return [(task["id"], dep_id) for dep_id in task.get("depends_on") or []]
+
+
+class SqliteTaskStore:
+    """SQLite store: indexed columns plus the full record as JSON, row-level writes.
+
+    Rows are returned in insertion order (rowid), matching the JSON list order.
+    All writes of one command share a transaction that commit() closes.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path, wal: Optional[WriteAheadLog] = None):
+        self.path = path
+        self.wal = wal
+        # Imported here so JSON-backed calls never load the sqlite3 module.
+        import sqlite3
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade()
+        self.conn.executescript(READY_SCHEMA)
+        # Read from the meta table once per transaction, written back by commit().
+        self._stats: Optional[TaskStats] = None
+        self._stats_dirty = False
+
+    def _upgrade(self) -> None:
+        """Add the ready-queue columns and dependency rows to a v1 tasks.db."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+        missing = [name for name in READY_COLUMNS if name not in columns]
+        if not missing:
+            return
+        with self.conn:
+            for name in missing:
+                self.conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {READY_COLUMNS[name]}")
+            for (body,) in self.conn.execute("SELECT body FROM tasks").fetchall():
+                task = json.loads(body)
+                self.conn.execute(
+                    "UPDATE tasks SET priority_rank = ?, estimate_minutes = ? WHERE id = ?",
+                    (priority_rank(task.get("priority")), task.get("estimate_minutes"), task["id"]),
+                )
+                self.conn.executemany("INSERT INTO task_deps (task_id, dep_id) VALUES (?, ?)", _dep_rows(task))
+            self.conn.execute(RECOUNT_UNMET)
+
+    def _one(self, sql: str, params: tuple) -> Optional[Dict]:
+        row = self.conn.execute(sql, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        return self._one("SELECT body FROM tasks WHERE id = ?", (task_id,))
+
+    def get_goal(self, goal_id: str) -> Optional[Dict]:
+        return self._one("SELECT body FROM goals WHERE id = ?", (goal_id,))
+
+    def find_goal_by_title(self, title: str) -> Optional[Dict]:
+        # instr() on lower() keeps the JSON backend's plain substring semantics (no LIKE wildcards).
+        return self._one(
+            "SELECT body FROM goals WHERE instr(lower(title), ?) > 0 ORDER BY rowid LIMIT 1",
+            (title.lower(),),
+        )
+
+    def _select(self, table: str, filters: Dict[str, Optional[str]]) -> Iterator[Dict]:
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params = tuple(value for value in filters.values() if value is not None)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        for (body,) in self.conn.execute(f"SELECT body FROM {table}{where} ORDER BY rowid", params):
+            yield json.loads(body)
+
+    def iter_goals(self, status: Optional[str] = None, priority: Optional[str] = None) -> Iterator[Dict]:
+        return self._select("goals", {"status": status, "priority": priority})
+
+    def iter_tasks(
+        self,
+        goal_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        return self._select("tasks", {"goal_id": goal_id, "status": status, "priority": priority})
+
+    def _current_stats(self) -> TaskStats:
+        if self._stats is None:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'stats'").fetchone()
+            if row:
+                self._stats = TaskStats(json.loads(row[0]))
+            else:
+                # Databases from before the counters existed: count once, persist on commit.
+                self.rebuild_stats()
+        return self._stats
+
+    def stats(self) -> TaskStats:
+        stats = self._current_stats()
+        return stats if stats.recent() is not None else self.rebuild_stats()
+
+    def rebuild_stats(self) -> TaskStats:
+        self._stats = TaskStats.build(self.iter_goals(), self.iter_tasks())
+        self._stats_dirty = True
+        return self._stats
+
+    def put_goal(self, goal: Dict) -> None:
+        old = self.conn.execute("SELECT status FROM goals WHERE id = ?", (goal["id"],)).fetchone()
+        self._current_stats().put_goal(goal, old[0] if old else None, new=old is None)
+        self._stats_dirty = True
+        self.conn.execute(
+            "INSERT INTO goals (id, title, status, priority, body) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET title = excluded.title, status = excluded.status, "
+            "priority = excluded.priority, body = excluded.body",
+            _goal_row(goal),
+        )
+
+    def put_task(self, task: Dict) -> None:
+        """Upsert one task row and keep the unmet counters of it and its dependents current."""
+        task_id = task["id"]
+        old = self.conn.execute("SELECT status, body FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        self._current_stats().put_task(task, old[0] if old else None, new=old is None)
+        self._stats_dirty = True
+        self.conn.execute(
+            "INSERT INTO tasks (id, goal_id, status, priority, created_at, body, priority_rank, estimate_minutes) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET goal_id = excluded.goal_id, status = excluded.status, "
+            "priority = excluded.priority, created_at = excluded.created_at, body = excluded.body, "
+            "priority_rank = excluded.priority_rank, estimate_minutes = excluded.estimate_minutes",
+            _task_row(task),
+        )
+
+        deps = task.get("depends_on") or []
+        relinked = old is None or (json.loads(old[1]).get("depends_on") or []) != deps
+        if relinked:
+            self.conn.execute("DELETE FROM task_deps WHERE task_id = ?", (task_id,))
+            self.conn.executemany("INSERT INTO task_deps (task_id, dep_id) VALUES (?, ?)", _dep_rows(task))
+            self.conn.execute(RECOUNT_UNMET + " WHERE id = ?", (task_id,))
+
+        was_completed = old is not None and old[0] == "completed"
+        if was_completed != (task.get("status") == "completed"):
+            # A recounted row already reflects its own new status.
+            delta = -1 if task.get("status") == "completed" else 1
+            self.conn.execute(
+                "UPDATE tasks SET unmet = unmet + ? * "
+                "(SELECT COUNT(*) FROM task_deps d WHERE d.dep_id = ? AND d.task_id = tasks.id) "
+                "WHERE id IN (SELECT task_id FROM task_deps WHERE dep_id = ?) AND id IS NOT ?",
+                (delta, task_id, task_id, task_id if relinked else None),
+            )
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        """Remove tasks and their dependency rows (archival); unknown ids are ignored."""
+        stats = self._current_stats()
+        doomed = []
+        for task_id in task_ids:
+            row = self.conn.execute("SELECT status, body FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is not None:
+                stats.remove_task(json.loads(row[1]), row[0])
+                doomed.append((task_id,))
+        if not doomed:
+            return
+        self.conn.executemany("DELETE FROM tasks WHERE id = ?", doomed)
+        self.conn.executemany("DELETE FROM task_deps WHERE task_id = ?", doomed)
+        # A dependency that no longer exists counts as unmet, as on load.
+        self.conn.executemany(
+            RECOUNT_UNMET + " WHERE id IN (SELECT task_id FROM task_deps WHERE dep_id = ?)", doomed
+        )
+        self._stats_dirty = True
+
+    def next_ready(self, goal_id: Optional[str] = None, max_estimate: Optional[int] = None) -> Optional[Dict]:
+        """Highest-priority pending task with no unmet dependencies, via idx_tasks_ready."""
+        sql = "SELECT body FROM tasks WHERE status = 'pending' AND unmet = 0"
+        params: List[Any] = []
+        if goal_id is not None:
+            sql += " AND goal_id = ?"
+            params.append(goal_id)
+        if max_estimate:
+            sql += " AND estimate_minutes IS NOT NULL AND estimate_minutes <= ?"
+            params.append(max_estimate)
+        return self._one(sql + " ORDER BY priority_rank, created_at, rowid LIMIT 1", tuple(params))
+
+    def dependency_cycles(self) -> List[List[str]]:
+        edges: Dict[str, List[str]] = {}
+        for task_id, dep_id in self.conn.execute("SELECT task_id, dep_id FROM task_deps ORDER BY rowid"):
+            edges.setdefault(task_id, []).append(dep_id)
+        return find_cycles(edges)
+
+    def is_empty(self) -> bool:
+        return not self.conn.execute("SELECT 1 FROM goals UNION ALL SELECT 1 FROM tasks LIMIT 1").fetchone()
+
+    def refresh(self) -> None:
+        """Drop the cached counters; rows are always read fresh, meta.stats may have moved."""
+        self._stats = None
+        self._stats_dirty = False
+
+    def import_data(self, data: Dict[str, Any]) -> None:
+        """Bulk-load a tasks.json document in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO goals (id, title, status, priority, body) VALUES (?, ?, ?, ?, ?)",
+                (_goal_row(goal) for goal in data.get("goals", [])),
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tasks "
+                "(id, goal_id, status, priority, created_at, body, priority_rank, estimate_minutes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_task_row(task) for task in data.get("tasks", [])),
+            )
+            self.conn.executemany(
+                "INSERT INTO task_deps (task_id, dep_id) VALUES (?, ?)",
+                (row for task in data.get("tasks", []) for row in _dep_rows(task)),
+            )
+            self.conn.execute(RECOUNT_UNMET)
+            self.conn.execute("DELETE FROM meta WHERE key = 'stats'")
+        self._stats = None
+
+    def commit(self) -> None:
+        # The log is informational here (SQLite journals the data itself), but
+        # it still reaches the disk before the transaction does.
+        if self.wal is not None:
+            self.wal.sync()
+        if self._stats_dirty:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('stats', ?)",
+                (json.dumps(self._stats.to_dict()),),
+            )
+        self.conn.commit()
+        # Another process may change the counters before this one's next command.
+        self._stats = None
+        self._stats_dirty = False
+        if self.wal is not None:
+            self.wal.checkpointed(self.wal.seq or 0)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(json_path: Path, store: SqliteTaskStore) -> Dict[str, int]:
+    """One-shot migration: import tasks.json, then set it aside as tasks.json.migrated."""
+    data = JsonTaskStore(json_path, store.wal).data
+    store.import_data(data)
+    json_path.rename(json_path.with_name(json_path.name + MIGRATED_SUFFIX))
+    return {"goals": len(data.get("goals", [])), "tasks": len(data.get("tasks", []))}
+
+
+def select_backend(data_dir: Path) -> str:
+    """Backend from PROACTIVE_TASKS_BACKEND, else sqlite once tasks.db exists, else json."""
+    backend = os.environ.get(BACKEND_ENV, "").strip().lower()
+    if backend:
+        if backend not in ("json", "sqlite"):
+            raise ValueError(f"{BACKEND_ENV} must be 'json' or 'sqlite', got {backend!r}")
+        return backend
+    return "sqlite" if (data_dir / SQLITE_FILE_NAME).exists() else "json"
+
+
+def open_store(data_dir: Path, backend: Optional[str] = None, wal: Optional[WriteAheadLog] = None):
+    """Open the task store; a first SQLite open migrates an existing tasks.json."""
+    backend = backend or select_backend(data_dir)
+    json_path = data_dir / JSON_FILE_NAME
+    if backend == "json":
+        return JsonTaskStore(json_path, wal)
+
+    store = SqliteTaskStore(data_dir / SQLITE_FILE_NAME, wal)
+    if json_path.exists() and store.is_empty():
+        migrate_json_to_sqlite(json_path, store)
+    return store
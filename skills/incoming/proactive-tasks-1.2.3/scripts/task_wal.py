@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Write-ahead log for the Proactive Task Manager.
+
+Entries go to memory/WAL-YYYY-MM-DD.log as JSON lines, in the v1.2 shape
+plus a sequence number:
+
+    {"seq": 42, "timestamp": "...", "event_type": "PROGRESS_CHANGE", "content": {...}}
+
+- Group commit: append() only queues an entry; sync() assigns sequence
+  numbers and writes everything queued with a single write and fsync. A
+  command's events and data changes therefore reach the disk together, before
+  the data file is replaced.
+- Redo records: the JSON store logs the full image of every goal and task it
+  changes (PUT_GOAL / PUT_TASK), and the id of every task it drops
+  (DELETE_TASK, e.g. archived), before writing its snapshot, and the snapshot
+  records the WAL position it covers. Replaying the entries after that
+  position (entries_after) rebuilds whatever a crash kept from the snapshot.
+- Snapshots are written with atomic_write (temp file, fsync, rename), so a
+  crash leaves either the old or the new file, never a torn one.
+- Compaction: once a day's entries are all covered by a checkpoint, its log is
+  gzipped to WAL-YYYY-MM-DD.log.gz. The newest log is never compacted; its
+  last entry carries the running sequence number.
+
+Sequence numbers are assigned at sync time from the tail of the active log,
+so a process that was not the last writer continues the sequence correctly.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+WAL_PREFIX = "WAL-"
+WAL_SUFFIX = ".log"
+COMPACTED_SUFFIX = ".gz"
+
+PUT_GOAL = "PUT_GOAL"
+PUT_TASK = "PUT_TASK"
+DELETE_TASK = "DELETE_TASK"
+
+# How much of a log's end is read to find its last sequence number.
+TAIL_BYTES = 64 * 1024
+
+
+def fsync_dir(path: Path) -> None:
+    """Make a rename or file creation in path durable (no-op where unsupported)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, content: Union[str, bytes]) -> None:
+    """Replace path with content via a temp file and rename; readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    fsync_dir(path.parent)
+
+
+def _tail(path: Path) -> Tuple[Optional[int], bool]:
+    """Last sequence number in a log (None if it has none) and whether it ends mid-line."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - TAIL_BYTES))
+            chunk = f.read()
+    except FileNotFoundError:
+        return None, False
+    torn = bool(chunk) and not chunk.endswith(b"\n")
+    for raw in reversed(chunk.splitlines()):
+        try:
+            seq = json.loads(raw).get("seq")
+        except (ValueError, AttributeError):
+            continue
+        if isinstance(seq, int):
+            return seq, torn
+    return None, torn
+
+
+class WriteAheadLog:
+    """Daily JSON-lines logs under one directory, with group commit and replay."""
+
+    def __init__(self, wal_dir: Path):
+        self.dir = wal_dir
+        self.pending: List[Dict] = []
+        self.seq: Optional[int] = None
+        self.floor = 0
+        self._file: Optional[Path] = None
+        self._offset: Optional[int] = None
+        self._torn = False
+        self._compacted_for: Optional[str] = None
+
+    def logs(self) -> List[Path]:
+        return sorted(self.dir.glob(f"{WAL_PREFIX}*{WAL_SUFFIX}"))
+
+    def append(self, entry: Dict) -> None:
+        """Queue an entry ({"timestamp", "event_type", "content"}) for the next sync()."""
+        self.pending.append(entry)
+
+    def record(self, event_type: str, content: Dict) -> None:
+        self.append({"timestamp": datetime.now(timezone.utc).isoformat(), "event_type": event_type, "content": content})
+
+    def discard(self) -> None:
+        """Drop queued entries (the changes they describe were abandoned)."""
+        self.pending.clear()
+
+    def note_seq(self, seq: int) -> None:
+        """Never hand out sequence numbers at or below seq (e.g. a snapshot's checkpoint)."""
+        self.floor = max(self.floor, seq)
+        if self.seq is not None and self.seq < seq:
+            self.seq = seq
+
+    def _rescan(self, path: Path) -> bool:
+        """Reload the running sequence from the newest logs; True if path ends mid-line."""
+        seq, torn = _tail(path)
+        if seq is None:
+            for other in reversed(self.logs()):
+                if other != path:
+                    seq, _ = _tail(other)
+                    if seq is not None:
+                        break
+        self.seq = max(seq or 0, self.floor)
+        return torn
+
+    def sync(self) -> None:
+        """Write every queued entry to today's log with one write and one fsync."""
+        if not self.pending:
+            return
+        path = self.dir / f"{WAL_PREFIX}{datetime.now(timezone.utc).strftime('%Y-%m-%d')}{WAL_SUFFIX}"
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        torn = self._torn
+        if self.seq is None or path != self._file or size != self._offset:
+            # First write, new day, or another process appended since.
+            torn = self._rescan(path)
+
+        lines = []
+        for entry in self.pending:
+            self.seq += 1
+            lines.append(json.dumps({"seq": self.seq, **entry}) + "\n")
+        with open(path, 'a') as f:
+            # A crash can leave a half-written last line; never glue onto it.
+            f.write(("\n" if torn else "") + "".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+        self._torn = False
+        if size == 0:
+            fsync_dir(self.dir)
+        self._file = path
+        self.pending.clear()
+
+    def position(self) -> Dict:
+        """Where the log ends after the last sync(); stored in snapshots as their checkpoint."""
+        return {"seq": self.seq or 0, "file": self._file.name if self._file else "", "offset": self._offset or 0}
+
+    def entries_after(self, position: Optional[Dict]) -> Iterator[Dict]:
+        """Entries written after a checkpoint position, oldest first; torn lines are skipped.
+
+        Reading to the end also positions the log there, so a checkpoint taken
+        right after replay covers everything replayed.
+        """
+        if not position:
+            return
+        seq = position.get("seq", 0)
+        self.note_seq(seq)
+        last_seq = seq
+        for path in self.logs():
+            if path.name < position.get("file", ""):
+                continue
+            with open(path, 'rb') as f:
+                if path.name == position.get("file"):
+                    f.seek(position.get("offset", 0))
+                raw = b""
+                for raw in f:
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict) and isinstance(entry.get("seq"), int) and entry["seq"] > seq:
+                        last_seq = max(last_seq, entry["seq"])
+                        yield entry
+                self._file, self._offset = path, f.tell()
+                self._torn = bool(raw) and not raw.endswith(b"\n")
+                self.seq = max(last_seq, self.floor)
+
+    def compact(self, upto_seq: int) -> List[Path]:
+        """Gzip the logs, oldest first, whose entries are all at or below upto_seq."""
+        # Imported here: every CLI call loads this module, few compact.
+        import gzip
+        import shutil
+        compacted = []
+        for path in self.logs()[:-1]:
+            last, _ = _tail(path)
+            if last is not None and last > upto_seq:
+                break
+            target = path.with_name(path.name + COMPACTED_SUFFIX)
+            tmp = target.with_name(target.name + ".tmp")
+            with open(tmp, 'wb') as out:
+                if target.exists():
+                    # gzip members concatenate; keep what an earlier run compacted.
+                    with open(target, 'rb') as previous:
+                        shutil.copyfileobj(previous, out)
+                with open(path, 'rb') as src, gzip.GzipFile(fileobj=out, mode='wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, target)
+            path.unlink()
+            compacted.append(target)
+        if compacted:
+            fsync_dir(self.dir)
+        return compacted
+
+    def checkpointed(self, upto_seq: int) -> List[Path]:
+        """Compact after a checkpoint, once per active log (process start or day rollover)."""
+        if self._file is None or self._file.name == self._compacted_for:
+            return []
+        self._compacted_for = self._file.name
+        return self.compact(upto_seq)
@@ -0,0 +1,60 @@
+"""Regression: a multi-command batch on SQLite keeps the status counters exact.
+
+The store is refreshed before every command, but not between the commands of
+a batch: their counter changes are uncommitted until the batch ends, and a
+refresh would drop them and leave meta.stats off by the earlier deltas.
+
+    python3 -m unittest discover -s tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import task_manager  # noqa: E402
+from bench_concurrency import command, use_workspace  # noqa: E402
+
+
+class BatchStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.saved_backend = os.environ.get("PROACTIVE_TASKS_BACKEND")
+        os.environ["PROACTIVE_TASKS_BACKEND"] = "sqlite"
+        self.root = tempfile.TemporaryDirectory()
+        for sub in ("data", "memory"):
+            (Path(self.root.name) / sub).mkdir()
+        use_workspace(self.root.name)
+
+    def tearDown(self):
+        task_manager.reset_store()
+        self.root.cleanup()
+        if self.saved_backend is None:
+            os.environ.pop("PROACTIVE_TASKS_BACKEND", None)
+        else:
+            os.environ["PROACTIVE_TASKS_BACKEND"] = self.saved_backend
+
+    def test_batch_counters_match_rebuild(self):
+        command(["add-goal", "Batch"])
+        task_id = command(["add-task", "Batch", "Move twice"])["task"]["id"]
+
+        lines = [
+            {"argv": ["update-task", task_id, "--status", "in_progress"]},
+            {"argv": ["complete-task", task_id]},
+        ]
+        code, out, err = task_manager.execute(["batch"], "".join(json.dumps(line) + "\n" for line in lines))
+        self.assertEqual(code, 0, err)
+        self.assertTrue(all(json.loads(response)["exit"] == 0 for response in out.splitlines()))
+
+        counted = command(["status"])["tasks_by_status"]
+        rebuilt = command(["status", "--rebuild-stats"])["tasks_by_status"]
+        self.assertEqual(counted, rebuilt)
+        self.assertEqual(rebuilt["completed"], 1)
+        self.assertEqual(rebuilt["in_progress"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()